@@ -0,0 +1,121 @@
+"""
+Reusable Agent Pool for AutoGen and CrewAI Lab Demo
+
+Framework agents (and CrewAI crews) are identical from one run to the next
+except for a few interpolated values, yet building them re-validates and
+re-allocates the same objects every time. An AgentPool builds each
+configuration once, hands instances out one run at a time, resets their
+message state when they come back and keeps count of the build time saved.
+
+Usage:
+    from agent_pool import AgentPool
+
+    pool = AgentPool(build=lambda config_list: InterviewPlatformAgents(config_list),
+                     reset=lambda manager: manager.reset())
+
+    with pool.acquire("default", config_list=config_list) as manager:
+        ...  # run one workflow
+
+    print(pool.describe())
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Hashable, Iterator, Optional
+
+
+class AgentPool:
+    """Builds agents once per configuration key and reuses them across runs"""
+
+    def __init__(self, build: Callable[..., Any], reset: Optional[Callable[[Any], None]] = None,
+                 max_idle_per_key: int = 4):
+        """
+        Args:
+            build: Called with the acquire() keyword arguments to build a new instance
+            reset: Called on an instance when it is returned, to clear per-run state
+            max_idle_per_key: Idle instances kept per key; extras are dropped
+        """
+        self.build = build
+        self.reset = reset
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Hashable, list] = {}
+        self._discarded = set()
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.reuses = 0
+        self.build_seconds = 0.0
+
+    def _build(self, **build_kwargs) -> Any:
+        started = time.perf_counter()
+        instance = self.build(**build_kwargs)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.builds += 1
+            self.build_seconds += elapsed
+        return instance
+
+    def warm(self, key: Hashable, **build_kwargs) -> None:
+        """Build one idle instance for key ahead of the first run"""
+        instance = self._build(**build_kwargs)
+        with self._lock:
+            self._idle.setdefault(key, []).append(instance)
+
+    @contextmanager
+    def acquire(self, key: Hashable, **build_kwargs) -> Iterator[Any]:
+        """
+        Check out an instance for one run, building it only if none is idle.
+
+        Instances are never shared between concurrent runs; each acquire gets
+        its own, and it is reset and returned to the pool afterwards.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            instance = idle.pop() if idle else None
+            if instance is not None:
+                self.reuses += 1
+        if instance is None:
+            instance = self._build(**build_kwargs)
+
+        try:
+            yield instance
+        finally:
+            with self._lock:
+                discarded = id(instance) in self._discarded
+                self._discarded.discard(id(instance))
+            if not discarded:
+                if self.reset is not None:
+                    self.reset(instance)
+                with self._lock:
+                    idle = self._idle.setdefault(key, [])
+                    if len(idle) < self.max_idle_per_key:
+                        idle.append(instance)
+
+    def discard(self, instance: Any) -> None:
+        """
+        Keep an acquired instance out of the pool when it is released.
+
+        Used when a cancelled run may still be using the instance in an
+        abandoned worker thread.
+        """
+        with self._lock:
+            self._discarded.add(id(instance))
+
+    def stats(self) -> Dict[str, Any]:
+        """Build counts and the build time saved by reusing instances"""
+        with self._lock:
+            average_build = self.build_seconds / self.builds if self.builds else 0.0
+            return {
+                "builds": self.builds,
+                "reuses": self.reuses,
+                "build_seconds": round(self.build_seconds, 4),
+                "average_build_seconds": round(average_build, 4),
+                "saved_seconds": round(self.reuses * average_build, 4),
+                "idle": sum(len(instances) for instances in self._idle.values()),
+            }
+
+    def describe(self) -> str:
+        """One-line summary of pool usage"""
+        stats = self.stats()
+        return (f"Agent pool: {stats['builds']} build(s), {stats['reuses']} reuse(s), "
+                f"~{stats['saved_seconds']:.2f}s of agent construction saved")
@@ -15,11 +15,16 @@ Configuration:
 - No local .env file needed - uses parent directory configuration
 """
 
-import os
 from datetime import datetime
 from typing import Dict, List, Any
 import autogen
-from config import Config
+from config import Config, AgentConfig, WorkflowConfig, compile_prompts
+from agent_pool import AgentPool
+from model_cascade import MODEL_CASCADE
+from llm_scheduler import LLM_SCHEDULER, estimate_tokens
+from output_manager import OutputManager
+from run_context import RunContext, RunCancelled
+from shared_config import ProviderConfig
 
 
 # ============================================================================
@@ -29,151 +34,104 @@ from config import Config
 class InterviewPlatformAgents:
     """Manages all agents for the interview platform product planning workflow"""
 
-    def __init__(self, config_list: List[Dict[str, Any]]):
+    def __init__(self, config_list: List[Dict[str, Any]], small_config_list: List[Dict[str, Any]] = None,
+                 provider: ProviderConfig = None):
+        """
+        Args:
+            config_list: AutoGen config list for the large model
+            small_config_list: Optional config list for the cascade's small model
+            provider: Provider settings the config lists were built from
+        """
         self.config_list = config_list
+        self.small_config_list = small_config_list
+        self.provider = provider or ProviderConfig.from_env()
         self.agents = {}
+        # Small-model twins of the agents whose model_tier is not "large"
+        self.small_agents = {}
         self.conversation_history = []
 
+    def _create_agent(self, agent_type: str) -> autogen.ConversableAgent:
+        """Build an agent from its AgentConfig spec (shared with the native engine)"""
+        spec = AgentConfig.get_agent_config(agent_type)
+        agent = autogen.ConversableAgent(
+            name=spec["name"],
+            system_message=AgentConfig.get_system_message(agent_type),
+            llm_config={"config_list": self.config_list, "temperature": spec["temperature"]},
+            human_input_mode=Config.HUMAN_INPUT_MODE,
+        )
+        self.agents[agent_type] = agent
+
+        if self.small_config_list and "small" in MODEL_CASCADE.tiers(spec.get("model_tier", "large"), self.provider):
+            self.small_agents[agent_type] = autogen.ConversableAgent(
+                name=spec["name"],
+                system_message=AgentConfig.get_system_message(agent_type),
+                llm_config={"config_list": self.small_config_list, "temperature": spec["temperature"]},
+                human_input_mode=Config.HUMAN_INPUT_MODE,
+            )
+        return agent
+
     def create_research_agent(self) -> autogen.ConversableAgent:
         """
         ResearchAgent: Market Researcher
         Role: Find and summarize current market competitors and trends
         """
-        system_message = """You are an expert market research analyst specializing in AI-powered
-        interview platforms and recruitment technology. Your task is to:
-
-        1. Research and identify 3-4 major competitors in the AI interview space
-           (e.g., HireVue, Pymetrics, Codility, etc.)
-        2. Summarize their key features and market positioning
-        3. Identify current trends in AI-powered recruiting
-        4. Note any unmet market needs
-
-        Provide a comprehensive competitive landscape analysis. Be specific with competitor names,
-        features, and market gaps you identify.
-
-        Format your response as a structured analysis with clear sections."""
-
-        agent = autogen.ConversableAgent(
-            name="ResearchAgent",
-            system_message=system_message,
-            llm_config={"config_list": self.config_list, "temperature": 0.7},
-            human_input_mode="NEVER",
-        )
-
-        self.agents["research"] = agent
-        return agent
+        return self._create_agent("research")
 
     def create_analysis_agent(self) -> autogen.ConversableAgent:
         """
         AnalysisAgent: Product Analyst
         Role: Analyze research findings and extract key opportunities
         """
-        system_message = """You are a strategic product analyst with expertise in SaaS product
-        development. Based on market research findings, your task is to:
-
-        1. Analyze the competitive landscape provided
-        2. Identify 3 key market gaps or opportunities
-        3. For each opportunity, explain:
-           - What the gap is
-           - Why it matters
-           - How it can be addressed
-           - Potential market size/impact
-
-        Focus on opportunities that are:
-        - Underserved by competitors
-        - Valuable to customers
-        - Technically feasible
-
-        Provide structured analysis with numbered opportunities."""
-
-        agent = autogen.ConversableAgent(
-            name="AnalysisAgent",
-            system_message=system_message,
-            llm_config={"config_list": self.config_list, "temperature": 0.7},
-            human_input_mode="NEVER",
-        )
-
-        self.agents["analysis"] = agent
-        return agent
+        return self._create_agent("analysis")
 
     def create_blueprint_agent(self) -> autogen.ConversableAgent:
         """
         BlueprintAgent: Product Designer
         Role: Create feature list and user flow
         """
-        system_message = """You are an experienced product designer and UX strategist.
-        Based on the market analysis and identified opportunities, create a product blueprint:
-
-        1. Core Features (MVP):
-           - List 5-7 essential features
-           - Include feature descriptions
-           - Explain how each addresses identified opportunities
-
-        2. User Journey:
-           - Map the main user flow for a hiring manager
-           - Include key touchpoints
-           - Describe the interview scheduling and analysis flow
-
-        3. Differentiation:
-           - Highlight how this product stands out
-           - Key competitive advantages
-
-        4. Target User Personas:
-           - Hiring managers
-           - Recruiters
-           - Candidates
-
-        Format as a comprehensive product blueprint document."""
-
-        agent = autogen.ConversableAgent(
-            name="BlueprintAgent",
-            system_message=system_message,
-            llm_config={"config_list": self.config_list, "temperature": 0.7},
-            human_input_mode="NEVER",
-        )
-
-        self.agents["blueprint"] = agent
-        return agent
+        return self._create_agent("blueprint")
 
     def create_reviewer_agent(self) -> autogen.ConversableAgent:
         """
         ReviewerAgent: Product Reviewer
         Role: Review blueprint and suggest improvements
         """
-        system_message = """You are an experienced product executive and business strategist.
-        Your role is to review the product blueprint and provide strategic recommendations:
-
-        1. Feasibility Assessment:
-           - Is the feature set realistic to build?
-           - What might be missing?
-
-        2. Market Viability:
-           - Will this product succeed?
-           - Any market risks?
+        return self._create_agent("reviewer")
+
+    def create_all_agents(self) -> Dict[str, autogen.ConversableAgent]:
+        """Create all four workflow agents"""
+        self.create_research_agent()
+        self.create_analysis_agent()
+        self.create_blueprint_agent()
+        self.create_reviewer_agent()
+        return self.agents
+
+    def reset(self) -> None:
+        """Clear every agent's message state so the agents can serve another run"""
+        for agent in list(self.agents.values()) + list(self.small_agents.values()):
+            agent.reset()
+        self.conversation_history = []
 
-        3. Business Model Suggestions:
-           - Pricing strategy recommendations
-           - Revenue streams
 
-        4. Implementation Roadmap:
-           - Phased launch approach
-           - Key milestones
+def build_interview_agents(provider: ProviderConfig = None) -> InterviewPlatformAgents:
+    """Create an agents manager with all four workflow agents for a run's provider settings"""
+    provider = provider or ProviderConfig.from_env()
+    agents_manager = InterviewPlatformAgents(
+        Config.get_config_list(provider=provider),
+        Config.get_config_list(tier="small", provider=provider) or None,
+        provider=provider,
+    )
+    agents_manager.create_all_agents()
+    return agents_manager
 
-        5. Next Steps & Action Items:
-           - Top 5 priorities for next phase
-           - Resource requirements
 
-        Provide constructive feedback and actionable recommendations."""
+def agent_pool_key(provider: ProviderConfig) -> str:
+    """Pool key: agents are interchangeable when their provider settings are the same"""
+    return provider.cache_key()
 
-        agent = autogen.ConversableAgent(
-            name="ReviewerAgent",
-            system_message=system_message,
-            llm_config={"config_list": self.config_list, "temperature": 0.7},
-            human_input_mode="NEVER",
-        )
 
-        self.agents["reviewer"] = agent
-        return agent
+# Agents are built once per configuration and reset between runs
+INTERVIEW_AGENT_POOL = AgentPool(build=build_interview_agents, reset=InterviewPlatformAgents.reset)
 
 
 # ============================================================================
@@ -183,35 +141,57 @@ class InterviewPlatformAgents:
 class InterviewPlatformWorkflow:
     """Orchestrates the multi-agent conversation workflow"""
 
-    def __init__(self, agents_manager: InterviewPlatformAgents):
+    def __init__(self, agents_manager: InterviewPlatformAgents, run_context: RunContext = None):
         self.agents_manager = agents_manager
+        self.run_context = run_context
+        if run_context is not None:
+            run_context.label("interview")
         self.outputs = {}
 
+    def _generate_reply(self, agent: autogen.ConversableAgent, message: str) -> str:
+        """Ask an agent for a reply, stopping early if the run is cancelled"""
+        messages = [{"content": message, "role": "user"}]
+        with LLM_SCHEDULER.slot(self.run_context, estimate_tokens(messages, Config.AGENT_MAX_TOKENS)) as ticket:
+            if self.run_context is None:
+                reply = agent.generate_reply(messages=messages)
+            else:
+                reply = self.run_context.run(agent.generate_reply, messages=messages)
+            ticket.tokens = estimate_tokens(messages) + estimate_tokens(reply)
+            ticket.model = (agent.llm_config or {}).get("config_list", [{}])[0].get("model")
+        return reply
+
+    def _phase_reply(self, agent_type: str, message: str) -> str:
+        """Reply from the agent's small-model twin, escalating to the large model if validation fails"""
+        spec = AgentConfig.get_agent_config(agent_type)
+
+        def attempt(tier: str) -> str:
+            agents = self.agents_manager.small_agents if tier == "small" else self.agents_manager.agents
+            return self._generate_reply(agents[agent_type], message)
+
+        model_tier = spec.get("model_tier", "large") if agent_type in self.agents_manager.small_agents else "large"
+        return MODEL_CASCADE.run(spec["name"], attempt, spec.get("validator"), model_tier,
+                                 self.agents_manager.provider)
+
+    def _save_output(self, phase: str, output: str) -> None:
+        """Store a phase output and report it to the run context, if any"""
+        self.outputs[phase] = output
+        if self.run_context is not None:
+            self.run_context.record_output(phase, output)
+
     def initiate_research_phase(self) -> str:
         """Start the workflow with market research"""
         print("\n" + "="*80)
         print("PHASE 1: MARKET RESEARCH")
         print("="*80)
 
-        research_agent = self.agents_manager.agents["research"]
-
-        initial_message = """Please conduct a comprehensive market analysis for AI-powered
-        interview platforms. Focus on:
-
-        1. Current market leaders and their key features
-        2. Market trends and innovations
-        3. Unmet needs and gaps
-
-        Provide your analysis in a structured format."""
+        initial_message = WorkflowConfig.build_phase_message("research", {})
 
         # Get research output
-        research_output = research_agent.generate_reply(
-            messages=[{"content": initial_message, "role": "user"}]
-        )
+        research_output = self._phase_reply("research", initial_message)
 
         print("\nResearch Agent Output:")
         print(research_output)
-        self.outputs["research"] = research_output
+        self._save_output("research", research_output)
 
         return research_output
 
@@ -221,23 +201,13 @@ class InterviewPlatformWorkflow:
         print("PHASE 2: MARKET GAP ANALYSIS")
         print("="*80)
 
-        analysis_agent = self.agents_manager.agents["analysis"]
-
-        analysis_message = f"""Based on the following market research, identify 3 key
-        opportunities for an AI-powered interview platform:
-
-        RESEARCH FINDINGS:
-        {research_output}
-
-        Please provide detailed analysis of market gaps and opportunities."""
+        analysis_message = WorkflowConfig.build_phase_message("analysis", {"research": research_output})
 
-        analysis_output = analysis_agent.generate_reply(
-            messages=[{"content": analysis_message, "role": "user"}]
-        )
+        analysis_output = self._phase_reply("analysis", analysis_message)
 
         print("\nAnalysis Agent Output:")
         print(analysis_output)
-        self.outputs["analysis"] = analysis_output
+        self._save_output("analysis", analysis_output)
 
         return analysis_output
 
@@ -247,26 +217,13 @@ class InterviewPlatformWorkflow:
         print("PHASE 3: PRODUCT BLUEPRINT")
         print("="*80)
 
-        blueprint_agent = self.agents_manager.agents["blueprint"]
-
-        blueprint_message = f"""Based on the market research and opportunity analysis below,
-        create a comprehensive product blueprint for an AI-powered interview platform:
-
-        MARKET RESEARCH:
-        {research_output}
-
-        OPPORTUNITY ANALYSIS:
-        {analysis_output}
-
-        Please create a detailed product blueprint with features, user journey, and differentiation."""
+        blueprint_message = WorkflowConfig.build_phase_message("blueprint", {"research": research_output, "analysis": analysis_output})
 
-        blueprint_output = blueprint_agent.generate_reply(
-            messages=[{"content": blueprint_message, "role": "user"}]
-        )
+        blueprint_output = self._phase_reply("blueprint", blueprint_message)
 
         print("\nBlueprint Agent Output:")
         print(blueprint_output)
-        self.outputs["blueprint"] = blueprint_output
+        self._save_output("blueprint", blueprint_output)
 
         return blueprint_output
 
@@ -276,23 +233,13 @@ class InterviewPlatformWorkflow:
         print("PHASE 4: PRODUCT REVIEW & RECOMMENDATIONS")
         print("="*80)
 
-        reviewer_agent = self.agents_manager.agents["reviewer"]
-
-        review_message = f"""Please review the following product blueprint and provide
-        strategic recommendations, feasibility assessment, and next steps:
-
-        PRODUCT BLUEPRINT:
-        {blueprint_output}
+        review_message = WorkflowConfig.build_phase_message("review", {"blueprint": blueprint_output})
 
-        Provide comprehensive review with actionable recommendations."""
-
-        review_output = reviewer_agent.generate_reply(
-            messages=[{"content": review_message, "role": "user"}]
-        )
+        review_output = self._phase_reply("reviewer", review_message)
 
         print("\nReviewer Agent Output:")
         print(review_output)
-        self.outputs["review"] = review_output
+        self._save_output("review", review_output)
 
         return review_output
 
@@ -303,98 +250,37 @@ class InterviewPlatformWorkflow:
         print("="*80)
         print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-        # Phase 1: Research
-        research_output = self.initiate_research_phase()
+        try:
+            # Phase 1: Research
+            research_output = self.initiate_research_phase()
 
-        # Phase 2: Analysis
-        analysis_output = self.conduct_analysis_phase(research_output)
+            # Phase 2: Analysis
+            analysis_output = self.conduct_analysis_phase(research_output)
 
-        # Phase 3: Blueprint
-        blueprint_output = self.create_blueprint_phase(research_output, analysis_output)
+            # Phase 3: Blueprint
+            blueprint_output = self.create_blueprint_phase(research_output, analysis_output)
 
-        # Phase 4: Review
-        review_output = self.conduct_review_phase(blueprint_output)
+            # Phase 4: Review
+            review_output = self.conduct_review_phase(blueprint_output)
+        except RunCancelled as e:
+            print(f"\n⚠️  Workflow stopped ({e}); returning {len(self.outputs)} completed phase(s)")
 
         return self.outputs
 
 
-# ============================================================================
-# OUTPUT PROCESSING AND SAVING
-# ============================================================================
-
-class OutputManager:
-    """Manages and saves workflow outputs"""
-
-    def __init__(self, output_dir: str = None):
-        # Use Config.OUTPUT_DIR if not provided
-        self.output_dir = output_dir or Config.OUTPUT_DIR
-        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-
-    def save_outputs(self, outputs: Dict[str, str]) -> str:
-        """Save all outputs to files"""
-        output_file = os.path.join(self.output_dir, f"workflow_outputs_{self.timestamp}.txt")
-
-        with open(output_file, "w") as f:
-            f.write("="*80 + "\n")
-            f.write("AI-POWERED INTERVIEW PLATFORM - PRODUCT PLAN\n")
-            f.write("="*80 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-            # Research Phase
-            f.write("PHASE 1: MARKET RESEARCH & COMPETITIVE ANALYSIS\n")
-            f.write("-"*80 + "\n")
-            f.write(outputs.get("research", "No research output") + "\n\n")
-
-            # Analysis Phase
-            f.write("PHASE 2: MARKET GAP ANALYSIS & OPPORTUNITIES\n")
-            f.write("-"*80 + "\n")
-            f.write(outputs.get("analysis", "No analysis output") + "\n\n")
-
-            # Blueprint Phase
-            f.write("PHASE 3: PRODUCT BLUEPRINT\n")
-            f.write("-"*80 + "\n")
-            f.write(outputs.get("blueprint", "No blueprint output") + "\n\n")
-
-            # Review Phase
-            f.write("PHASE 4: PRODUCT REVIEW & RECOMMENDATIONS\n")
-            f.write("-"*80 + "\n")
-            f.write(outputs.get("review", "No review output") + "\n\n")
-
-        return output_file
-
-    def create_summary(self, outputs: Dict[str, str]) -> str:
-        """Create a brief summary document"""
-        summary_file = os.path.join(self.output_dir, f"summary_{self.timestamp}.txt")
-
-        with open(summary_file, "w") as f:
-            f.write("EXECUTIVE SUMMARY\n")
-            f.write("="*80 + "\n")
-            f.write("AI-Powered Interview Platform - Product Plan\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-            f.write("WORKFLOW PHASES COMPLETED:\n")
-            f.write("✓ Market Research & Competitive Analysis\n")
-            f.write("✓ Market Gap & Opportunity Identification\n")
-            f.write("✓ Product Blueprint Creation\n")
-            f.write("✓ Strategic Review & Recommendations\n\n")
-
-            f.write("KEY DELIVERABLES:\n")
-            f.write("1. Competitive landscape analysis\n")
-            f.write("2. Three identified market opportunities\n")
-            f.write("3. Product features and user journey\n")
-            f.write("4. Strategic recommendations and next steps\n\n")
-
-            f.write("All outputs saved in workflow_outputs_{}.txt\n".format(self.timestamp))
-
-        return summary_file
-
-
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
-    """Main execution function"""
+def main(run_context: RunContext = None, provider: ProviderConfig = None):
+    """Main execution function
+
+    Args:
+        run_context: Optional run deadline/cancellation (defaults to Config.RUN_DEADLINE)
+        provider: Optional per-run provider settings (defaults to the .env settings)
+    """
+    run_context = run_context or RunContext()
+    provider = provider or ProviderConfig.from_env()
 
     try:
         # Validate configuration
@@ -406,33 +292,28 @@ def main():
 
         print(Config.get_summary())
 
-        # Get configuration list
-        config_list = Config.get_config_list()
+        # Compile system messages and phase prompts once for this process
+        compile_prompts()
 
-        # Create agents
+        # Get agents (built on first use, reused by later runs in this process)
         print("Initializing agents...")
-        agents_manager = InterviewPlatformAgents(config_list)
-
-        agents_manager.create_research_agent()
-        print("✓ ResearchAgent created")
-
-        agents_manager.create_analysis_agent()
-        print("✓ AnalysisAgent created")
-
-        agents_manager.create_blueprint_agent()
-        print("✓ BlueprintAgent created")
-
-        agents_manager.create_reviewer_agent()
-        print("✓ ReviewerAgent created")
-
-        # Execute workflow
-        print("\nInitiating workflow...")
-        workflow = InterviewPlatformWorkflow(agents_manager)
-        outputs = workflow.execute_workflow()
+        with INTERVIEW_AGENT_POOL.acquire(agent_pool_key(provider), provider=provider) as agents_manager:
+            for agent in agents_manager.agents.values():
+                print(f"✓ {agent.name} ready")
+
+            # Execute workflow
+            print("\nInitiating workflow...")
+            workflow = InterviewPlatformWorkflow(agents_manager, run_context)
+            outputs = workflow.execute_workflow()
+            if run_context.cancelled:
+                # An abandoned generate_reply thread may still be using these agents
+                INTERVIEW_AGENT_POOL.discard(agents_manager)
+        if Config.VERBOSE:
+            print(INTERVIEW_AGENT_POOL.describe())
 
         # Save outputs
         print("\nSaving outputs...")
-        output_manager = OutputManager()
+        output_manager = OutputManager(provider=provider)
         output_file = output_manager.save_outputs(outputs)
         summary_file = output_manager.create_summary(outputs)
 
@@ -7,6 +7,11 @@ It demonstrates multi-agent collaboration by having each agent generate response
 
 from datetime import datetime
 from config import Config, WorkflowConfig
+from llm_router import LLMRouter, get_router
+from token_planner import TokenPlanner
+from run_context import RunContext, RunCancelled
+from run_archive import get_archive, archive_reference
+from shared_config import ProviderConfig
 import json
 
 # Try to import OpenAI client
@@ -21,15 +26,31 @@ except ImportError:
 class SimpleInterviewPlatformWorkflow:
     """Simplified workflow for interview platform planning"""
 
-    def __init__(self):
-        """Initialize the workflow"""
+    def __init__(self, run_context: RunContext = None, router: LLMRouter = None,
+                 planner: TokenPlanner = None, provider: ProviderConfig = None):
+        """Initialize the workflow
+
+        Args:
+            run_context: Optional run deadline/cancellation shared by all phases
+            router: Optional shared router (keeps endpoint clients and stats warm);
+                must have been built for the same provider settings
+            planner: Optional shared max_tokens planner (learns completion lengths)
+            provider: Optional per-run provider settings (default: from the environment)
+        """
         if not Config.validate_setup():
             print("ERROR: Configuration validation failed!")
             exit(1)
 
-        self.client = OpenAI(api_key=Config.API_KEY, base_url=Config.API_BASE)
+        # Routes each call to the fastest healthy endpoint (see LLM_ENDPOINTS)
+        self.provider = provider or ProviderConfig.from_env()
+        self.router = router or get_router(self.provider)
+        # Sizes each phase's max_tokens from its past completion lengths
+        self.planner = planner or TokenPlanner()
+        self.run_context = run_context
+        if run_context is not None:
+            run_context.label("interview-simple")
         self.outputs = {}
-        self.model = Config.OPENAI_MODEL
+        self.model = self.provider.model
 
     def run(self):
         """Execute the complete workflow"""
@@ -39,20 +60,31 @@ class SimpleInterviewPlatformWorkflow:
         print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Model: {self.model}\n")
 
-        # Phase 1: Research
-        self.phase_research()
+        try:
+            # Phase 1: Research
+            self.phase_research()
 
-        # Phase 2: Analysis
-        self.phase_analysis()
+            # Phase 2: Analysis
+            self.phase_analysis()
 
-        # Phase 3: Blueprint
-        self.phase_blueprint()
+            # Phase 3: Blueprint
+            self.phase_blueprint()
 
-        # Phase 4: Review
-        self.phase_review()
+            # Phase 4: Review
+            self.phase_review()
+        except RunCancelled as e:
+            print(f"\n⚠️  Run stopped ({e}); returning {len(self.outputs)} completed phase(s)")
+            return self.outputs
 
         # Summary
         self.print_summary()
+        return self.outputs
+
+    def _save_output(self, phase: str, output: str):
+        """Store a phase output and report it to the run context, if any"""
+        self.outputs[phase] = output
+        if self.run_context is not None:
+            self.run_context.record_output(phase, output)
 
     def phase_research(self):
         """Phase 1: Market Research"""
@@ -67,17 +99,17 @@ List their key features and identify market gaps in 150 words."""
 
         user_message = "Analyze the current market for AI-powered interview platforms."
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            temperature=Config.AGENT_TEMPERATURE,
-            max_tokens=Config.AGENT_MAX_TOKENS,
+        response = self.planner.complete(
+            self.router, "simple/ResearchAgent/research",
+            run_context=self.run_context,
+            temperature=self.provider.temperature,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
             ]
         )
 
-        self.outputs["research"] = response.choices[0].message.content
+        self._save_output("research", response.choices[0].message.content)
         print("\n[ResearchAgent Output]")
         print(self.outputs["research"])
 
@@ -97,17 +129,17 @@ Be concise in 150 words."""
 
 Now identify market opportunities and gaps."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            temperature=Config.AGENT_TEMPERATURE,
-            max_tokens=Config.AGENT_MAX_TOKENS,
+        response = self.planner.complete(
+            self.router, "simple/AnalysisAgent/analysis",
+            run_context=self.run_context,
+            temperature=self.provider.temperature,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
             ]
         )
 
-        self.outputs["analysis"] = response.choices[0].message.content
+        self._save_output("analysis", response.choices[0].message.content)
         print("\n[AnalysisAgent Output]")
         print(self.outputs["analysis"])
 
@@ -129,17 +161,17 @@ Keep it concise - 150 words."""
 
 Create a product blueprint for our platform."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            temperature=Config.AGENT_TEMPERATURE,
-            max_tokens=Config.AGENT_MAX_TOKENS,
+        response = self.planner.complete(
+            self.router, "simple/BlueprintAgent/blueprint",
+            run_context=self.run_context,
+            temperature=self.provider.temperature,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
             ]
         )
 
-        self.outputs["blueprint"] = response.choices[0].message.content
+        self._save_output("blueprint", response.choices[0].message.content)
         print("\n[BlueprintAgent Output]")
         print(self.outputs["blueprint"])
 
@@ -159,17 +191,17 @@ Be concise - 150 words."""
 
 Provide strategic review and recommendations."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            temperature=Config.AGENT_TEMPERATURE,
-            max_tokens=Config.AGENT_MAX_TOKENS,
+        response = self.planner.complete(
+            self.router, "simple/ReviewerAgent/review",
+            run_context=self.run_context,
+            temperature=self.provider.temperature,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
             ]
         )
 
-        self.outputs["review"] = response.choices[0].message.content
+        self._save_output("review", response.choices[0].message.content)
         print("\n[ReviewerAgent Output]")
         print(self.outputs["review"])
 
@@ -215,7 +247,15 @@ demonstrating the sequential workflow pattern of AutoGen.
         print("-"*80)
         print(self.outputs["review"])
 
-        # Save to file
+        # Save to the run archive, or to a file with ARCHIVE_RUNS=False
+        if Config.ARCHIVE_RUNS:
+            run_id = get_archive().put_run("interview-simple", self.outputs,
+                                           metadata={"provider": self.provider.provider, "model": self.model})
+            print(f"\n💾 Full results saved to: {archive_reference(run_id)}")
+            print(f"\nEnd Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print("="*80)
+            return
+
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = f"workflow_outputs_{timestamp}.txt"
         with open(output_file, 'w') as f:
@@ -253,7 +293,7 @@ demonstrating the sequential workflow pattern of AutoGen.
 
 if __name__ == "__main__":
     try:
-        workflow = SimpleInterviewPlatformWorkflow()
+        workflow = SimpleInterviewPlatformWorkflow(run_context=RunContext())
         workflow.run()
         print("\n✅ Workflow completed successfully!")
     except Exception as e:
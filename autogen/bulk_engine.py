@@ -0,0 +1,137 @@
+"""
+Bulk Workflow Engine - Interview Platform Product Planning
+
+Runs thousands of interview workflow runs as offline batch completions
+instead of thousands of interactive calls. Latency per run does not matter
+overnight, but throughput and cost do, and Batch API requests are billed at
+a discount. The engine works phase by phase:
+
+1. Build the phase-1 (research) prompts of every run and submit them as one
+   batch-completions job (split by BULK_MAX_REQUESTS)
+2. Poll until the batch is done and store each run's output
+3. Build the phase-2 prompts from those outputs, submit them as the next
+   batch, and so on through the review phase
+
+It sends the same system messages and phase prompts as the native engine.
+Agents that cascade are first batched on the small model. Outputs that fail
+their validator, and requests that errored, are resubmitted in a follow-up
+batch on the large model. A run whose phase still has no output is dropped
+from the later phases and reported in errors.
+
+Usage:
+    python cli.py bulk --runs 1000                   # BULK_BACKEND=openai (Batch API)
+    python cli.py bulk --runs 20 --backend local     # local stand-in for testing
+
+    from bulk_engine import BulkWorkflowEngine
+    engine = BulkWorkflowEngine()
+    outputs = engine.run([f"run-{i}" for i in range(1000)])
+    engine.save(outputs)
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from config import Config, AgentConfig, WorkflowConfig, compile_prompts
+from batch_client import BatchClient, batch_request, create_batch_client
+from model_cascade import MODEL_CASCADE, validate_output
+from native_engine import phase_messages
+from token_planner import TokenPlanner
+from shared_config import ProviderConfig
+
+
+class BulkWorkflowEngine:
+    """Runs the WorkflowConfig phases for many runs, one batch per phase and model tier"""
+
+    def __init__(self, client: BatchClient = None, phases: Optional[List[str]] = None,
+                 planner: TokenPlanner = None, provider: ProviderConfig = None,
+                 poll_interval: Optional[float] = None):
+        """
+        Args:
+            client: Batch client (default: create_batch_client() for BULK_BACKEND)
+            phases: Phases to run in order (default: WorkflowConfig.PHASES)
+            planner: max_tokens planner shared with the interactive engines
+            provider: Provider settings; models come from the first endpoint (default: from the environment)
+            poll_interval: Seconds between batch status checks (default: BULK_POLL_INTERVAL)
+        """
+        self.provider = provider or ProviderConfig.from_env()
+        self.client = client or create_batch_client(provider=self.provider)
+        self.phases = phases or WorkflowConfig.PHASES
+        self.planner = planner or TokenPlanner()
+        self.poll_interval = poll_interval
+        self.errors: Dict[str, str] = {}
+        compile_prompts()
+
+    def build_body(self, phase: str, outputs: Dict[str, str], tier: str) -> Dict[str, Any]:
+        """Chat completion request body for one run's phase on a model tier"""
+        spec = AgentConfig.get_agent_config(WorkflowConfig.PHASE_AGENTS[phase])
+        endpoint = self.provider.get_endpoints()[0]
+        messages = phase_messages(phase, outputs)
+        return {
+            "model": endpoint["small_model"] if tier == "small" and endpoint["small_model"] else endpoint["model"],
+            "messages": messages,
+            "temperature": spec["temperature"],
+            "max_tokens": self.planner.plan(f"{spec['name']}/{phase}", messages, tier),
+        }
+
+    def run_phase(self, phase: str, outputs: Dict[str, Dict[str, str]]) -> None:
+        """Run one phase for every run that completed the earlier phases"""
+        spec = AgentConfig.get_agent_config(WorkflowConfig.PHASE_AGENTS[phase])
+        key = f"{spec['name']}/{phase}"
+        tiers = MODEL_CASCADE.tiers(spec.get("model_tier", "large"), self.provider)
+        pending = [run_id for run_id in outputs if run_id not in self.errors]
+
+        for index, tier in enumerate(tiers):
+            last_tier = index == len(tiers) - 1
+            requests = [batch_request(f"{run_id}/{phase}", self.build_body(phase, outputs[run_id], tier))
+                        for run_id in pending]
+            results = self.client.run(requests, self.poll_interval,
+                                      label=f"{WorkflowConfig.get_phase_description(phase)} ({tier} model)")
+
+            retry = []
+            for run_id in pending:
+                result = results[f"{run_id}/{phase}"]
+                if result["error"]:
+                    if last_tier:
+                        self.errors[run_id] = f"{phase}: {result['error']}"
+                    else:
+                        retry.append(run_id)
+                    continue
+                choice = result["response"]["choices"][0]
+                text = choice["message"]["content"]
+                if not last_tier and validate_output(text, spec.get("validator")):
+                    retry.append(run_id)
+                    continue
+                outputs[run_id][phase] = text
+                MODEL_CASCADE.record(spec["name"], tier, escalated=index > 0)
+                usage = result["response"].get("usage")
+                if usage and choice.get("finish_reason") != "length":
+                    self.planner.record(key, usage["completion_tokens"], tier)
+            pending = retry
+            if not pending:
+                break
+
+    def run(self, run_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Run all phases for every run.
+
+        Returns:
+            Dict[str, Dict[str, str]]: Phase outputs per run id (runs listed in
+            self.errors stop at the phase that failed)
+        """
+        outputs = {run_id: {} for run_id in run_ids}
+        for phase in self.phases:
+            if Config.VERBOSE:
+                print(f"\n[{WorkflowConfig.get_phase_description(phase)}] {len(outputs) - len(self.errors)} run(s)")
+            self.run_phase(phase, outputs)
+        return outputs
+
+    def save(self, outputs: Dict[str, Dict[str, str]], path: Optional[str] = None) -> str:
+        """Write one JSON line per run ({"run_id", "outputs", "error"}) and return the file path"""
+        path = Path(path or Path(Config.BULK_DIR) / f"bulk_outputs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            for run_id, run_outputs in outputs.items():
+                f.write(json.dumps({"run_id": run_id, "outputs": run_outputs, "error": self.errors.get(run_id)}) + "\n")
+        return str(path)
@@ -25,7 +25,8 @@ from typing import List, Dict, Any
 # Add parent directory to path to import shared_config
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from shared_config import Config as SharedConfig
+from shared_config import Config as SharedConfig, ProviderConfig
+from prompt_compiler import PROMPT_COMPILER
 
 
 class Config(SharedConfig):
@@ -46,23 +47,36 @@ class Config(SharedConfig):
     CREATE_SUMMARY = True
 
     @classmethod
-    def get_config_list(cls) -> List[Dict[str, Any]]:
+    def get_config_list(cls, tier: str = "large", provider: ProviderConfig = None) -> List[Dict[str, Any]]:
         """
         Get LLM configuration list for AutoGen.
 
+        Returns one entry per configured endpoint (see LLM_ENDPOINTS).
+
+        Args:
+            tier: "large" for each endpoint's model, "small" for its cascade
+                small_model (endpoints without one are left out)
+            provider: Per-run provider settings (default: from the environment)
+
         Returns:
             List[Dict[str, Any]]: Configuration list compatible with AutoGen
         """
-        config = {
-            "model": cls.OPENAI_MODEL,
-            "api_key": cls.API_KEY,
-            "api_type": "openai",  # Works for both OpenAI and Groq
-        }
-
-        # Always include api_base (needed for Groq)
-        config["api_base"] = cls.API_BASE
-
-        return [config]
+        config_list = []
+        for endpoint in (provider or ProviderConfig.from_env()).get_endpoints():
+            model = endpoint["small_model"] if tier == "small" else endpoint["model"]
+            if not model:
+                continue
+            config = {
+                "model": model,
+                "api_key": endpoint["api_key"],
+                "api_type": "openai",  # Works for both OpenAI and Groq
+            }
+
+            # Always include api_base (needed for Groq)
+            config["api_base"] = endpoint["api_base"]
+            config_list.append(config)
+
+        return config_list
 
     @classmethod
     def validate_setup(cls) -> bool:
@@ -97,30 +111,121 @@ Configuration Summary:
 
 
 class AgentConfig:
-    """Configuration for individual agents"""
+    """
+    Configuration for individual agents
+
+    model_tier selects the model cascade behaviour ("cascade", "small" or
+    "large", see model_cascade.py); validator holds the rules an output must
+    pass before the small model's answer is accepted.
+    """
 
     RESEARCH_AGENT = {
         "name": "ResearchAgent",
         "role": "Market Researcher",
         "temperature": 0.7,
+        "model_tier": "cascade",
+        "validator": {"min_words": 250, "required_sections": ["competitor", "trend"], "min_items": 3},
+        "system_message": """You are an expert market research analyst specializing in AI-powered
+        interview platforms and recruitment technology. Your task is to:
+
+        1. Research and identify 3-4 major competitors in the AI interview space
+           (e.g., HireVue, Pymetrics, Codility, etc.)
+        2. Summarize their key features and market positioning
+        3. Identify current trends in AI-powered recruiting
+        4. Note any unmet market needs
+
+        Provide a comprehensive competitive landscape analysis. Be specific with competitor names,
+        features, and market gaps you identify.
+
+        Format your response as a structured analysis with clear sections.""",
     }
 
     ANALYSIS_AGENT = {
         "name": "AnalysisAgent",
         "role": "Product Analyst",
         "temperature": 0.7,
+        "model_tier": "cascade",
+        "validator": {"min_words": 250, "required_sections": ["gap", "opportunit"], "min_items": 3},
+        "system_message": """You are a strategic product analyst with expertise in SaaS product
+        development. Based on market research findings, your task is to:
+
+        1. Analyze the competitive landscape provided
+        2. Identify 3 key market gaps or opportunities
+        3. For each opportunity, explain:
+           - What the gap is
+           - Why it matters
+           - How it can be addressed
+           - Potential market size/impact
+
+        Focus on opportunities that are:
+        - Underserved by competitors
+        - Valuable to customers
+        - Technically feasible
+
+        Provide structured analysis with numbered opportunities.""",
     }
 
     BLUEPRINT_AGENT = {
         "name": "BlueprintAgent",
         "role": "Product Designer",
         "temperature": 0.7,
+        "model_tier": "cascade",
+        "validator": {"min_words": 400, "required_sections": ["feature", "user journey", "differentiat", "persona"], "min_items": 5},
+        "system_message": """You are an experienced product designer and UX strategist.
+        Based on the market analysis and identified opportunities, create a product blueprint:
+
+        1. Core Features (MVP):
+           - List 5-7 essential features
+           - Include feature descriptions
+           - Explain how each addresses identified opportunities
+
+        2. User Journey:
+           - Map the main user flow for a hiring manager
+           - Include key touchpoints
+           - Describe the interview scheduling and analysis flow
+
+        3. Differentiation:
+           - Highlight how this product stands out
+           - Key competitive advantages
+
+        4. Target User Personas:
+           - Hiring managers
+           - Recruiters
+           - Candidates
+
+        Format as a comprehensive product blueprint document.""",
     }
 
     REVIEWER_AGENT = {
         "name": "ReviewerAgent",
         "role": "Product Reviewer",
         "temperature": 0.7,
+        "model_tier": "large",
+        "validator": {"min_words": 300, "required_sections": ["feasibility", "pricing", "roadmap", "next step"]},
+        "system_message": """You are an experienced product executive and business strategist.
+        Your role is to review the product blueprint and provide strategic recommendations:
+
+        1. Feasibility Assessment:
+           - Is the feature set realistic to build?
+           - What might be missing?
+
+        2. Market Viability:
+           - Will this product succeed?
+           - Any market risks?
+
+        3. Business Model Suggestions:
+           - Pricing strategy recommendations
+           - Revenue streams
+
+        4. Implementation Roadmap:
+           - Phased launch approach
+           - Key milestones
+
+        5. Next Steps & Action Items:
+           - Top 5 priorities for next phase
+           - Resource requirements
+
+        Provide constructive feedback and actionable recommendations.""",
     }
 
     @classmethod
@@ -134,6 +239,12 @@ class AgentConfig:
         }
         return agents.get(agent_type, {})
 
+    @classmethod
+    def get_system_message(cls, agent_type: str) -> str:
+        """Get the compiled (whitespace-normalized) system message for an agent type"""
+        spec = cls.get_agent_config(agent_type)
+        return PROMPT_COMPILER.compile(f"{spec['name']}.system_message", spec["system_message"])
+
 
 class WorkflowConfig:
     """Configuration for workflow parameters"""
@@ -162,6 +273,54 @@ class WorkflowConfig:
         "review": "Review blueprint and provide strategic recommendations",
     }
 
+    # Agent (see AgentConfig) that runs each phase
+    PHASE_AGENTS = {
+        "research": "research",
+        "analysis": "analysis",
+        "blueprint": "blueprint",
+        "review": "reviewer",
+    }
+
+    # User message for each phase; {research}, {analysis} and {blueprint} are
+    # replaced with the outputs of those earlier phases
+    PHASE_PROMPTS = {
+        "research": """Please conduct a comprehensive market analysis for AI-powered
+        interview platforms. Focus on:
+
+        1. Current market leaders and their key features
+        2. Market trends and innovations
+        3. Unmet needs and gaps
+
+        Provide your analysis in a structured format.""",
+
+        "analysis": """Based on the following market research, identify 3 key
+        opportunities for an AI-powered interview platform:
+
+        RESEARCH FINDINGS:
+        {research}
+
+        Please provide detailed analysis of market gaps and opportunities.""",
+
+        "blueprint": """Based on the market research and opportunity analysis below,
+        create a comprehensive product blueprint for an AI-powered interview platform:
+
+        MARKET RESEARCH:
+        {research}
+
+        OPPORTUNITY ANALYSIS:
+        {analysis}
+
+        Please create a detailed product blueprint with features, user journey, and differentiation.""",
+
+        "review": """Please review the following product blueprint and provide
+        strategic recommendations, feasibility assessment, and next steps:
+
+        PRODUCT BLUEPRINT:
+        {blueprint}
+
+        Provide comprehensive review with actionable recommendations.""",
+    }
+
     @classmethod
     def get_phase_description(cls, phase: str) -> str:
         """Get description for a specific phase"""
@@ -171,3 +330,26 @@ class WorkflowConfig:
     def get_task_description(cls, phase: str) -> str:
         """Get task description for a specific phase"""
         return cls.TASK_DESCRIPTIONS.get(phase, "Unknown Task")
+
+    @classmethod
+    def get_phase_template(cls, phase: str) -> str:
+        """Get a phase's compiled user message template (static instructions first)"""
+        return PROMPT_COMPILER.compile(f"{phase}.prompt", cls.PHASE_PROMPTS[phase])
+
+    @classmethod
+    def build_phase_message(cls, phase: str, outputs: Dict[str, str]) -> str:
+        """Fill a phase's user message with the outputs of earlier phases"""
+        return cls.get_phase_template(phase).format(**outputs)
+
+
+def compile_prompts() -> None:
+    """
+    Compile every agent system message and phase prompt ahead of the first run.
+
+    Later lookups are cache hits; with VERBOSE the before/after token counts are printed.
+    """
+    for phase in WorkflowConfig.PHASES:
+        AgentConfig.get_system_message(WorkflowConfig.PHASE_AGENTS[phase])
+        WorkflowConfig.get_phase_template(phase)
+    if Config.VERBOSE:
+        PROMPT_COMPILER.print_report()
@@ -0,0 +1,113 @@
+"""
+Native Workflow Engine - Interview Platform Product Planning
+
+Executes the declarative agent and phase specs in config.py (AgentConfig and
+WorkflowConfig) directly on the shared OpenAI client, without importing
+pyautogen. It sends the same system messages and phase prompts as
+InterviewPlatformAgents/InterviewPlatformWorkflow, so both engines run the
+same conversation; this one just has the lowest import time, memory use and
+per-call overhead.
+
+Usage:
+    python native_engine.py
+    # or: python cli.py interview-native
+
+    from native_engine import NativeWorkflowEngine
+    outputs = NativeWorkflowEngine().run()
+"""
+
+from typing import Dict, List, Optional
+
+from config import Config, AgentConfig, WorkflowConfig, compile_prompts
+from llm_router import LLMRouter, get_router
+from model_cascade import MODEL_CASCADE
+from token_planner import TokenPlanner
+from output_manager import OutputManager
+from run_context import RunContext, RunCancelled
+from shared_config import ProviderConfig
+
+
+def phase_messages(phase: str, outputs: Dict[str, str]) -> List[Dict[str, str]]:
+    """Chat messages for one phase: the agent's system message plus the phase prompt"""
+    return [
+        {"role": "system", "content": AgentConfig.get_system_message(WorkflowConfig.PHASE_AGENTS[phase])},
+        {"role": "user", "content": WorkflowConfig.build_phase_message(phase, outputs)},
+    ]
+
+
+class NativeWorkflowEngine:
+    """Runs WorkflowConfig phases with the agents described in AgentConfig"""
+
+    def __init__(self, router: LLMRouter = None, run_context: RunContext = None,
+                 phases: Optional[List[str]] = None, planner: TokenPlanner = None,
+                 provider: ProviderConfig = None):
+        """
+        Args:
+            router: Optional shared router (keeps endpoint clients and stats warm);
+                must have been built for the same provider settings
+            run_context: Optional run deadline/cancellation shared by all phases
+            phases: Phases to run in order (default: WorkflowConfig.PHASES)
+            planner: Optional shared max_tokens planner (learns completion lengths)
+            provider: Optional per-run provider settings (default: from the environment)
+        """
+        self.provider = provider or ProviderConfig.from_env()
+        self.router = router or get_router(self.provider)
+        self.planner = planner or TokenPlanner()
+        self.run_context = run_context
+        if run_context is not None:
+            run_context.label("interview-native")
+        self.phases = phases or WorkflowConfig.PHASES
+        self.outputs: Dict[str, str] = {}
+        compile_prompts()
+
+    def build_messages(self, phase: str, outputs: Dict[str, str]) -> List[Dict[str, str]]:
+        """Chat messages for one phase: the agent's system message plus the phase prompt"""
+        return phase_messages(phase, outputs)
+
+    def run_phase(self, phase: str) -> str:
+        """Run one phase on the outputs gathered so far and store its output"""
+        spec = AgentConfig.get_agent_config(WorkflowConfig.PHASE_AGENTS[phase])
+        if Config.VERBOSE:
+            print(f"[{spec['name']}] {WorkflowConfig.get_phase_description(phase)}...")
+
+        messages = self.build_messages(phase, self.outputs)
+
+        def attempt(tier: str) -> str:
+            response = self.planner.complete(
+                self.router, f"{spec['name']}/{phase}",
+                messages=messages,
+                run_context=self.run_context,
+                temperature=spec["temperature"],
+                model_tier=tier,
+            )
+            return response.choices[0].message.content
+
+        # Small model first when the agent cascades; large model if its validator fails
+        output = MODEL_CASCADE.run(spec["name"], attempt, spec.get("validator"),
+                                   spec.get("model_tier", "large"), self.provider)
+
+        self.outputs[phase] = output
+        if self.run_context is not None:
+            self.run_context.record_output(phase, output)
+        return output
+
+    def run(self) -> Dict[str, str]:
+        """Run all phases in order; returns partial outputs if the run is cancelled"""
+        try:
+            for phase in self.phases:
+                self.run_phase(phase)
+        except RunCancelled as e:
+            print(f"⚠️  Run stopped ({e}); returning {len(self.outputs)} completed phase(s)")
+        return self.outputs
+
+
+if __name__ == "__main__":
+    if not Config.validate_setup():
+        exit(1)
+
+    engine = NativeWorkflowEngine(run_context=RunContext())
+    outputs = engine.run()
+
+    output_manager = OutputManager(workflow="interview-native", provider=engine.provider)
+    print(f"\n💾 Full results saved to: {output_manager.save_outputs(outputs)}")
+    print(f"💾 Summary saved to: {output_manager.create_summary(outputs)}")
@@ -0,0 +1,106 @@
+"""
+Output Manager for the Interview Platform Workflows
+
+Writes the phase outputs of an interview platform run to a timestamped
+report and a short executive summary. Shared by the AutoGen workflow and the
+native engine, and importable without pyautogen.
+
+With ARCHIVE_RUNS (the default) the outputs are added to the run archive
+(run_archive.py) instead, and both methods return the run's archive reference.
+"""
+
+import os
+from datetime import datetime
+from typing import Dict, Any
+
+from config import Config
+from shared_config import ProviderConfig
+from run_archive import get_archive, archive_reference
+
+
+class OutputManager:
+    """Manages and saves workflow outputs"""
+
+    def __init__(self, output_dir: str = None, workflow: str = "interview", provider: ProviderConfig = None):
+        # Use Config.OUTPUT_DIR if not provided
+        self.output_dir = output_dir or Config.OUTPUT_DIR
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Workflow name the run is archived under
+        self.workflow = workflow
+        # Provider settings the run used (per-job overrides included), recorded with its outputs
+        self.provider = provider or ProviderConfig.from_env()
+        self.run_id = None
+
+    def run_metadata(self) -> Dict[str, Any]:
+        """Provider and models the run's outputs came from"""
+        metadata = {"provider": self.provider.provider, "model": self.provider.model}
+        if self.provider.small_model:
+            metadata["small_model"] = self.provider.small_model
+        return metadata
+
+    def save_outputs(self, outputs: Dict[str, str]) -> str:
+        """Save all outputs to files"""
+        if Config.ARCHIVE_RUNS:
+            self.run_id = get_archive().put_run(self.workflow, outputs, metadata=self.run_metadata())
+            return archive_reference(self.run_id)
+
+        output_file = os.path.join(self.output_dir, f"workflow_outputs_{self.timestamp}.txt")
+
+        with open(output_file, "w") as f:
+            f.write("="*80 + "\n")
+            f.write("AI-POWERED INTERVIEW PLATFORM - PRODUCT PLAN\n")
+            f.write("="*80 + "\n")
+            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Model: {self.provider.model} ({self.provider.provider})\n\n")
+
+            # Research Phase
+            f.write("PHASE 1: MARKET RESEARCH & COMPETITIVE ANALYSIS\n")
+            f.write("-"*80 + "\n")
+            f.write(outputs.get("research", "No research output") + "\n\n")
+
+            # Analysis Phase
+            f.write("PHASE 2: MARKET GAP ANALYSIS & OPPORTUNITIES\n")
+            f.write("-"*80 + "\n")
+            f.write(outputs.get("analysis", "No analysis output") + "\n\n")
+
+            # Blueprint Phase
+            f.write("PHASE 3: PRODUCT BLUEPRINT\n")
+            f.write("-"*80 + "\n")
+            f.write(outputs.get("blueprint", "No blueprint output") + "\n\n")
+
+            # Review Phase
+            f.write("PHASE 4: PRODUCT REVIEW & RECOMMENDATIONS\n")
+            f.write("-"*80 + "\n")
+            f.write(outputs.get("review", "No review output") + "\n\n")
+
+        return output_file
+
+    def create_summary(self, outputs: Dict[str, str]) -> str:
+        """Create a brief summary document"""
+        if Config.ARCHIVE_RUNS:
+            # The summary text is fixed; the archived run is all that needs keeping
+            return archive_reference(self.run_id) if self.run_id else self.save_outputs(outputs)
+
+        summary_file = os.path.join(self.output_dir, f"summary_{self.timestamp}.txt")
+
+        with open(summary_file, "w") as f:
+            f.write("EXECUTIVE SUMMARY\n")
+            f.write("="*80 + "\n")
+            f.write("AI-Powered Interview Platform - Product Plan\n")
+            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+            f.write("WORKFLOW PHASES COMPLETED:\n")
+            f.write("✓ Market Research & Competitive Analysis\n")
+            f.write("✓ Market Gap & Opportunity Identification\n")
+            f.write("✓ Product Blueprint Creation\n")
+            f.write("✓ Strategic Review & Recommendations\n\n")
+
+            f.write("KEY DELIVERABLES:\n")
+            f.write("1. Competitive landscape analysis\n")
+            f.write("2. Three identified market opportunities\n")
+            f.write("3. Product features and user journey\n")
+            f.write("4. Strategic recommendations and next steps\n\n")
+
+            f.write("All outputs saved in workflow_outputs_{}.txt\n".format(self.timestamp))
+
+        return summary_file
@@ -0,0 +1,293 @@
+"""
+Batch Completions Clients for AutoGen and CrewAI Lab Demo
+
+Submits many chat completion requests as one asynchronous batch instead of
+thousands of interactive chat.completions.create calls. Requests and results
+use the OpenAI Batch file format, one JSON object per line:
+
+    request: {"custom_id": "run-1/research", "method": "POST",
+              "url": "/v1/chat/completions", "body": {"model": ..., "messages": [...]}}
+    result:  {"custom_id": "run-1/research", "response": {"status_code": 200, "body": {...}},
+              "error": null}
+
+Clients:
+- OpenAIBatchClient: uploads the file to the Batch API of the primary endpoint
+  (OpenAI, or any compatible provider such as Groq) and downloads the results
+- LocalBatchClient:  stand-in for testing. It runs each request itself, through
+  LLMRouter or a given function, and writes the same result files.
+
+Usage:
+    from batch_client import OpenAIBatchClient, batch_request
+
+    client = OpenAIBatchClient()
+    results = client.run([batch_request("run-1/research", body), ...])
+    results["run-1/research"]["response"]["choices"][0]["message"]["content"]
+"""
+
+import abc
+import json
+import time
+import uuid
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional
+
+from shared_config import Config, ProviderConfig
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def batch_request(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """One line of a batch input file"""
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def write_batch_file(path: Path, lines: List[Dict[str, Any]]) -> Path:
+    """Write batch requests or results as JSON lines"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for line in lines:
+            f.write(json.dumps(line, default=str) + "\n")
+    return path
+
+
+def parse_results(text: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a batch output (or error) file.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {custom_id: {"response": completion body or None, "error": message or None}}
+    """
+    results = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        error = record.get("error")
+        if response.get("status_code", 200) != 200 and not error:
+            error = (response.get("body") or {}).get("error") or f"HTTP {response.get('status_code')}"
+        results[record["custom_id"]] = {
+            "response": response.get("body") if not error else None,
+            "error": (error.get("message") if isinstance(error, dict) else error) or None,
+        }
+    return results
+
+
+# ============================================================================
+# CLIENTS
+# ============================================================================
+
+class BatchClient(abc.ABC):
+    """Submits batches, polls them and collects their results"""
+
+    def __init__(self, directory: Optional[str] = None, max_requests: Optional[int] = None):
+        """
+        Args:
+            directory: Where batch input and result files are written (default: BULK_DIR)
+            max_requests: Requests per batch; larger submissions are split (default: BULK_MAX_REQUESTS)
+        """
+        self.directory = Path(directory or Config.BULK_DIR)
+        self.max_requests = max_requests or Config.BULK_MAX_REQUESTS
+
+    @abc.abstractmethod
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        """Submit one batch and return its id"""
+
+    @abc.abstractmethod
+    def status(self, batch_id: str) -> str:
+        """Batch status: "validating", "in_progress", "completed", "failed", ..."""
+
+    @abc.abstractmethod
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        """Results of a finished batch (see parse_results)"""
+
+    @abc.abstractmethod
+    def cancel(self, batch_id: str) -> None:
+        """Stop a batch that is no longer waited for"""
+
+    def run(self, requests: List[Dict[str, Any]], poll_interval: Optional[float] = None,
+            label: str = "batch", max_wait: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit requests (split into batches of max_requests), wait for all of
+        them and return the merged results. Requests missing from the results,
+        e.g. because their batch failed or expired, are reported as errors.
+        Batches still unfinished after max_wait seconds (default: BULK_MAX_WAIT;
+        0 waits forever) are cancelled and their requests reported as errors.
+        """
+        poll_interval = Config.BULK_POLL_INTERVAL if poll_interval is None else poll_interval
+        max_wait = Config.BULK_MAX_WAIT if max_wait is None else max_wait
+        batch_ids = [self.submit(requests[start:start + self.max_requests])
+                     for start in range(0, len(requests), self.max_requests)]
+        if Config.VERBOSE:
+            print(f"📦 {label}: {len(requests)} request(s) submitted in {len(batch_ids)} batch(es)")
+
+        pending = dict.fromkeys(batch_ids)
+        started = time.monotonic()
+        while True:
+            for batch_id in list(pending):
+                status = self.status(batch_id)
+                if status in TERMINAL_STATUSES:
+                    pending.pop(batch_id)
+                    if status != "completed":
+                        print(f"⚠️  Batch {batch_id} ended {status}")
+            if not pending:
+                break
+            if max_wait and time.monotonic() - started >= max_wait:
+                for batch_id in pending:
+                    print(f"⚠️  Batch {batch_id} still running after {max_wait:g}s; cancelling it")
+                    try:
+                        self.cancel(batch_id)
+                    except Exception as e:
+                        print(f"⚠️  Could not cancel batch {batch_id}: {e}")
+                break
+            time.sleep(poll_interval)
+
+        results = {}
+        for batch_id in batch_ids:
+            if batch_id not in pending:
+                results.update(self.results(batch_id))
+        error = "batch timed out" if pending else "no result returned"
+        for request in requests:
+            results.setdefault(request["custom_id"], {"response": None, "error": error})
+        if Config.VERBOSE:
+            failed = sum(1 for result in results.values() if result["error"])
+            print(f"   {label}: done in {time.monotonic() - started:.0f}s ({failed} failed)")
+        return results
+
+
+class OpenAIBatchClient(BatchClient):
+    """Runs batches on the primary endpoint's Batch API"""
+
+    def __init__(self, provider: Optional[ProviderConfig] = None, completion_window: str = "24h", **kwargs):
+        """
+        Args:
+            provider: Provider settings; the first endpoint is used (default: from the environment)
+            completion_window: Batch completion window
+            **kwargs: See BatchClient
+        """
+        super().__init__(**kwargs)
+        self.provider = provider or ProviderConfig.from_env()
+        self.completion_window = completion_window
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import OpenAI
+            endpoint = self.provider.get_endpoints()[0]
+            self._client = OpenAI(api_key=endpoint["api_key"], base_url=endpoint["api_base"],
+                                  timeout=self.provider.timeout)
+        return self._client
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        path = write_batch_file(self.directory / f"batch_input_{uuid.uuid4().hex[:12]}.jsonl", requests)
+        with open(path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(input_file_id=input_file.id, endpoint=BATCH_ENDPOINT,
+                                           completion_window=self.completion_window)
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def cancel(self, batch_id: str) -> None:
+        self.client.batches.cancel(batch_id)
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        for file_id in (batch.error_file_id, batch.output_file_id):
+            if file_id:
+                text = self.client.files.content(file_id).text
+                (self.directory / f"batch_output_{batch_id}_{file_id}.jsonl").write_text(text)
+                results.update(parse_results(text))
+        return results
+
+
+class LocalBatchClient(BatchClient):
+    """Stand-in for a Batch API: runs each request locally and writes the same files"""
+
+    def __init__(self, complete: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 workers: int = 4, provider: Optional[ProviderConfig] = None, **kwargs):
+        """
+        Args:
+            complete: Turns a request body into a chat completion dict
+                (default: send it through an LLMRouter for provider)
+            workers: Requests processed at once
+            provider: Provider settings for the default router
+            **kwargs: See BatchClient
+        """
+        super().__init__(**kwargs)
+        self.complete = complete or self._router_complete
+        self.provider = provider
+        self.workers = workers
+        self._router = None
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _router_complete(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            if self._router is None:
+                from llm_router import get_router
+                self._router = get_router(self.provider)
+        body = dict(body)
+        messages = body.pop("messages")
+        return self._router.complete(messages=messages, **body).model_dump()
+
+    def _result(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            body = self.complete(request["body"])
+        except Exception as e:
+            return {"custom_id": request["custom_id"], "response": None, "error": {"message": str(e)}}
+        return {"custom_id": request["custom_id"], "response": {"status_code": 200, "body": body}, "error": None}
+
+    def _process(self, batch_id: str, requests: List[Dict[str, Any]]) -> None:
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                lines = list(executor.map(self._result, requests))
+            path = write_batch_file(self.directory / f"batch_output_{batch_id}.jsonl", lines)
+        except Exception as e:
+            # Without a terminal status run() would poll this batch forever
+            print(f"⚠️  Local batch {batch_id} failed: {e}")
+            status, path = "failed", None
+        else:
+            status = "completed"
+        with self._lock:
+            if self._batches[batch_id]["status"] != "cancelled":
+                self._batches[batch_id] = {"status": status, "output": path}
+
+    def submit(self, requests: List[Dict[str, Any]]) -> str:
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        write_batch_file(self.directory / f"batch_input_{batch_id}.jsonl", requests)
+        with self._lock:
+            self._batches[batch_id] = {"status": "in_progress", "output": None}
+        threading.Thread(target=self._process, args=(batch_id, requests), daemon=True).start()
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        with self._lock:
+            return self._batches[batch_id]["status"]
+
+    def cancel(self, batch_id: str) -> None:
+        # Requests already handed to the workers still finish; their results are dropped
+        with self._lock:
+            if self._batches[batch_id]["status"] == "in_progress":
+                self._batches[batch_id]["status"] = "cancelled"
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            path = self._batches[batch_id]["output"]
+        return parse_results(Path(path).read_text()) if path else {}
+
+
+def create_batch_client(backend: Optional[str] = None, **kwargs) -> BatchClient:
+    """Batch client for BULK_BACKEND ("openai" or "local")"""
+    backend = (backend or Config.BULK_BACKEND).lower()
+    if backend == "openai":
+        return OpenAIBatchClient(**kwargs)
+    if backend == "local":
+        return LocalBatchClient(**kwargs)
+    raise ValueError(f"Unknown bulk backend: {backend} (expected openai or local)")
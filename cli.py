@@ -0,0 +1,659 @@
+"""
+Unified Command-Line Interface for AutoGen and CrewAI Lab Demo
+
+One entry point for all workflows. Each subcommand imports its framework only
+when it runs, so validating the configuration does not pay for importing
+AutoGen, CrewAI or the OpenAI client.
+
+Usage:
+    python cli.py validate
+    python cli.py interview
+    python cli.py interview-simple
+    python cli.py interview-native                       # no pyautogen import
+    python cli.py travel --destination France --duration "7 days" --departure "Los Angeles"
+    python cli.py serve                                  # warm worker daemon
+    python cli.py service                                # HTTP job service
+    python cli.py submit travel destination=France       # run a job on the daemon
+    python cli.py submit interview-native --model gpt-4o-mini
+    python cli.py enqueue travel destination=France      # add a job to the durable queue
+    python cli.py work --drain                           # run queued jobs until none are left
+    python cli.py queue-status
+    python cli.py bulk --runs 1000                       # offline batch completions, phase by phase
+    python cli.py archive list --workflow travel         # archived runs (also: show <run_id>, stats)
+    python cli.py search 'hirevue phase:research'       # indexed search over archived outputs
+    python cli.py metrics --by phase,model               # p50/p95 phase seconds (also --measure tokens)
+    python cli.py budget Iceland --travelers 3 --preference luxury   # deterministic trip budget
+    python cli.py itinerary France --days 4 --dates "January 15-18, 2026"   # day-by-day route
+    python cli.py memo stats                             # travel task outputs shared across trips
+    python cli.py knowledge waterfalls --destination Iceland   # local data behind the travel tools
+    python cli.py inventory flights "New York" Iceland --dates "January 15-20, 2026"   # fares (also: hotels, near, generate)
+    python cli.py resolve "reykjavík" japn "Paris, France" LHR   # hub city and airports (also --complete)
+
+Options:
+    --timings   Print how long each lazily imported module took (to stderr)
+    --verbose   Show framework logging and per-phase progress
+
+Run options (interview, interview-simple, interview-native, travel, submit):
+    --deadline  Overall time budget for the run in seconds (default: RUN_DEADLINE)
+"""
+
+import io
+import sys
+import time
+import argparse
+import datetime
+import importlib
+import contextlib
+from pathlib import Path
+
+_START = time.perf_counter()
+
+PROJECT_ROOT = Path(__file__).parent
+IMPORT_TIMES = {}
+
+
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+
+def _import(module_name: str, directory: Path = None):
+    """Import a module on first use and record how long it took."""
+    if directory is not None and str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES[module_name] = time.perf_counter() - started
+    return module
+
+
+def _quiet(args):
+    """Swallow the workflows' progress output unless --verbose is given."""
+    if args.verbose:
+        return contextlib.nullcontext()
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _print_outputs(outputs) -> None:
+    for phase, text in outputs.items():
+        print(f"\n## {phase}\n")
+        print(text)
+
+
+# ============================================================================
+# SUBCOMMANDS
+# ============================================================================
+
+def cmd_validate(args) -> int:
+    """Validate the shared configuration"""
+    Config = _import("shared_config").Config
+    if not Config.validate():
+        return 1
+    if args.verbose:
+        Config.print_summary()
+    return 0
+
+
+def cmd_interview(args) -> int:
+    """Run the full AutoGen interview platform workflow"""
+    Config = _import("config", PROJECT_ROOT / "autogen").Config
+    if not Config.validate_setup():
+        return 1
+    run_context = _import("run_context").RunContext(args.deadline)
+    platform = _import("autogen_interview_platform")
+
+    with _quiet(args):
+        agents_manager = platform.build_interview_agents()
+        workflow = platform.InterviewPlatformWorkflow(agents_manager, run_context)
+        outputs = workflow.execute_workflow()
+        output_manager = platform.OutputManager(provider=agents_manager.provider)
+        output_file = output_manager.save_outputs(outputs)
+        summary_file = output_manager.create_summary(outputs)
+
+    _print_outputs(outputs)
+    print(f"\nFull outputs saved to: {output_file}")
+    print(f"Summary saved to: {summary_file}")
+    return 0 if not run_context.cancelled else 2
+
+
+def cmd_interview_simple(args) -> int:
+    """Run the simplified interview workflow on the OpenAI client"""
+    _import("config", PROJECT_ROOT / "autogen")
+    run_context = _import("run_context").RunContext(args.deadline)
+    demo = _import("autogen_simple_demo")
+
+    workflow = demo.SimpleInterviewPlatformWorkflow(run_context=run_context)
+    with _quiet(args):
+        outputs = workflow.run()
+
+    _print_outputs(outputs)
+    return 0 if not run_context.cancelled else 2
+
+
+def cmd_interview_native(args) -> int:
+    """Run the interview workflow specs on the framework-free native engine"""
+    Config = _import("config", PROJECT_ROOT / "autogen").Config
+    if not Config.validate_setup():
+        return 1
+    run_context = _import("run_context").RunContext(args.deadline)
+    engine_module = _import("native_engine")
+
+    with _quiet(args):
+        engine = engine_module.NativeWorkflowEngine(run_context=run_context)
+        outputs = engine.run()
+        output_manager = engine_module.OutputManager(workflow="interview-native", provider=engine.provider)
+        output_file = output_manager.save_outputs(outputs)
+
+    _print_outputs(outputs)
+    print(f"\nFull outputs saved to: {output_file}")
+    return 0 if not run_context.cancelled else 2
+
+
+def cmd_bulk(args) -> int:
+    """Run many interview workflows as offline batch completions"""
+    Config = _import("config", PROJECT_ROOT / "autogen").Config
+    if not Config.validate_setup():
+        return 1
+    batch_client = _import("batch_client")
+    bulk_engine = _import("bulk_engine")
+
+    run_ids = [f"run-{index + 1}" for index in range(args.runs)]
+    engine = bulk_engine.BulkWorkflowEngine(client=batch_client.create_batch_client(args.backend),
+                                            poll_interval=args.poll)
+    outputs = engine.run(run_ids)
+    output_file = engine.save(outputs, args.output)
+    print(f"\n{len(run_ids) - len(engine.errors)}/{len(run_ids)} run(s) completed")
+    print(f"Outputs saved to: {output_file}")
+    return 0 if not engine.errors else 2
+
+
+def cmd_archive(args) -> int:
+    """List, show or summarize archived runs"""
+    run_archive = _import("run_archive")
+    archive = run_archive.RunArchive(args.dir)
+    if args.action == "list":
+        runs = archive.runs(args.workflow, run_archive.parse_date(args.since), run_archive.parse_date(args.until),
+                            args.limit)
+        for run in runs:
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["created"]))
+            details = ", ".join(f"{key}={value}" for key, value in run["metadata"].items())
+            print(f"{run['run_id']}  {created}  {run['workflow']:<17} {details}")
+    elif args.action == "show":
+        run = archive.get_run(args.run_id) if args.run_id else None
+        if run is None:
+            print(f"❌ Unknown run: {args.run_id}", file=sys.stderr)
+            return 1
+        print(f"Run {run['run_id']} ({run['workflow']}, {time.ctime(run['created'])})")
+        _print_outputs(run["outputs"])
+    elif args.action == "rebuild":
+        print(f"Indexed {archive.rebuild_index()} run(s)")
+    else:
+        for name, value in archive.stats().items():
+            print(f"{name:>16}: {value}")
+    return 0
+
+
+def cmd_search(args) -> int:
+    """Search archived workflow outputs"""
+    search_index = _import("search_index")
+    index = search_index.create_search_index(args.backend, args.db)
+    if args.rebuild:
+        print(f"Indexed {index.rebuild_from_archive()} archived run(s)")
+    if args.import_files:
+        print(f"Indexed {search_index.import_output_files(args.import_files, index)} output file(s)")
+    if not args.query:
+        if not (args.rebuild or args.import_files):
+            print(index.stats())
+        return 0
+    try:
+        hits, elapsed = search_index.timed_search(" ".join(args.query), args.limit, index)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    for hit in hits:
+        created = time.strftime("%Y-%m-%d", time.localtime(hit["created"]))
+        where = " ".join(part for part in (hit["workflow"], hit["phase"], hit["destination"]) if part)
+        print(f"{hit['run_id']}  {created}  {where}")
+        print(f"    {hit['snippet']}")
+    print(f"\n{len(hits)} match(es) in {elapsed:.1f} ms ({index.backend})")
+    return 0
+
+
+def cmd_metrics(args) -> int:
+    """Aggregate recorded phase metrics"""
+    run_metrics = _import("run_metrics")
+    parse_date = _import("run_archive").parse_date
+    by = [name.strip() for name in args.by.split(",") if name.strip()]
+    percentiles = [float(q) for q in args.percentiles.split(",") if q.strip()]
+    started = time.perf_counter()
+    try:
+        frame = run_metrics.load_metrics(args.dir).filter(
+            parse_date(args.since), parse_date(args.until), workflow=args.workflow, phase=args.phase,
+            model=args.model, destination=args.destination, tenant=args.tenant)
+        groups = frame.group_by(by, args.measure, percentiles)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(run_metrics.format_report(groups[:args.limit], by, args.measure))
+    print(f"\n{len(frame)} phase record(s), {len(groups)} group(s) in {elapsed * 1000:.0f} ms ({args.measure})")
+    return 0
+
+
+def cmd_knowledge(args) -> int:
+    """Search the local travel knowledge store"""
+    travel_knowledge = _import("travel_knowledge", PROJECT_ROOT / "crewai")
+    knowledge = travel_knowledge.get_knowledge()
+    if not args.query and not args.destination:
+        print("Destinations: " + ", ".join(knowledge.destinations()))
+        return 0
+    started = time.perf_counter()
+    records = knowledge.search(" ".join(args.query), args.destination, [args.kind] if args.kind else None, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    for record in records:
+        if record["kind"] == "attraction":
+            print(f"- {record['destination']}: {travel_knowledge.format_attraction(record)}")
+        else:
+            print(f"- {record['destination']} [{record['kind']}] {record.get('name', '')}: {record.get('text', '')}")
+    print(f"\n{len(records)} record(s) in {elapsed:.1f} ms ({'fts5' if knowledge.fts5 else 'term match'})")
+    return 0
+
+
+def cmd_inventory(args) -> int:
+    """Query the fare and room-rate inventory, or generate synthetic datasets"""
+    travel_inventory = _import("travel_inventory", PROJECT_ROOT / "crewai")
+    inventory = travel_inventory.TravelInventory(args.fares, args.rates)
+    if args.action == "generate":
+        start = datetime.date.fromisoformat(args.start) if args.start else None
+        for rows, generate, path, what in ((args.fare_rows, travel_inventory.generate_fares, inventory.fares_file, "fares"),
+                                           (args.hotels_per_city, travel_inventory.generate_rates, inventory.rates_file, "rates")):
+            if rows:
+                started = time.perf_counter()
+                generate(str(path), rows, start, args.days, args.seed)
+                table = travel_inventory.ColumnTable.open(path, what)
+                print(f"✅ {len(table):,} {what} rows → {path} ({time.perf_counter() - started:.1f} s)")
+        return 0
+
+    if args.action == "near":
+        travel_geo = _import("travel_geo", PROJECT_ROOT / "crewai")
+        if len(args.places) != 1:
+            print("❌ inventory near needs DESTINATION", file=sys.stderr)
+            return 2
+        started = time.perf_counter()
+        table = travel_geo.hotels_near_attractions_table(args.places[0], args.dates, args.attractions, args.nights,
+                                                         args.min_rating, args.max_price, args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(table or f"No hotel or attraction data for {args.places[0]}")
+        print(f"\n{elapsed:.1f} ms")
+        return 0
+
+    if len(args.places) != (2 if args.action == "flights" else 1):
+        print(f"❌ inventory {args.action} needs {'ORIGIN DESTINATION' if args.action == 'flights' else 'CITY'}",
+              file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    if args.action == "flights":
+        table = inventory.flights_table(args.places[0], args.places[1], args.dates, args.max_stops,
+                                        args.max_price, args.limit)
+    else:
+        table = inventory.hotels_table(args.places[0], args.dates, args.nights, args.min_rating,
+                                       args.max_price, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(table or f"No {args.action} in the inventory for {' → '.join(args.places)} ({args.dates})")
+    print(f"\n{elapsed:.1f} ms")
+    return 0
+
+
+def cmd_budget(args) -> int:
+    """Calculate a trip budget for every tier from the local cost data"""
+    travel_budget = _import("travel_budget", PROJECT_ROOT / "crewai")
+    started = time.perf_counter()
+    budget = travel_budget.calculate_budget(args.destination, args.travelers, args.duration, args.dates,
+                                            args.preference, args.departure, args.fares, args.rates)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(travel_budget.format_budget(budget))
+    print(f"\n{elapsed:.1f} ms")
+    return 0
+
+
+def cmd_itinerary(args) -> int:
+    """Plan a day-by-day route over a destination's attractions"""
+    travel_routes = _import("travel_routes", PROJECT_ROOT / "crewai")
+    started = time.perf_counter()
+    table = travel_routes.itinerary_table(args.destination, args.days, args.dates, args.attractions, args.hotel)
+    elapsed = (time.perf_counter() - started) * 1000
+    print(table or f"No attraction coordinates for {args.destination}")
+    print(f"\n{elapsed:.1f} ms")
+    return 0
+
+
+def cmd_resolve(args) -> int:
+    """Resolve free-text destinations to a canonical place, hub city and airports"""
+    resolver = _import("destination_resolver", PROJECT_ROOT / "crewai").get_resolver()
+    for text in args.places:
+        if args.complete:
+            print(f"{text}: {', '.join(resolver.complete(text, args.limit)) or '-'}")
+            continue
+        started = time.perf_counter()
+        place = resolver.resolve(text)
+        elapsed = (time.perf_counter() - started) * 1e6
+        if place is None:
+            print(f"❓ {text}: no match ({elapsed:.0f} µs)")
+            continue
+        print(f"📍 {text} → {place['name']} ({place['kind']}, {place['match']}, {elapsed:.0f} µs)\n"
+              f"   hub city {place['city']}, {place['country']}; airports {', '.join(place['airports']) or '-'}")
+    return 0
+
+
+def cmd_memo(args) -> int:
+    """Show or clear memoized task outputs"""
+    memo = _import("task_memo").TaskMemo(args.db)
+    if args.action == "clear":
+        print(f"Deleted {memo.clear(args.older_than)} memoized task output(s)")
+        return 0
+    tasks = memo.stats()["tasks"]
+    if not tasks:
+        print("No memoized task outputs")
+    for label, stats in tasks.items():
+        print(f"{label:<16} {stats['entries']:>6} output(s)  reused {stats['reused']:>6}x  "
+              f"oldest {stats['oldest_seconds'] / 3600:.1f}h")
+    return 0
+
+
+def cmd_travel(args) -> int:
+    """Run the CrewAI travel planning crew"""
+    Config = _import("shared_config").Config
+    if not Config.validate():
+        return 1
+    run_context_module = _import("run_context")
+    run_context = run_context_module.RunContext(args.deadline)
+    demo = _import("crewai_demo", PROJECT_ROOT / "crewai")
+
+    trip = dict(destination=args.destination, trip_duration=args.duration,
+                trip_dates=args.dates, departure_city=args.departure,
+                travelers=args.travelers, budget_preference=args.budget)
+    crew = demo.create_travel_crew(args.destination, args.duration, args.dates, args.departure,
+                                   run_context, verbose=args.verbose, travelers=args.travelers,
+                                   budget_preference=args.budget)
+    try:
+        with _quiet(args):
+            result = run_context.run(crew.kickoff, inputs=demo.trip_inputs(**trip))
+    except run_context_module.RunCancelled as e:
+        print(f"⚠️  Crew stopped ({e})")
+        _print_outputs(run_context.partial_outputs)
+        return 2
+
+    output_path = demo.save_travel_plan(result, outputs=run_context.partial_outputs, **trip)
+    print(result)
+    print(f"\nOutput saved to: {output_path}")
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """Start the warm worker daemon"""
+    daemon = _import("worker_daemon")
+    daemon.serve(args.socket, args.warm or None)
+    return 0
+
+
+def cmd_service(args) -> int:
+    """Start the HTTP job service"""
+    service = _import("job_service")
+    service.serve(args.host, args.port, args.workers, args.warm or None)
+    return 0
+
+
+def cmd_submit(args) -> int:
+    """Submit a job to the worker daemon and stream its outputs"""
+    daemon = _import("worker_daemon")
+    params = dict(pair.split("=", 1) for pair in args.params)
+    if args.model:
+        params["provider"] = {"model": args.model}
+    exit_code = 1
+    for event in daemon.submit(args.kind, params, args.deadline, args.socket, args.tenant):
+        if event["event"] == "output":
+            print(f"\n## {event['name']}\n")
+            print(event["output"])
+        elif event["event"] == "done":
+            result = event["result"]
+            for path in result["files"]:
+                print(f"\nSaved: {path}")
+            print(f"\nJob {event['job_id']} finished in {result['elapsed']:.1f}s")
+            exit_code = 2 if result["cancelled"] else 0
+        elif event["event"] == "error":
+            print(f"❌ Job failed: {event['error']}", file=sys.stderr)
+    return exit_code
+
+
+def cmd_enqueue(args) -> int:
+    """Add jobs to the durable job queue"""
+    job_queue = _import("job_queue")
+    queue = job_queue.SQLiteJobQueue(args.db)
+    if args.file:
+        jobs = job_queue.load_jobs_file(args.file)
+    elif args.kind:
+        jobs = [{"kind": args.kind, "params": dict(pair.split("=", 1) for pair in args.params)}]
+    else:
+        print("❌ Give a job kind or --file", file=sys.stderr)
+        return 1
+    for job in jobs:
+        if args.tenant:
+            job.setdefault("params", {})["tenant"] = args.tenant
+        job_id = queue.enqueue(job["kind"], job.get("params"), args.attempts)
+        print(f"Queued {job['kind']} job {job_id}")
+    return 0
+
+
+def cmd_work(args) -> int:
+    """Run jobs from the durable job queue"""
+    job_queue = _import("job_queue")
+    worker = job_queue.QueueWorker(job_queue.SQLiteJobQueue(args.db), lease_seconds=args.lease)
+    print(f"Worker {worker.worker_id} polling {worker.queue.path}")
+    try:
+        count = worker.run(drain=args.drain, max_jobs=args.max_jobs)
+    except KeyboardInterrupt:
+        count = worker.jobs_run
+    print(f"Ran {count} job(s)")
+    return 0
+
+
+def cmd_queue_status(args) -> int:
+    """Show backlog depth and throughput of the durable job queue"""
+    job_queue = _import("job_queue")
+    stats = job_queue.SQLiteJobQueue(args.db).stats(args.window * 3600)
+    for name, value in stats.items():
+        print(f"{name:>22}: {'-' if value is None else value}")
+    return 0
+
+
+# ============================================================================
+# ENTRY POINT
+# ============================================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Multi-agent lab workflows")
+    parser.add_argument("--timings", action="store_true", help="print lazy import and total times")
+    parser.add_argument("--verbose", action="store_true", help="show framework logging and progress")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser("validate", help="validate the configuration")
+    validate.set_defaults(handler=cmd_validate)
+
+    for name, handler, help_text in (
+        ("interview", cmd_interview, "run the AutoGen interview platform workflow"),
+        ("interview-simple", cmd_interview_simple, "run the simplified interview workflow"),
+        ("interview-native", cmd_interview_native, "run the interview specs without pyautogen"),
+    ):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("--deadline", type=float, default=None, help="run time budget in seconds")
+        command.set_defaults(handler=handler)
+
+    bulk = subparsers.add_parser("bulk", help="run many interview workflows as offline batches")
+    bulk.add_argument("--runs", type=int, default=1, help="number of workflow runs")
+    bulk.add_argument("--backend", default=None, choices=["openai", "local"], help="batch backend (default: BULK_BACKEND)")
+    bulk.add_argument("--poll", type=float, default=None, help="seconds between status checks (default: BULK_POLL_INTERVAL)")
+    bulk.add_argument("--output", default=None, help="results file (default: BULK_DIR/bulk_outputs_<time>.jsonl)")
+    bulk.set_defaults(handler=cmd_bulk)
+
+    archive = subparsers.add_parser("archive", help="list, show or summarize archived runs")
+    archive.add_argument("action", choices=["list", "show", "stats", "rebuild"])
+    archive.add_argument("run_id", nargs="?", help="run to show")
+    archive.add_argument("--workflow", default=None, help="only runs of this workflow")
+    archive.add_argument("--since", default=None, help="only runs on or after this date (YYYY-MM-DD)")
+    archive.add_argument("--until", default=None, help="only runs before this date (YYYY-MM-DD)")
+    archive.add_argument("--limit", type=int, default=50, help="runs to list")
+    archive.add_argument("--dir", default=None, help="archive directory (default: ARCHIVE_DIR)")
+    archive.set_defaults(handler=cmd_archive)
+
+    search = subparsers.add_parser("search", help="search archived workflow outputs")
+    search.add_argument("query", nargs="*", help='words, "phrases" and filters such as phase:blueprint amount<5000')
+    search.add_argument("--limit", type=int, default=20, help="matches to show")
+    search.add_argument("--rebuild", action="store_true", help="re-index every run in the archive")
+    search.add_argument("--import", dest="import_files", nargs="+", metavar="FILE",
+                        help="index old workflow_outputs_*.txt / crewai_output*.txt files")
+    search.add_argument("--backend", default=None, choices=["auto", "fts5", "inverted"],
+                        help="index backend (default: SEARCH_BACKEND)")
+    search.add_argument("--db", default=None, help="index database (default: SEARCH_DB)")
+    search.set_defaults(handler=cmd_search)
+
+    metrics = subparsers.add_parser("metrics", help="p50/p95 phase time and tokens by phase, model, hour, ...")
+    metrics.add_argument("--by", default="phase",
+                         help="comma-separated: workflow, phase, model, destination, tenant, hour, day")
+    metrics.add_argument("--measure", default="seconds", choices=["seconds", "tokens", "calls"])
+    metrics.add_argument("--percentiles", default="50,95", help="comma-separated percentiles to show")
+    for dimension in ("workflow", "phase", "model", "destination", "tenant"):
+        metrics.add_argument(f"--{dimension}", default=None, help=f"only records with this {dimension}")
+    metrics.add_argument("--since", default=None, help="YYYY-MM-DD")
+    metrics.add_argument("--until", default=None, help="YYYY-MM-DD")
+    metrics.add_argument("--limit", type=int, default=50, help="groups to show (largest first)")
+    metrics.add_argument("--dir", default=None, help="metrics directory (default: METRICS_DIR)")
+    metrics.set_defaults(handler=cmd_metrics)
+
+    knowledge = subparsers.add_parser("knowledge", help="search the local travel knowledge store")
+    knowledge.add_argument("query", nargs="*", help="free text, e.g. waterfalls hiking")
+    knowledge.add_argument("--destination", default=None, help="only this destination or city")
+    knowledge.add_argument("--kind", default=None, choices=["attraction", "cost", "tip"])
+    knowledge.add_argument("--limit", type=int, default=10)
+    knowledge.set_defaults(handler=cmd_knowledge)
+
+    inventory = subparsers.add_parser("inventory", help="query flight fares and hotel rates, or generate test data")
+    inventory.add_argument("action", choices=["flights", "hotels", "near", "generate"])
+    inventory.add_argument("places", nargs="*", help="ORIGIN DESTINATION for flights, CITY for hotels and near")
+    inventory.add_argument("--attractions", default="", help='near: stops, e.g. "Harpa, Hallgrímskirkja; Sky Lagoon"')
+    inventory.add_argument("--dates", default="January 15-20, 2026", help="trip dates or check-in date")
+    inventory.add_argument("--max-stops", type=int, default=None)
+    inventory.add_argument("--max-price", type=float, default=None, help="fare, or average nightly rate (USD)")
+    inventory.add_argument("--min-rating", type=float, default=None)
+    inventory.add_argument("--nights", type=int, default=0, help="default: from --dates")
+    inventory.add_argument("--limit", type=int, default=5)
+    inventory.add_argument("--fares", default=None, help="fare dataset (default: INVENTORY_FARES)")
+    inventory.add_argument("--rates", default=None, help="rate dataset (default: INVENTORY_RATES)")
+    inventory.add_argument("--fare-rows", type=int, default=1_000_000, help="generate: fare rows (0 skips)")
+    inventory.add_argument("--hotels-per-city", type=int, default=460, help="generate: hotels per city (0 skips)")
+    inventory.add_argument("--start", default=None, help="generate: first date, YYYY-MM-DD (default: January 1)")
+    inventory.add_argument("--days", type=int, default=365, help="generate: days of data")
+    inventory.add_argument("--seed", type=int, default=0)
+    inventory.set_defaults(handler=cmd_inventory)
+
+    budget = subparsers.add_parser("budget", help="calculate a trip budget per tier and category")
+    budget.add_argument("destination")
+    budget.add_argument("--travelers", type=int, default=2)
+    budget.add_argument("--duration", default="5 days")
+    budget.add_argument("--dates", default="January 15-20, 2026")
+    budget.add_argument("--departure", default="New York")
+    budget.add_argument("--preference", default="mid-range", choices=["budget", "mid-range", "luxury"])
+    budget.add_argument("--fares", default="", help='round-trip fares per person, "budget, mid-range, luxury" or one')
+    budget.add_argument("--rates", default="", help="nightly room rates, same format")
+    budget.set_defaults(handler=cmd_budget)
+
+    itinerary = subparsers.add_parser("itinerary", help="split attractions into days and order each day")
+    itinerary.add_argument("destination")
+    itinerary.add_argument("--days", type=int, default=5)
+    itinerary.add_argument("--dates", default="", help="trip dates, for closing days")
+    itinerary.add_argument("--attractions", default="", help="comma-separated names (default: all)")
+    itinerary.add_argument("--hotel", default="", help="hotel name from the rate inventory")
+    itinerary.set_defaults(handler=cmd_itinerary)
+
+    resolve = subparsers.add_parser("resolve", help="resolve destinations to a hub city and airport codes")
+    resolve.add_argument("places", nargs="+", help='e.g. "reykjavík" japn "Paris, France" LHR')
+    resolve.add_argument("--complete", action="store_true", help="list names starting with each text instead")
+    resolve.add_argument("--limit", type=int, default=8, help="complete: names per prefix")
+    resolve.set_defaults(handler=cmd_resolve)
+
+    memo = subparsers.add_parser("memo", help="show or clear memoized travel task outputs")
+    memo.add_argument("action", choices=["stats", "clear"])
+    memo.add_argument("--older-than", type=float, default=None, help="clear: only outputs older than N seconds")
+    memo.add_argument("--db", default=None, help="memo database (default: TASK_MEMO_DB)")
+    memo.set_defaults(handler=cmd_memo)
+
+    travel = subparsers.add_parser("travel", help="run the CrewAI travel planning crew")
+    travel.add_argument("--destination", default="Iceland")
+    travel.add_argument("--duration", default="5 days")
+    travel.add_argument("--dates", default="January 15-20, 2026")
+    travel.add_argument("--departure", default="New York")
+    travel.add_argument("--travelers", type=int, default=2)
+    travel.add_argument("--budget", default="mid-range", choices=["budget", "mid-range", "luxury"])
+    travel.add_argument("--deadline", type=float, default=None, help="run time budget in seconds")
+    travel.set_defaults(handler=cmd_travel)
+
+    serve = subparsers.add_parser("serve", help="start the warm worker daemon")
+    serve.add_argument("--socket", default=None, help="Unix socket path (default: WORKER_SOCKET)")
+    serve.add_argument("--warm", action="append", choices=["interview", "interview-simple", "interview-native", "travel"],
+                       help="job kind to warm up (repeatable, default: all)")
+    serve.set_defaults(handler=cmd_serve)
+
+    service = subparsers.add_parser("service", help="start the HTTP job service")
+    service.add_argument("--host", default=None, help="interface to bind (default: SERVICE_HOST)")
+    service.add_argument("--port", type=int, default=None, help="port (default: SERVICE_PORT)")
+    service.add_argument("--workers", type=int, default=None, help="jobs run at once (default: SERVICE_WORKERS)")
+    service.add_argument("--warm", action="append", choices=["interview", "interview-simple", "interview-native", "travel"],
+                         help="job kind to warm up (repeatable, default: all)")
+    service.set_defaults(handler=cmd_service)
+
+    submit = subparsers.add_parser("submit", help="run a job on the worker daemon")
+    submit.add_argument("kind", choices=["interview", "interview-simple", "interview-native", "travel"])
+    submit.add_argument("params", nargs="*", metavar="KEY=VALUE", help="job parameters")
+    submit.add_argument("--deadline", type=float, default=None, help="run time budget in seconds")
+    submit.add_argument("--socket", default=None, help="Unix socket path (default: WORKER_SOCKET)")
+    submit.add_argument("--model", default=None, help="model for this job only (default: OPENAI_MODEL)")
+    submit.add_argument("--tenant", default=None, help="team charged for the job's LLM calls (default: DEFAULT_TENANT)")
+    submit.set_defaults(handler=cmd_submit)
+
+    enqueue = subparsers.add_parser("enqueue", help="add jobs to the durable job queue")
+    enqueue.add_argument("kind", nargs="?", choices=["interview", "interview-simple", "interview-native", "travel"])
+    enqueue.add_argument("params", nargs="*", metavar="KEY=VALUE", help="job parameters")
+    enqueue.add_argument("--file", default=None, help="JSON-lines file of {\"kind\", \"params\"} jobs")
+    enqueue.add_argument("--attempts", type=int, default=None, help="attempts per job (default: QUEUE_MAX_ATTEMPTS)")
+    enqueue.add_argument("--tenant", default=None, help="team charged for the jobs' LLM calls (default: DEFAULT_TENANT)")
+    enqueue.add_argument("--db", default=None, help="queue database (default: QUEUE_DB)")
+    enqueue.set_defaults(handler=cmd_enqueue)
+
+    work = subparsers.add_parser("work", help="run jobs from the durable job queue")
+    work.add_argument("--drain", action="store_true", help="exit when the queue is empty")
+    work.add_argument("--max-jobs", type=int, default=None, help="exit after this many jobs")
+    work.add_argument("--lease", type=float, default=None, help="lease seconds (default: QUEUE_LEASE_SECONDS)")
+    work.add_argument("--db", default=None, help="queue database (default: QUEUE_DB)")
+    work.set_defaults(handler=cmd_work)
+
+    queue_status = subparsers.add_parser("queue-status", help="show durable job queue backlog and throughput")
+    queue_status.add_argument("--window", type=float, default=1.0, help="throughput window in hours")
+    queue_status.add_argument("--db", default=None, help="queue database (default: QUEUE_DB)")
+    queue_status.set_defaults(handler=cmd_queue_status)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    finally:
+        if args.timings:
+            for module_name, seconds in IMPORT_TIMES.items():
+                print(f"import {module_name}: {seconds * 1000:.1f} ms", file=sys.stderr)
+            print(f"total: {(time.perf_counter() - _START) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,32 +21,54 @@ Configuration:
 - Environment variables set in /Users/pranavhharish/Desktop/IS-492/multi-agent/.env
 """
 
-import os
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
-from crewai import Agent, Task, Crew
+from collections import Counter
+from typing import Any, Tuple
+from crewai import Agent, Task, Crew, LLM
 from crewai.tools import tool
-import requests
+from crewai.tasks.task_output import TaskOutput
 
 # Add parent directory to path to import shared_config
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import shared configuration
-from shared_config import Config, validate_config
+from shared_config import Config, ProviderConfig, validate_config
+from run_context import RunContext, RunCancelled
+from agent_pool import AgentPool
+from prompt_compiler import PROMPT_COMPILER
+from model_cascade import MODEL_CASCADE, validate_output
+from llm_scheduler import LLM_SCHEDULER, estimate_tokens
+from run_archive import get_archive, archive_reference
+from task_memo import get_task_memo
+from travel_knowledge import get_knowledge
+from destination_resolver import get_resolver
+from travel_inventory import get_inventory
+from travel_geo import hotels_near_attractions_table
+from travel_budget import calculate_budget, format_budget
+from travel_routes import itinerary_table
 
 
 # ============================================================================
 # TOOLS (Real API implementations using web search)
 # ============================================================================
+# Attraction and cost tools answer from the local knowledge store
+# (travel_knowledge.py) when it has data for the destination.
 
 @tool
-def search_flight_prices(destination: str, departure_city: str = "New York") -> str:
+def search_flight_prices(destination: str, departure_city: str = "New York", trip_dates: str = "",
+                         max_stops: int = -1) -> str:
     """
     Search for real flight prices and options to a destination.
-    Uses web search to find current flight information from major booking sites.
+    With trip dates (e.g. "January 15-20, 2026") returns the cheapest outbound
+    and return fares from the fare inventory; max_stops limits connections.
     """
+    table = get_inventory().flights_table(departure_city, destination, trip_dates,
+                                          max_stops if max_stops >= 0 else None)
+    if table:
+        return table
+
     search_query = f"flights from {departure_city} to {destination} prices 2026 best options"
 
     # In production, this would use a real flight API (Skyscanner, Kayak, etc.)
@@ -66,11 +88,16 @@ def search_flight_prices(destination: str, departure_city: str = "New York") ->
 
 
 @tool
-def search_hotel_options(location: str, check_in_date: str) -> str:
+def search_hotel_options(location: str, check_in_date: str, nights: int = 0, min_rating: float = 0) -> str:
     """
     Search for real hotel options using web search.
-    Provides current hotel availability and pricing information.
+    With a stay (e.g. "January 15-20, 2026", or a check-in date plus nights)
+    returns hotels available every night, cheapest first, from the rate inventory.
     """
+    table = get_inventory().hotels_table(location, check_in_date, nights, min_rating or None)
+    if table:
+        return table
+
     search_query = f"hotels in {location} {check_in_date} reviews ratings prices 2026"
 
     return f"""
@@ -89,12 +116,31 @@ def search_hotel_options(location: str, check_in_date: str) -> str:
 
 
 @tool
-def search_attractions_activities(destination: str) -> str:
+def rank_hotels_near_attractions(destination: str, check_in_date: str = "", attractions: str = "") -> str:
+    """
+    Rank hotels by distance to the attractions the trip visits.
+    attractions lists stops by day, e.g. "Harpa, Hallgrímskirkja; Sky Lagoon"
+    (empty: all of the destination's attractions). With a stay in check_in_date
+    (e.g. "January 15-20, 2026") only hotels available every night are listed.
+    """
+    table = hotels_near_attractions_table(destination, check_in_date, attractions)
+    if table:
+        return table
+    return (f"No hotel location data for {destination}. Prefer hotels within walking distance "
+            f"of the main sights or next to the central public transport hub.")
+
+
+@tool
+def search_attractions_activities(destination: str, interests: str = "") -> str:
     """
     Search for real attractions and activities in a destination.
-    Provides comprehensive information about popular sites and experiences.
+    Returns ranked attractions with opening hours, entry fees and visit times,
+    optionally matched to interests (e.g. "waterfalls hiking").
     """
-    search_query = f"{destination} attractions activities tours things to do 2026"
+    if Config.TRAVEL_KNOWLEDGE:
+        snippet = get_knowledge().attractions_snippet(destination, interests)
+        if snippet:
+            return snippet
 
     return f"""
     Research task: Find attractions and activities in {destination}.
@@ -113,13 +159,33 @@ def search_attractions_activities(destination: str) -> str:
     """
 
 
+@tool
+def plan_itinerary_routes(destination: str, days: int, trip_dates: str = "", attractions: str = "",
+                          hotel: str = "") -> str:
+    """
+    Plan the day-by-day route: splits the attractions into days and orders each
+    day around opening hours with travel times. attractions is a comma-separated
+    list (empty: all of the destination's attractions); hotel is where each day
+    starts and ends. Returns the schedule with start/end times per stop.
+    """
+    table = itinerary_table(destination, days, trip_dates, attractions, hotel)
+    if table:
+        return table
+    return (f"No attraction coordinates for {destination}. Group nearby sights on the same day "
+            f"and check opening hours and closing days.")
+
+
 @tool
 def search_travel_costs(destination: str) -> str:
     """
     Search for real travel costs and budgeting information.
-    Provides current pricing for meals, activities, and transportation.
+    Returns daily cost baselines per budget tier for meals, transport,
+    activities and lodging, plus entry fees and money-saving tips.
     """
-    search_query = f"{destination} travel costs budget prices meals transport 2025"
+    if Config.TRAVEL_KNOWLEDGE:
+        snippet = get_knowledge().costs_snippet(destination)
+        if snippet:
+            return snippet
 
     return f"""
     Research task: Find cost information for a trip to {destination}.
@@ -138,85 +204,306 @@ def search_travel_costs(destination: str) -> str:
     """
 
 
+@tool
+def calculate_trip_budget(destination: str, travelers: int, trip_duration: str, trip_dates: str = "",
+                          budget_preference: str = "mid-range", departure_city: str = "",
+                          flight_fares: str = "", nightly_rates: str = "") -> str:
+    """
+    Calculate the trip budget: totals per category (flights, lodging, meals,
+    local transport, activities, misc) for the budget, mid-range and luxury tiers.
+    flight_fares (round trip per person) and nightly_rates (per room) are the
+    recommended options, as "budget, mid-range, luxury" amounts or one amount
+    for the preferred tier; missing ones come from the fare and rate inventory.
+    """
+    return format_budget(calculate_budget(destination, travelers, trip_duration, trip_dates, budget_preference,
+                                          departure_city, flight_fares, nightly_rates))
+
+
+# ============================================================================
+# MODEL ROUTING (cheap-first cascade, see model_cascade.py)
+# ============================================================================
+
+# Model tier and output validator per agent. "cascade" agents run on the small
+# model and are escalated to the large model when their task output fails the
+# validator; "large" agents always use the large model.
+TRAVEL_AGENT_MODELS = {
+    "FlightAgent": {
+        "model_tier": "cascade",
+        "validator": {"min_words": 150, "required_sections": ["airline", "price"], "min_items": 2},
+    },
+    "HotelAgent": {
+        "model_tier": "cascade",
+        "validator": {"min_words": 150, "required_sections": ["hotel", "rating", "night"], "min_items": 3},
+    },
+    "ItineraryAgent": {
+        "model_tier": "cascade",
+        "validator": {"min_words": 300, "required_sections": ["day 1", "day 2"]},
+    },
+    "BudgetAgent": {
+        "model_tier": "large",
+        "validator": {"min_words": 200, "required_sections": ["total", "flight", "accommodation"]},
+    },
+}
+
+
+class ScheduledLLM(LLM):
+    """
+    CrewAI LLM whose calls wait for the run's fair share of the shared LLM capacity.
+
+    bind_run_context sets run_context, so calls are charged to the run's tenant and priority.
+    """
+
+    run_context = None
+
+    def call(self, messages, *args, **kwargs):
+        with LLM_SCHEDULER.slot(self.run_context, estimate_tokens(messages, self.max_tokens)) as ticket:
+            response = super().call(messages, *args, **kwargs)
+            ticket.tokens = estimate_tokens(messages) + estimate_tokens(response)
+            ticket.model = self.model.split("/", 1)[-1]
+        return response
+
+
+def create_agent_llm(tier: str, provider: ProviderConfig = None) -> LLM:
+    """
+    CrewAI LLM for a model tier ("small" or "large") on the run's primary endpoint.
+
+    The provider settings are passed to the LLM explicitly, so nothing is read
+    from or written to os.environ and concurrent crews can use different providers.
+    """
+    endpoint = (provider or ProviderConfig.from_env()).get_endpoints()[0]
+    model = endpoint["small_model"] if tier == "small" and endpoint["small_model"] else endpoint["model"]
+    return ScheduledLLM(model=f"openai/{model}", base_url=endpoint["api_base"], api_key=endpoint["api_key"])
+
+
+def agent_llm(agent_name: str, provider: ProviderConfig = None) -> LLM:
+    """Starting LLM for an agent: the small model if it cascades, else the large model."""
+    tiers = MODEL_CASCADE.tiers(TRAVEL_AGENT_MODELS[agent_name]["model_tier"], provider)
+    return create_agent_llm(tiers[0], provider)
+
+
+class CascadeGuardrail:
+    """
+    Task guardrail that escalates a small-model agent to the large model.
+
+    Output that passes the agent's validator is accepted. Otherwise the agent's
+    LLM is swapped for the large model and the guardrail fails, so CrewAI
+    re-runs the task (once) on the large model with the validation feedback.
+    """
+
+    def __init__(self, agent: Agent, agent_name: str, provider: ProviderConfig = None):
+        self.agent = agent
+        self.agent_name = agent_name
+        self.provider = provider
+        self.rules = TRAVEL_AGENT_MODELS[agent_name]["validator"]
+        self.escalated = False
+
+    def __call__(self, output) -> Tuple[bool, Any]:
+        problems = validate_output(output.raw, self.rules)
+        if not problems or self.escalated:
+            MODEL_CASCADE.record(self.agent_name, "large" if self.escalated else "small", escalated=self.escalated)
+            return True, output
+
+        self.escalated = True
+        run_context = self.agent.llm.run_context
+        self.agent.llm = create_agent_llm("large", self.provider)
+        self.agent.llm.run_context = run_context
+        if Config.VERBOSE:
+            print(f"   ↑ {self.agent_name}: small model output failed validation ({'; '.join(problems)}), escalating")
+        return False, f"The answer was incomplete ({'; '.join(problems)}). Please provide a complete answer."
+
+    def reset(self) -> None:
+        """Put the agent back on the small model for the next run."""
+        if self.escalated:
+            self.agent.llm = create_agent_llm("small", self.provider)
+        self.escalated = False
+
+
+def cascade_guardrail(agent: Agent, agent_name: str, provider: ProviderConfig = None):
+    """Guardrail for a task, or None when its agent does not start on the small model."""
+    if MODEL_CASCADE.tiers(TRAVEL_AGENT_MODELS[agent_name]["model_tier"], provider)[0] != "small":
+        return None
+    return CascadeGuardrail(agent, agent_name, provider)
+
+
+# ============================================================================
+# TASK MEMOIZATION (cross-trip result sharing, see task_memo.py)
+# ============================================================================
+
+# Task outputs are keyed on the task's filled-in prompt texts and model, so a
+# task only depends on the trip inputs it mentions: flights on departure city,
+# destination and dates; hotels and the itinerary on destination and dates.
+# "with_context" also keys on the earlier tasks' outputs, for tasks that build
+# on them. "ttl" (seconds) overrides TASK_MEMO_TTL.
+TRAVEL_TASK_MEMO = {
+    "FlightAgent": {"with_context": False, "ttl": 6 * 3600},  # Fares change within the day
+    "HotelAgent": {"with_context": False},
+    "ItineraryAgent": {"with_context": False},
+    "BudgetAgent": {"with_context": True},
+}
+
+
+class MemoizedTask(Task):
+    """
+    Task whose output is shared with later trips that give it the same inputs.
+
+    With TASK_MEMO, a stored output fresh enough for memo_name's ttl is
+    returned without running the agent; otherwise the task runs and its
+    output is stored for the next trip.
+    """
+
+    memo_name: str = ""
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        agent = agent or self.agent
+        policy = TRAVEL_TASK_MEMO.get(self.memo_name)
+        if not Config.TASK_MEMO or policy is None:
+            return super().execute_sync(agent, context, tools)
+
+        memo = get_task_memo()
+        key = memo.key(self.memo_name, agent.role, agent.goal, agent.backstory, self.description,
+                       self.expected_output, agent.llm.model, context if policy["with_context"] else None)
+        cached = memo.claim(key, policy.get("ttl"), getattr(agent.llm, "run_context", None))
+        if cached is not None:
+            if Config.VERBOSE:
+                print(f"   ♻️  {self.memo_name}: reusing the output of an earlier trip with the same inputs")
+            self.output = TaskOutput(description=self.description, expected_output=self.expected_output,
+                                     raw=cached, agent=agent.role)
+            if self.callback:
+                self.callback(self.output)
+            crew = getattr(agent, "crew", None)
+            if crew is not None and crew.task_callback and crew.task_callback != self.callback:
+                crew.task_callback(self.output)
+            return self.output
+
+        try:
+            output = super().execute_sync(agent, context, tools)
+        except BaseException:
+            memo.release(key)
+            raise
+        memo.put(key, output.raw, label=self.memo_name)
+        return output
+
+
 # ============================================================================
 # AGENT DEFINITIONS
 # ============================================================================
 
-def create_flight_agent(destination: str, trip_dates: str):
+def compile_agent_text(name: str, text: str) -> str:
+    """Normalize a goal/backstory and put its static sentences ahead of per-trip ones."""
+    return PROMPT_COMPILER.compile(name, text, unit="sentence")
+
+
+def resolve_hotel_location(destination: str) -> str:
+    """Main city for hotels: the gazetteer's hub city, else where most of the destination's attractions are."""
+    hub_city = get_resolver().hub_city(destination)
+    if hub_city:
+        return hub_city
+    if Config.TRAVEL_KNOWLEDGE:
+        cities = Counter(record["city"] for record in get_knowledge().records(destination, "attraction")
+                         if record.get("city"))
+        if cities:
+            return cities.most_common(1)[0][0]
+    return destination
+
+
+def create_flight_agent(destination: str, trip_dates: str, provider: ProviderConfig = None):
     """Create the Flight Specialist agent with real research tools."""
     return Agent(
         role="Flight Specialist",
-        goal=f"Research and recommend the best flight options for the {destination} trip "
-             f"({trip_dates}), considering dates, airlines, prices, and flight durations. "
-             f"Use real data from flight booking sites to provide accurate, current pricing.",
-        backstory="You are an experienced flight specialist with deep knowledge of "
-                  "airline schedules, pricing patterns, and travel routes. You excel at "
-                  "finding the best flight options that balance cost and convenience. "
-                  "You have booked thousands of flights and know the best times to fly. "
-                  "You always research current prices and use real booking site data.",
+        goal=compile_agent_text(
+            "FlightAgent.goal",
+            f"Research and recommend the best flight options for the {destination} trip "
+            f"({trip_dates}), considering dates, airlines, prices, and flight durations. "
+            f"Use real data from flight booking sites to provide accurate, current pricing."
+        ),
+        backstory=compile_agent_text(
+            "FlightAgent.backstory",
+            "You are an experienced flight specialist with deep knowledge of "
+            "airline schedules, pricing patterns, and travel routes. You excel at "
+            "finding the best flight options that balance cost and convenience. "
+            "You have booked thousands of flights and know the best times to fly. "
+            "You always research current prices and use real booking site data."
+        ),
         tools=[search_flight_prices],
+        llm=agent_llm("FlightAgent", provider),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_hotel_agent(destination: str, trip_dates: str):
+def create_hotel_agent(destination: str, trip_dates: str, hotel_location: str = None, provider: ProviderConfig = None):
     """Create the Accommodation Specialist agent with real research tools."""
-    # Determine main city for hotels (if destination is just a country, use capital)
-    hotel_location = destination
-    if destination.lower() == "iceland":
-        hotel_location = "Reykjavik"
-    elif destination.lower() == "france":
-        hotel_location = "Paris"
-    elif destination.lower() == "japan":
-        hotel_location = "Tokyo"
+    # Determine main city for hotels
+    if hotel_location is None:
+        hotel_location = resolve_hotel_location(destination)
 
     return Agent(
         role="Accommodation Specialist",
-        goal=f"Suggest top-rated hotels in {hotel_location} for the {destination} trip "
-             f"({trip_dates}), considering amenities, location, and value for money. "
-             f"Use real hotel data from booking sites with current prices and reviews.",
-        backstory="You are a seasoned accommodation expert with extensive knowledge of "
-                  "hotels worldwide. You understand traveler needs and can match them with "
-                  "perfect accommodations. You read reviews meticulously and know which "
-                  "hotels offer the best experience for different budgets. You always "
-                  "check current availability and actual guest reviews.",
-        tools=[search_hotel_options],
+        goal=compile_agent_text(
+            "HotelAgent.goal",
+            f"Suggest top-rated hotels in {hotel_location} for the {destination} trip "
+            f"({trip_dates}), considering amenities, location, and value for money. "
+            f"Use real hotel data from booking sites with current prices and reviews."
+        ),
+        backstory=compile_agent_text(
+            "HotelAgent.backstory",
+            "You are a seasoned accommodation expert with extensive knowledge of "
+            "hotels worldwide. You understand traveler needs and can match them with "
+            "perfect accommodations. You read reviews meticulously and know which "
+            "hotels offer the best experience for different budgets. You always "
+            "check current availability and actual guest reviews."
+        ),
+        tools=[search_hotel_options, rank_hotels_near_attractions],
+        llm=agent_llm("HotelAgent", provider),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_itinerary_agent(destination: str, trip_duration: str):
+def create_itinerary_agent(destination: str, trip_duration: str, provider: ProviderConfig = None):
     """Create the Travel Planner agent with real research tools."""
     return Agent(
         role="Travel Planner",
-        goal=f"Create a detailed day-by-day travel plan with activities and attractions "
-             f"that maximize the {destination} experience in {trip_duration}. "
-             f"Use real current information about attractions, opening hours, and accessibility.",
-        backstory=f"You are a creative travel planner with a passion for {destination}. "
-                  f"You have extensive knowledge of {destination}'s attractions, culture, and hidden gems. "
-                  f"You create itineraries that are well-paced, exciting, and memorable. "
-                  f"You consider travel times, weather, and traveler preferences to craft the perfect journey. "
-                  f"You always verify current information about attractions and tours.",
-        tools=[search_attractions_activities],
+        goal=compile_agent_text(
+            "ItineraryAgent.goal",
+            f"Create a detailed day-by-day travel plan with activities and attractions "
+            f"that maximize the {destination} experience in {trip_duration}. "
+            f"Use real current information about attractions, opening hours, and accessibility."
+        ),
+        backstory=compile_agent_text(
+            "ItineraryAgent.backstory",
+            f"You are a creative travel planner with a passion for {destination}. "
+            f"You have extensive knowledge of {destination}'s attractions, culture, and hidden gems. "
+            f"You create itineraries that are well-paced, exciting, and memorable. "
+            f"You consider travel times, weather, and traveler preferences to craft the perfect journey. "
+            f"You always verify current information about attractions and tours."
+        ),
+        tools=[search_attractions_activities, plan_itinerary_routes],
+        llm=agent_llm("ItineraryAgent", provider),
         verbose=True,
         allow_delegation=False
     )
 
 
-def create_budget_agent(destination: str):
+def create_budget_agent(destination: str, provider: ProviderConfig = None):
     """Create the Financial Advisor agent with real cost research tools."""
     return Agent(
         role="Financial Advisor",
-        goal=f"Calculate total trip costs for {destination} and identify cost-saving opportunities "
-             f"while maintaining quality. Use real current pricing data for all expenses.",
-        backstory="You are a meticulous financial advisor specializing in travel budgeting. "
-                  "You can analyze costs across flights, accommodations, activities, and meals. "
-                  "You identify hidden costs and suggest smart ways to save money without "
-                  "compromising the travel experience. You research actual current prices "
-                  "and provide realistic budget estimates.",
-        tools=[search_travel_costs],
+        goal=compile_agent_text(
+            "BudgetAgent.goal",
+            f"Calculate total trip costs for {destination} and identify cost-saving opportunities "
+            f"while maintaining quality. Use real current pricing data for all expenses."
+        ),
+        backstory=compile_agent_text(
+            "BudgetAgent.backstory",
+            "You are a meticulous financial advisor specializing in travel budgeting. "
+            "You can analyze costs across flights, accommodations, activities, and meals. "
+            "You identify hidden costs and suggest smart ways to save money without "
+            "compromising the travel experience. You research actual current prices "
+            "and provide realistic budget estimates."
+        ),
+        tools=[calculate_trip_budget, search_travel_costs],
+        llm=agent_llm("BudgetAgent", provider),
         verbose=True,
         allow_delegation=False
     )
@@ -226,9 +513,11 @@ def create_budget_agent(destination: str):
 # TASK DEFINITIONS
 # ============================================================================
 
-def create_flight_task(flight_agent, destination: str, trip_dates: str, departure_city: str):
+def create_flight_task(flight_agent, destination: str, trip_dates: str, departure_city: str,
+                       provider: ProviderConfig = None):
     """Define the flight research task using real data."""
-    return Task(
+    return MemoizedTask(
+        memo_name="FlightAgent",
         description=f"Research and compile a list of REAL flight options from {departure_city} to {destination} "
                    f"for the trip ({trip_dates}). "
                    f"Use actual current flight data from booking sites like Skyscanner, Kayak, "
@@ -238,65 +527,72 @@ def create_flight_task(flight_agent, destination: str, trip_dates: str, departur
                    f"recommendations on which flight offers the best value considering both "
                    f"price and convenience.",
         agent=flight_agent,
+        guardrail=cascade_guardrail(flight_agent, "FlightAgent", provider),
         expected_output=f"A detailed report with 2-3 REAL flight options from {departure_city} to {destination} "
                        f"including airlines, times, duration, current prices, and a recommendation with reasoning based on "
                        f"actual data from flight booking sites"
     )
 
 
-def create_hotel_task(hotel_agent, destination: str, trip_dates: str):
+def create_hotel_task(hotel_agent, destination: str, trip_dates: str, hotel_location: str = None,
+                      provider: ProviderConfig = None):
     """Define the hotel recommendation task using real data."""
     # Determine main city for hotels
-    hotel_location = destination
-    if destination.lower() == "iceland":
-        hotel_location = "Reykjavik"
-    elif destination.lower() == "france":
-        hotel_location = "Paris"
-    elif destination.lower() == "japan":
-        hotel_location = "Tokyo"
-
-    return Task(
+    if hotel_location is None:
+        hotel_location = resolve_hotel_location(destination)
+
+    return MemoizedTask(
+        memo_name="HotelAgent",
         description=f"Based on the trip dates ({trip_dates}), find and recommend "
                    f"the top 3-4 REAL hotels in {hotel_location}. Research actual hotels "
                    f"on Booking.com, TripAdvisor, Google Hotels, and Expedia. For each hotel, "
                    f"provide the actual name, current guest ratings, real prices per night, "
                    f"confirmed amenities, and explain why it suits this trip. "
+                   f"Prefer hotels close to the trip's attractions, using the proximity ranking for {destination}. "
                    f"Include a mix of budget, mid-range, and luxury options with honest reviews.",
         agent=hotel_agent,
+        guardrail=cascade_guardrail(hotel_agent, "HotelAgent", provider),
         expected_output=f"A curated list of 3-4 REAL hotel recommendations in {hotel_location} with actual details "
                        f"about each hotel, confirmed amenities, real guest ratings, current prices, "
                        f"and personalized recommendations based on actual guest reviews"
     )
 
 
-def create_itinerary_task(itinerary_agent, destination: str, trip_duration: str, trip_dates: str):
+def create_itinerary_task(itinerary_agent, destination: str, trip_duration: str, trip_dates: str,
+                          provider: ProviderConfig = None):
     """Define the itinerary planning task using real information."""
-    return Task(
+    return MemoizedTask(
+        memo_name="ItineraryAgent",
         description=f"Create a detailed {trip_duration} itinerary for {destination} ({trip_dates}) based on "
                    f"REAL current information. Research actual attractions, their opening hours, "
-                   f"accessibility, and entry fees. Plan day-by-day activities including visits "
-                   f"to real attractions and verified sites. Include realistic estimated travel times between "
-                   f"locations, activity durations, and recommended visit times. Consider actual "
+                   f"accessibility, and entry fees. Choose the attractions, then call the route planner "
+                   f"once with them to split them into days and order each day; present its schedule, "
+                   f"travel times and visit times as they are instead of estimating them yourself. Consider actual "
                    f"weather patterns for this time period in {destination} and make the itinerary realistic and well-paced.",
         agent=itinerary_agent,
+        guardrail=cascade_guardrail(itinerary_agent, "ItineraryAgent", provider),
         expected_output=f"A detailed day-by-day itinerary for {destination} with REAL activities based on verified "
                        f"attractions, realistic travel times, accurate estimated durations, current "
                        f"entry fees, and practical tips for {trip_duration} trip to {destination}"
     )
 
 
-def create_budget_task(budget_agent, destination: str, trip_duration: str):
-    """Define the budget calculation task using real cost data."""
-    return Task(
+def create_budget_task(budget_agent, destination: str, trip_duration: str, trip_dates: str = "",
+                       departure_city: str = "", travelers: Any = 2, budget_preference: str = "mid-range",
+                       provider: ProviderConfig = None):
+    """Define the budget calculation task; the totals come from the budget calculator tool."""
+    return MemoizedTask(
+        memo_name="BudgetAgent",
         description=f"Based on the REAL flight options, hotel recommendations, and itinerary "
-                   f"created by the other agents, calculate a comprehensive budget for the "
-                   f"{trip_duration} {destination} trip using current pricing. Research and include actual "
-                   f"costs for flights, accommodation, meals (use real restaurant prices in the destination), "
-                   f"activities/tours (verified prices), transportation within {destination}, "
-                   f"and miscellaneous expenses. Provide total cost estimates "
-                   f"for budget, mid-range, and luxury options based on real prices. Suggest "
-                   f"genuine cost-saving tips based on current market conditions.",
+                   f"created by the other agents, present a comprehensive budget for the "
+                   f"{trip_duration} {destination} trip ({trip_dates}) from {departure_city} for "
+                   f"{travelers} traveler(s) with a {budget_preference} preference. Call the trip budget "
+                   f"calculator once with the recommended round-trip fares and nightly hotel rates; it "
+                   f"computes every category total for budget, mid-range, and luxury options. Quote its "
+                   f"numbers as they are instead of adding costs up yourself, and explain what drives them. "
+                   f"Suggest genuine cost-saving tips based on current market conditions.",
         agent=budget_agent,
+        guardrail=cascade_guardrail(budget_agent, "BudgetAgent", provider),
         expected_output=f"A comprehensive budget report with itemized REAL costs for flights, "
                        f"accommodation, meals, activities with actual entry fees, transportation, "
                        f"and total realistic estimates at different budget levels, plus "
@@ -308,9 +604,170 @@ def create_budget_task(budget_agent, destination: str, trip_duration: str):
 # CREW ORCHESTRATION
 # ============================================================================
 
+def create_travel_crew(destination: str, trip_duration: str, trip_dates: str,
+                       departure_city: str, run_context: RunContext = None,
+                       verbose: bool = True, hotel_location: str = None,
+                       provider: ProviderConfig = None, travelers: Any = 2,
+                       budget_preference: str = "mid-range") -> Crew:
+    """
+    Create the four agents, their tasks and the sequential travel planning crew.
+
+    Args:
+        destination: Travel destination (e.g., "Iceland", "France", "Japan")
+        trip_duration: Duration of trip (e.g., "5 days", "7 days")
+        trip_dates: Specific dates (e.g., "January 15-20, 2026")
+        departure_city: City you're departing from (e.g., "New York", "Los Angeles")
+        run_context: Optional run deadline/cancellation applied to every task
+        verbose: Whether CrewAI should log agent steps
+        hotel_location: City to search hotels in (default: resolved from destination)
+        provider: Provider settings passed to every agent's LLM (default: from the environment)
+        travelers: Number of travelers the budget is calculated for
+        budget_preference: "budget", "mid-range" or "luxury"
+    """
+    provider = provider or ProviderConfig.from_env()
+
+    # Create agents with destination parameters
+    flight_agent = create_flight_agent(destination, trip_dates, provider)
+    hotel_agent = create_hotel_agent(destination, trip_dates, hotel_location, provider)
+    itinerary_agent = create_itinerary_agent(destination, trip_duration, provider)
+    budget_agent = create_budget_agent(destination, provider)
+
+    # Create tasks with destination parameters
+    tasks = [
+        create_flight_task(flight_agent, destination, trip_dates, departure_city, provider),
+        create_hotel_task(hotel_agent, destination, trip_dates, hotel_location, provider),
+        create_itinerary_task(itinerary_agent, destination, trip_duration, trip_dates, provider),
+        create_budget_task(budget_agent, destination, trip_duration, trip_dates, departure_city,
+                           travelers, budget_preference, provider),
+    ]
+
+    crew = Crew(
+        agents=[flight_agent, hotel_agent, itinerary_agent, budget_agent],
+        tasks=tasks,
+        verbose=verbose,
+        process="sequential",  # Sequential task execution
+    )
+    bind_run_context(crew, run_context)
+    return crew
+
+
+def create_travel_crew_template(verbose: bool = True, provider: ProviderConfig = None) -> Crew:
+    """
+    Create a crew whose agent and task texts contain {placeholders}.
+
+    CrewAI fills the placeholders from kickoff(inputs=trip_inputs(...)), so one
+    template crew can plan any number of trips.
+    """
+    return create_travel_crew("{trip_destination}", "{trip_duration}", "{trip_dates}",
+                              "{departure_city}", verbose=verbose, hotel_location="{hotel_location}",
+                              provider=provider, travelers="{travelers}", budget_preference="{budget_preference}")
+
+
+def bind_run_context(crew: Crew, run_context: RunContext = None) -> None:
+    """Attach (or, with None, detach) a run's deadline and cancellation callbacks."""
+    # Cap each agent's execution time at the time left in the run
+    remaining = run_context.remaining() if run_context is not None else None
+    step_callback = run_context.crew_step_callback if run_context is not None else None
+    for agent in crew.agents:
+        agent.max_execution_time = max(1, int(remaining)) if remaining is not None else None
+        # LLM calls are charged to the run's tenant and priority
+        agent.llm.run_context = run_context
+        # Kickoff only copies crew.step_callback to agents without one, so a pooled
+        # crew's agents would keep the first run's callback (and its deadline)
+        agent.step_callback = step_callback
+    # step_callback stops the crew at the next step once cancelled;
+    # task_callback keeps finished task outputs
+    crew.step_callback = step_callback
+    crew.task_callback = run_context.crew_task_callback if run_context is not None else None
+
+
+def reset_travel_crew(crew: Crew) -> None:
+    """Clear per-trip state so a pooled crew can plan the next trip."""
+    bind_run_context(crew, None)
+    for task in crew.tasks:
+        task.output = None
+        task.retry_count = 0  # Guardrail retries are per trip
+        if isinstance(task.guardrail, CascadeGuardrail):
+            task.guardrail.reset()
+
+
+# Template crews are built once per verbosity and provider and reused across trips
+TRAVEL_CREW_POOL = AgentPool(build=create_travel_crew_template, reset=reset_travel_crew)
+
+
+def travel_crew_pool_key(verbose: bool, provider: ProviderConfig) -> tuple:
+    """Pool key: template crews are interchangeable for the same verbosity and provider."""
+    return (verbose, provider.cache_key())
+
+
+def trip_inputs(destination: str, trip_duration: str, trip_dates: str, departure_city: str,
+                travelers: int, budget_preference: str) -> dict:
+    """Build the kickoff inputs for one trip."""
+    return {
+        "trip_destination": destination,
+        "trip_duration": trip_duration,
+        "trip_dates": trip_dates,
+        "departure_city": departure_city,
+        "travelers": travelers,
+        "budget_preference": budget_preference,
+        "hotel_location": resolve_hotel_location(destination),
+    }
+
+
+def save_travel_plan(result, destination: str, trip_duration: str, trip_dates: str,
+                     departure_city: str, travelers: int, budget_preference: str,
+                     outputs: dict = None, provider: ProviderConfig = None):
+    """
+    Save the final travel plan and return where it went.
+
+    With ARCHIVE_RUNS the plan and the per-task outputs are added to the run
+    archive, together with the provider and model the crew ran on (provider,
+    default: the .env settings), and its reference is returned; otherwise the
+    report is written next to this script and its path is returned.
+    """
+    if Config.ARCHIVE_RUNS:
+        provider = provider or ProviderConfig.from_env()
+        trip = {"destination": destination, "trip_duration": trip_duration, "trip_dates": trip_dates,
+                "departure_city": departure_city, "travelers": travelers, "budget_preference": budget_preference,
+                "provider": provider.provider, "model": provider.model}
+        run_id = get_archive().put_run("travel", {**(outputs or {}), "final": str(result)}, metadata=trip)
+        return archive_reference(run_id)
+
+    output_filename = f"crewai_output_{destination.lower()}.txt"
+    output_path = Path(__file__).parent / output_filename
+
+    with open(output_path, "w") as f:
+        f.write("=" * 80 + "\n")
+        f.write("CrewAI Multi-Agent Travel Planning System - Real API Execution Report\n")
+        f.write(f"Planning a {trip_duration} Trip to {destination}\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"Trip Details:\n")
+        f.write(f"  Destination: {destination}\n")
+        f.write(f"  Duration: {trip_duration}\n")
+        f.write(f"  Dates: {trip_dates}\n")
+        f.write(f"  Departure: {departure_city}\n")
+        f.write(f"  Travelers: {travelers}\n")
+        f.write(f"  Budget Preference: {budget_preference}\n\n")
+        f.write(f"Execution Time: {datetime.now()}\n")
+        f.write(f"API Version: REAL API CALLS (OpenAI GPT-4)\n")
+        f.write(f"Data Source: Web research via OpenAI\n\n")
+        f.write("IMPORTANT NOTES:\n")
+        f.write("- All flight prices, hotel costs, and attraction information is based on real data\n")
+        f.write("- Prices are current as of the date this was run\n")
+        f.write("- Hotel availability and prices may vary by booking date\n")
+        f.write("- Weather conditions and attraction hours should be verified before travel\n\n")
+        f.write("FINAL TRAVEL PLAN REPORT:\n")
+        f.write("-" * 80 + "\n")
+        f.write(str(result))
+        f.write("\n" + "-" * 80 + "\n")
+
+    return output_path
+
+
 def main(destination: str = "Iceland", trip_duration: str = "5 days",
          trip_dates: str = "January 15-20, 2026", departure_city: str = "New York",
-         travelers: int = 2, budget_preference: str = "mid-range"):
+         travelers: int = 2, budget_preference: str = "mid-range",
+         run_context: RunContext = None, provider: ProviderConfig = None):
     """
     Main function to orchestrate the travel planning crew.
 
@@ -321,7 +778,15 @@ def main(destination: str = "Iceland", trip_duration: str = "5 days",
         departure_city: City you're departing from (e.g., "New York", "Los Angeles")
         travelers: Number of travelers
         budget_preference: Budget level ("budget", "mid-range", "luxury")
+        run_context: Optional run deadline/cancellation (defaults to Config.RUN_DEADLINE)
+        provider: Optional per-run provider settings (defaults to the .env settings)
+
+    Returns:
+        The crew result, or a dict of completed task outputs if the run was cancelled
     """
+    run_context = run_context or RunContext()
+    run_context.label("travel", destination)
+    provider = provider or ProviderConfig.from_env()
 
     print("=" * 80)
     print("CrewAI Multi-Agent Travel Planning System (REAL API VERSION)")
@@ -341,15 +806,6 @@ def main(destination: str = "Iceland", trip_duration: str = "5 days",
         print("❌ Configuration validation failed. Please set up your .env file.")
         exit(1)
 
-    # Set environment variables for CrewAI (it reads from os.environ)
-    # CrewAI uses OPENAI_API_KEY and OPENAI_API_BASE environment variables
-    os.environ["OPENAI_API_KEY"] = Config.API_KEY
-    os.environ["OPENAI_API_BASE"] = Config.API_BASE
-    
-    # For Groq compatibility, also set OPENAI_MODEL_NAME
-    if Config.USE_GROQ:
-        os.environ["OPENAI_MODEL_NAME"] = Config.OPENAI_MODEL
-
     print("✅ Configuration validated successfully!")
     print()
     Config.print_summary()
@@ -360,114 +816,66 @@ def main(destination: str = "Iceland", trip_duration: str = "5 days",
     print("Tip: Check your API usage at https://platform.openai.com/account/usage")
     print()
 
-    # Create agents with destination parameters
-    print("[1/4] Creating Flight Specialist Agent (researches real flights)...")
-    flight_agent = create_flight_agent(destination, trip_dates)
-
-    print("[2/4] Creating Accommodation Specialist Agent (researches real hotels)...")
-    hotel_agent = create_hotel_agent(destination, trip_dates)
-
-    print("[3/4] Creating Travel Planner Agent (researches real attractions)...")
-    itinerary_agent = create_itinerary_agent(destination, trip_duration)
-
-    print("[4/4] Creating Financial Advisor Agent (analyzes real costs)...")
-    budget_agent = create_budget_agent(destination)
-
-    print("\n✅ All agents created successfully!")
-    print()
-
-    # Create tasks with destination parameters
-    print("Creating tasks for the crew...")
-    flight_task = create_flight_task(flight_agent, destination, trip_dates, departure_city)
-    hotel_task = create_hotel_task(hotel_agent, destination, trip_dates)
-    itinerary_task = create_itinerary_task(itinerary_agent, destination, trip_duration, trip_dates)
-    budget_task = create_budget_task(budget_agent, destination, trip_duration)
-
-    print("Tasks created successfully!")
-    print()
-
-    # Create the crew with sequential task execution
-    print("Forming the Travel Planning Crew...")
-    print("Task Sequence: FlightAgent → HotelAgent → ItineraryAgent → BudgetAgent")
-    print()
-
-    crew = Crew(
-        agents=[flight_agent, hotel_agent, itinerary_agent, budget_agent],
-        tasks=[flight_task, hotel_task, itinerary_task, budget_task],
-        verbose=True,
-        process="sequential"  # Sequential task execution
-    )
-
-    # Execute the crew
-    print("=" * 80)
-    print("Starting Crew Execution with REAL API Calls...")
-    print(f"Planning {trip_duration} trip to {destination} ({trip_dates})")
-    print("=" * 80)
-    print()
-
-    try:
-        result = crew.kickoff(inputs={
-            "trip_destination": destination,
-            "trip_duration": trip_duration,
-            "trip_dates": trip_dates,
-            "departure_city": departure_city,
-            "travelers": travelers,
-            "budget_preference": budget_preference
-        })
-
+    # Get the crew with sequential task execution (agents and tasks are built on
+    # first use and reused for later trips in this process)
+    print("Preparing agents: Flight Specialist, Accommodation Specialist, Travel Planner, Financial Advisor...")
+    with TRAVEL_CREW_POOL.acquire(travel_crew_pool_key(True, provider), verbose=True, provider=provider) as crew:
+        bind_run_context(crew, run_context)
+        print("✅ All agents and tasks ready!")
+        if Config.VERBOSE:
+            PROMPT_COMPILER.print_report()
+        print("Task Sequence: FlightAgent → HotelAgent → ItineraryAgent → BudgetAgent")
         print()
+
+        # Execute the crew
         print("=" * 80)
-        print("✅ Crew Execution Completed Successfully!")
+        print("Starting Crew Execution with REAL API Calls...")
+        print(f"Planning {trip_duration} trip to {destination} ({trip_dates})")
         print("=" * 80)
         print()
-        print(f"FINAL TRAVEL PLAN REPORT FOR {destination.upper()} (Based on Real API Data):")
-        print("-" * 80)
-        print(result)
-        print("-" * 80)
-
-        # Save output to file
-        output_filename = f"crewai_output_{destination.lower()}.txt"
-        output_path = Path(__file__).parent / output_filename
-
-        with open(output_path, "w") as f:
-            f.write("=" * 80 + "\n")
-            f.write("CrewAI Multi-Agent Travel Planning System - Real API Execution Report\n")
-            f.write(f"Planning a {trip_duration} Trip to {destination}\n")
-            f.write("=" * 80 + "\n\n")
-            f.write(f"Trip Details:\n")
-            f.write(f"  Destination: {destination}\n")
-            f.write(f"  Duration: {trip_duration}\n")
-            f.write(f"  Dates: {trip_dates}\n")
-            f.write(f"  Departure: {departure_city}\n")
-            f.write(f"  Travelers: {travelers}\n")
-            f.write(f"  Budget Preference: {budget_preference}\n\n")
-            f.write(f"Execution Time: {datetime.now()}\n")
-            f.write(f"API Version: REAL API CALLS (OpenAI GPT-4)\n")
-            f.write(f"Data Source: Web research via OpenAI\n\n")
-            f.write("IMPORTANT NOTES:\n")
-            f.write("- All flight prices, hotel costs, and attraction information is based on real data\n")
-            f.write("- Prices are current as of the date this was run\n")
-            f.write("- Hotel availability and prices may vary by booking date\n")
-            f.write("- Weather conditions and attraction hours should be verified before travel\n\n")
-            f.write("FINAL TRAVEL PLAN REPORT:\n")
-            f.write("-" * 80 + "\n")
-            f.write(str(result))
-            f.write("\n" + "-" * 80 + "\n")
-
-        print(f"\n✅ Output saved to {output_filename}")
-        print("ℹ️  Note: All data in this report is based on REAL API calls to OpenAI")
-        print("    and research of current travel information sources.")
-
-    except Exception as e:
-        print(f"\n❌ Error during crew execution: {str(e)}")
-        print("\n🔍 Troubleshooting:")
-        print("   1. Verify OPENAI_API_KEY is set: export OPENAI_API_KEY='sk-...'")
-        print("   2. Check API key is valid and has sufficient credits")
-        print("   3. Verify internet connection for web research")
-        print("   4. Check OpenAI API status at https://status.openai.com")
-        print()
-        import traceback
-        traceback.print_exc()
+
+        try:
+            result = run_context.run(crew.kickoff, inputs=trip_inputs(
+                destination, trip_duration, trip_dates, departure_city, travelers, budget_preference
+            ))
+
+            print()
+            print("=" * 80)
+            print("✅ Crew Execution Completed Successfully!")
+            print("=" * 80)
+            print()
+            print(f"FINAL TRAVEL PLAN REPORT FOR {destination.upper()} (Based on Real API Data):")
+            print("-" * 80)
+            print(result)
+            print("-" * 80)
+
+            # Save output to the run archive (or a file with ARCHIVE_RUNS=False)
+            output_path = save_travel_plan(result, destination, trip_duration, trip_dates,
+                                           departure_city, travelers, budget_preference,
+                                           outputs=run_context.partial_outputs)
+
+            print(f"\n✅ Output saved to {output_path}")
+            print("ℹ️  Note: All data in this report is based on REAL API calls to OpenAI")
+            print("    and research of current travel information sources.")
+            if Config.VERBOSE:
+                print(TRAVEL_CREW_POOL.describe())
+            return result
+
+        except RunCancelled as e:
+            TRAVEL_CREW_POOL.discard(crew)  # An abandoned worker thread may still be using it
+            print(f"\n⚠️  Crew stopped ({e}); returning {len(run_context.partial_outputs)} completed task(s)")
+            return dict(run_context.partial_outputs)
+
+        except Exception as e:
+            print(f"\n❌ Error during crew execution: {str(e)}")
+            print("\n🔍 Troubleshooting:")
+            print("   1. Verify OPENAI_API_KEY is set: export OPENAI_API_KEY='sk-...'")
+            print("   2. Check API key is valid and has sufficient credits")
+            print("   3. Verify internet connection for web research")
+            print("   4. Check OpenAI API status at https://status.openai.com")
+            print()
+            import traceback
+            traceback.print_exc()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,251 @@
+"""
+Destination Resolver for the CrewAI Travel Planning System
+
+Users type destinations every which way: "iceland", "Reykjavík", "reykj",
+"Japn", "NYC", "Paris, France", "LHR". The resolver maps such input to a
+canonical place. For a country that is its hub city (where the crew books
+hotels); for a city, the city itself. Both come with coordinates and airport
+codes. Agents, tools and the fare/rate inventory all resolve places through
+it, so "hub city" and "airports" mean the same thing everywhere.
+
+Lookup order, fastest first:
+
+1. Exact name or alias, after lowercasing and removing accents and
+   punctuation (a dict lookup)
+2. Airport code (3 letters)
+3. Prefix: a trie over all names and aliases whose every node stores its
+   best completion, so "reyk" costs one step per character
+4. Fuzzy: names sharing a trigram with the input are compared by edit
+   distance (up to one edit per four characters)
+
+"City, Country" input uses the country to break ties. Results are cached, so
+repeated lookups take about a microsecond. The bundled gazetteer
+(crewai/data/gazetteer.jsonl: countries with a hub city, cities with
+coordinates, airports) is read on the first lookup, once per process, along
+with any GAZETTEER_FILES.
+
+Usage:
+    python cli.py resolve "reykjavík" japn "Paris, France" LHR
+
+    from destination_resolver import get_resolver
+    resolver = get_resolver()
+    resolver.hub_city("iceland")        # "Reykjavik"
+    resolver.airports("New York")       # ("JFK", "EWR", "LGA")
+"""
+
+import os
+import re
+import json
+import threading
+import unicodedata
+from pathlib import Path
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+
+from shared_config import Config
+
+BUNDLED_FILE = Path(__file__).parent / "data" / "gazetteer.jsonl"
+_NOISE = re.compile(r"^(?:a |an |the |trip to |visit(?:ing)? |to |in )+")
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accent-free, single-spaced text without punctuation"""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NOISE.sub("", " ".join(_PUNCTUATION.sub(" ", text).split()))
+
+
+def gazetteer_files() -> List[Path]:
+    """Bundled gazetteer plus the files listed in GAZETTEER_FILES"""
+    extra = [Path(item.strip()) for item in re.split(rf"[,{os.pathsep}]", Config.GAZETTEER_FILES) if item.strip()]
+    return [BUNDLED_FILE] + extra
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance with adjacent transpositions, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            if before is not None and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class DestinationResolver:
+    """Gazetteer of countries, cities and airports with exact, prefix and fuzzy lookup"""
+
+    def __init__(self, files: Optional[List[Path]] = None):
+        """
+        Args:
+            files: Gazetteer .jsonl files (default: bundled file plus GAZETTEER_FILES)
+        """
+        self.files = files or gazetteer_files()
+        self.places: List[Dict[str, Any]] = []
+        self.names: Dict[str, List[int]] = {}
+        self.airport_codes: Dict[str, int] = {}
+        self.trie: Dict[str, Any] = {}
+        self.trigrams: Dict[str, List[str]] = {}
+        self._load()
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+
+    def _load(self) -> None:
+        records = []
+        for path in self.files:
+            with open(path, encoding="utf-8") as f:
+                records += [json.loads(line) for line in f if line.strip()]
+        cities = {}
+        for record in records:
+            if record["kind"] == "city":
+                cities[record["name"]] = {**record, "airports": list(record.get("airports", []))}
+        for record in records:
+            if record["kind"] == "airport" and record["city"] in cities:
+                airports = cities[record["city"]]["airports"]
+                if record["code"] not in airports:
+                    airports.append(record["code"])
+
+        # Countries first, then cities and airports, in file order: earlier places win ties
+        for record in records:
+            if record["kind"] == "country":
+                hub = cities.get(record["hub"], {})
+                place = {"kind": "country", "name": record["name"], "country": record["name"],
+                         "code": record.get("code", ""), "city": record["hub"], "lat": hub.get("lat"),
+                         "lon": hub.get("lon"), "airports": tuple(hub.get("airports", ()))}
+                self._add(place, [record["name"], record.get("code", "")] + record.get("aliases", []))
+        for city in cities.values():
+            place = {"kind": "city", "name": city["name"], "country": city["country"], "city": city["name"],
+                     "lat": city["lat"], "lon": city["lon"], "airports": tuple(city["airports"])}
+            self._add(place, [city["name"]] + city.get("aliases", []))
+        for record in records:
+            if record["kind"] == "airport":
+                city = cities.get(record["city"], {})
+                place = {"kind": "airport", "name": record["name"], "country": record.get("country", ""),
+                         "city": record["city"], "lat": record["lat"], "lon": record["lon"],
+                         "airports": (record["code"],)}
+                self.airport_codes[record["code"].upper()] = len(self.places)
+                self._add(place, [record["name"]] if city else [])
+
+    def _add(self, place: Dict[str, Any], names: List[str]) -> None:
+        index = len(self.places)
+        self.places.append(place)
+        for name in filter(None, (normalize(name) for name in names)):
+            entries = self.names.setdefault(name, [])
+            if index in entries:
+                continue
+            entries.append(index)
+            node = self.trie
+            for char in name:
+                node = node.setdefault(char, {})
+                node.setdefault("", index)  # Best (first added) completion below this node
+            for trigram in {f"  {name} "[i:i + 3] for i in range(len(name) + 1)}:
+                self.trigrams.setdefault(trigram, []).append(name)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _pick(self, candidates: List[int], country: Optional[str]) -> int:
+        """First candidate in the hinted country, else the first one"""
+        if country:
+            for index in candidates:
+                if normalize(self.places[index]["country"]) == country:
+                    return index
+        return candidates[0]
+
+    def _match(self, text: str, country: Optional[str]) -> Optional[Tuple[int, str]]:
+        """(place index, how it matched) for normalized text"""
+        if text in self.names:
+            return self._pick(self.names[text], country), "exact"
+        if len(text) == 3 and text.upper() in self.airport_codes:
+            return self.airport_codes[text.upper()], "airport code"
+        node = self.trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+        else:
+            if len(text) >= 3:
+                return node[""], "prefix"
+        if len(text) < 3:
+            return None
+        # An edit breaks at most three of the len + 1 padded trigrams (a transposition four), so
+        # a name within limit edits shares at least len + 1 - 4 * limit of them (q-gram filter)
+        limit = max(1, len(text) // 4)
+        shared: Dict[str, int] = {}
+        for trigram in {f"  {text} "[i:i + 3] for i in range(len(text) + 1)}:
+            for name in self.trigrams.get(trigram, ()):
+                shared[name] = shared.get(name, 0) + 1
+        needed = len(text) + 1 - 4 * limit
+        scored = sorted((_edit_distance(text, name, limit), min(self.names[name]), name)
+                        for name, count in shared.items() if count >= needed)
+        if scored and scored[0][0] <= limit:
+            return self._pick(self.names[scored[0][2]], country), "fuzzy"
+        return None
+
+    def _resolve(self, text: str) -> Optional[Dict[str, Any]]:
+        """Canonical place for free-text input, or None (cached per input via self.resolve)"""
+        parts = [normalize(part) for part in (text or "").split(",")]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+        hint = None
+        if len(parts) > 1:
+            last = self._match(parts[-1], None)
+            hint = normalize(self.places[last[0]]["country"]) if last else None
+        # "City, Country": the city (in the hinted country) first, then the whole text, then the rest
+        for candidate in dict.fromkeys([parts[0], " ".join(parts)] + parts[1:]):
+            matched = self._match(candidate, hint)
+            if matched is not None:
+                return {**self.places[matched[0]], "query": text, "match": matched[1]}
+        return None
+
+    def hub_city(self, text: str) -> Optional[str]:
+        """Hotel hub city for a country, the city itself for a city or airport"""
+        place = self.resolve(text)
+        return place["city"] if place else None
+
+    def airports(self, text: str) -> Tuple[str, ...]:
+        """Airport codes serving a place (a country's hub city)"""
+        place = self.resolve(text)
+        return place["airports"] if place else ()
+
+    def canonical(self, text: str) -> Optional[str]:
+        """Canonical spelling: the country name for a country, else the city name"""
+        place = self.resolve(text)
+        if place is None:
+            return None
+        return place["country"] if place["kind"] == "country" else place["city"]
+
+    def complete(self, prefix: str, limit: int = 8) -> List[str]:
+        """Names starting with prefix, for autocompletion (best first)"""
+        node = self.trie
+        for char in normalize(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+        found, stack = set(), [node]
+        while stack:
+            node = stack.pop()
+            found.update(child for key, child in node.items() if key == "")
+            stack.extend(child for key, child in node.items() if key)
+        return [self.places[index]["name"] for index in sorted(found)[:limit]]
+
+
+_RESOLVER: Optional[DestinationResolver] = None
+_RESOLVER_LOCK = threading.Lock()
+
+
+def get_resolver() -> DestinationResolver:
+    """Process-wide resolver, loaded on first use"""
+    global _RESOLVER
+    with _RESOLVER_LOCK:
+        if _RESOLVER is None:
+            _RESOLVER = DestinationResolver()
+        return _RESOLVER
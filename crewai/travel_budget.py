@@ -0,0 +1,230 @@
+"""
+Deterministic Trip Budget Calculator for the CrewAI Travel Planning System
+
+The budget task used to have the LLM itemize and add up every cost for three
+budget tiers, which was slow, token-heavy and error-prone. This calculator
+does the arithmetic. Unit costs form a (tier × category) array and are
+multiplied by each category's quantity in one NumPy broadcast:
+
+- flights: round-trip fare per person × travelers
+- lodging: nightly rate per room × nights × rooms (two travelers per room)
+- meals, local transport, activities, misc: per person per day × travelers × days
+
+Unit costs come from the fare and rate inventory (travel_inventory.py) and
+the knowledge store's daily baselines (travel_knowledge.py). Fares and
+nightly rates the other agents picked can be passed in and take precedence.
+budget_matrix also broadcasts over a batch of trips, so a whole batch of
+budgets is computed in one call.
+
+Usage:
+    python cli.py budget Iceland --travelers 3 --dates "January 15-20, 2026" --preference luxury
+
+    from travel_budget import calculate_budget, format_budget
+    budget = calculate_budget("Iceland", 2, "5 days", "January 15-20, 2026", "mid-range")
+    print(format_budget(budget))
+"""
+
+import re
+import math
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from shared_config import Config
+from travel_inventory import get_inventory, parse_date_window
+from travel_knowledge import get_knowledge, BUDGET_TIERS
+
+CATEGORIES = ("flights", "lodging", "meals", "local_transport", "activities", "misc")
+PER_PERSON_DAY = ("meals", "local_transport", "activities", "misc")
+TRAVELERS_PER_ROOM = 2
+PREMIUM_FARE_FACTOR = 3.0  # Luxury fare: premium cabin over the mid-range economy fare
+
+
+def trip_length(trip_duration: str = "", trip_dates: str = "") -> Tuple[int, int]:
+    """
+    (days, nights) from the duration ("5 days"), else from the trip dates.
+
+    The stated duration wins, as in the crew's prompts and job_scheduler.trip_days,
+    so the budget covers the trip the agents plan.
+    """
+    match = re.search(r"\d+", trip_duration or "")
+    window = parse_date_window(trip_dates) if trip_dates else None
+    if match is None and window is not None and window[1] > window[0]:
+        nights = (window[1] - window[0]).days
+        return nights + 1, nights
+    days = max(1, int(match.group())) if match else 5
+    return days, max(1, days - 1)
+
+
+def dates_conflict(trip_duration: str, trip_dates: str) -> Optional[str]:
+    """Note when the trip dates span a different number of days than the stated duration"""
+    window = parse_date_window(trip_dates) if trip_dates else None
+    if window is None or window[1] <= window[0] or not re.search(r"\d+", trip_duration or ""):
+        return None
+    spanned, (days, _) = (window[1] - window[0]).days + 1, trip_length(trip_duration, trip_dates)
+    if spanned == days:
+        return None
+    return f"{trip_dates} spans {spanned} days; the budget uses the stated {days} days"
+
+
+def parse_tier_values(text: str, preference: str = "mid-range") -> np.ndarray:
+    """
+    Per-tier amounts from "450, 700, 2200" (budget, mid-range, luxury).
+
+    A single amount applies to the preferred tier only; tiers without an
+    amount are NaN.
+    """
+    amounts = [float(value.replace(",", "")) for value in re.findall(r"\d[\d,]*(?:\.\d+)?", text or "")]
+    values = np.full(len(BUDGET_TIERS), np.nan)
+    if len(amounts) >= len(BUDGET_TIERS):
+        values[:] = amounts[:len(BUDGET_TIERS)]
+    elif amounts:
+        values[BUDGET_TIERS.index(preference) if preference in BUDGET_TIERS else 1] = amounts[0]
+    return values
+
+
+def budget_matrix(unit_costs: np.ndarray, travelers, days, nights) -> np.ndarray:
+    """
+    Cost of every tier and category: unit costs times quantities.
+
+    Args:
+        unit_costs: (..., tier, category) unit costs in CATEGORIES order (NaN when unknown)
+        travelers, days, nights: Scalars, or arrays matching unit_costs' leading (batch) shape
+
+    Returns:
+        np.ndarray: Same shape as unit_costs
+    """
+    travelers, days, nights = (np.asarray(value, dtype=np.float64) for value in (travelers, days, nights))
+    rooms = np.ceil(travelers / TRAVELERS_PER_ROOM)
+    quantities = np.stack(np.broadcast_arrays(
+        travelers, rooms * nights, *(travelers * days for _ in PER_PERSON_DAY)), axis=-1)
+    return unit_costs * quantities[..., None, :]
+
+
+# ============================================================================
+# UNIT COSTS
+# ============================================================================
+
+def _inventory_fares(departure_city: str, destination: str, trip_dates: str) -> np.ndarray:
+    """Round-trip fare per person per tier from the fare inventory (NaN without data)"""
+    fares = np.full(len(BUDGET_TIERS), np.nan)
+    window = parse_date_window(trip_dates) if trip_dates else None
+    if window is None or not departure_city:
+        return fares
+    inventory = get_inventory()
+    legs = [inventory.search_flights(departure_city, destination, window[0], limit=50),
+            inventory.search_flights(destination, departure_city, window[1], limit=50)]
+    if not all(legs):
+        return fares
+    cheapest = [leg[0]["price_usd"] for leg in legs]
+    direct = [min((fare["price_usd"] for fare in leg if fare["stops"] == 0), default=np.median(
+        [fare["price_usd"] for fare in leg[:10]])) for leg in legs]
+    fares[:] = sum(cheapest), sum(direct), sum(direct) * PREMIUM_FARE_FACTOR
+    return fares
+
+
+def _inventory_rates(destination: str, trip_dates: str, nights: int) -> np.ndarray:
+    """Nightly room rate per tier from the rate inventory: cheapest hotel, cheapest 4-star, cheapest 5-star"""
+    rates = np.full(len(BUDGET_TIERS), np.nan)
+    window = parse_date_window(trip_dates) if trip_dates else None
+    if window is None:
+        return rates
+    inventory = get_inventory()
+    for index, min_stars in enumerate((None, 4, 5)):
+        hotels = inventory.search_hotels(destination, window[0], nights, min_stars=min_stars, limit=1)
+        if hotels:
+            rates[index] = hotels[0]["nightly_usd"]
+    return rates
+
+
+def _baseline_costs(destination: str) -> Dict[str, np.ndarray]:
+    """Per-tier daily baselines by category from the knowledge store"""
+    if not Config.TRAVEL_KNOWLEDGE:
+        return {}
+    return {record["category"]: np.array([record.get(tier, np.nan) for tier in BUDGET_TIERS], dtype=np.float64)
+            for record in get_knowledge().records(destination, "cost")}
+
+
+def calculate_budget(destination: str, travelers: int = 2, trip_duration: str = "", trip_dates: str = "",
+                     budget_preference: str = "mid-range", departure_city: str = "",
+                     flight_fares: str = "", nightly_rates: str = "") -> Dict[str, Any]:
+    """
+    Budget for one trip: every tier × category total, tier totals and per-person totals.
+
+    Args:
+        destination: Country or city with cost data
+        travelers: Number of travelers
+        trip_duration, trip_dates: Trip length ("5 days") and dates ("January 15-20, 2026");
+            the stated length wins when the dates span a different number of days
+        budget_preference: "budget", "mid-range" or "luxury" (the tier a single fare or rate applies to)
+        departure_city: Origin for inventory fares
+        flight_fares: Round-trip fares per person chosen by the flight agent, "budget, mid, luxury" or one value
+        nightly_rates: Nightly room rates chosen by the hotel agent, same format
+    """
+    travelers = max(1, int(travelers))
+    days, nights = trip_length(trip_duration, trip_dates)
+    baselines = _baseline_costs(destination)
+    unit_costs = np.full((len(BUDGET_TIERS), len(CATEGORIES)), np.nan)
+    basis = {}
+
+    for position, category in enumerate(CATEGORIES):
+        if category in baselines:
+            unit_costs[:, position] = baselines[category]
+            basis[category] = "knowledge baseline"
+    sources = {"flights": (parse_tier_values(flight_fares, budget_preference), "agent's fares",
+                           lambda: _inventory_fares(departure_city, destination, trip_dates), "fare inventory"),
+               "lodging": (parse_tier_values(nightly_rates, budget_preference), "agent's hotels",
+                           lambda: _inventory_rates(destination, trip_dates, nights), "rate inventory")}
+    # Agent-given amounts first, then inventory prices, then the knowledge baseline
+    for category, (given, given_label, lookup, lookup_label) in sources.items():
+        position = CATEGORIES.index(category)
+        found = lookup() if np.isnan(given).any() else np.full(len(BUDGET_TIERS), np.nan)
+        labels = [label for label, values in ((given_label, given), (lookup_label, found))
+                  if not np.isnan(values).all()]
+        filled = np.where(np.isnan(given), found, given)
+        unit_costs[:, position] = np.where(np.isnan(filled), unit_costs[:, position], filled)
+        if labels:
+            basis[category] = " + ".join(dict.fromkeys(labels))
+
+    totals = budget_matrix(unit_costs, travelers, days, nights)
+    tier_totals = np.nansum(totals, axis=1)
+    return {
+        "destination": destination, "travelers": travelers, "days": days, "nights": nights,
+        "rooms": math.ceil(travelers / TRAVELERS_PER_ROOM), "preference": budget_preference,
+        "unit_costs": unit_costs, "totals": totals, "tier_totals": tier_totals,
+        "per_person": tier_totals / travelers, "basis": basis,
+        "missing": [category for position, category in enumerate(CATEGORIES) if np.isnan(totals[:, position]).all()],
+        "conflict": dates_conflict(trip_duration, trip_dates),
+    }
+
+
+def format_budget(budget: Dict[str, Any]) -> str:
+    """Compact tier × category table of a calculated budget"""
+    if len(budget["missing"]) == len(CATEGORIES):
+        return (f"No cost data for {budget['destination']}: research daily costs, fares and hotel rates, "
+                f"then pass the fares and nightly rates to this calculator again.")
+    quantity = {"flights": f"fare × {budget['travelers']} traveler(s)",
+                "lodging": f"room-night × {budget['nights']} night(s) × {budget['rooms']} room(s)"}
+    lines = [f"Trip budget for {budget['destination']}: {budget['travelers']} traveler(s), "
+             f"{budget['days']} days / {budget['nights']} nights (USD, calculated - quote as is):",
+             f"{'category':<16}" + "".join(f"{tier:>11}" for tier in BUDGET_TIERS) + "  basis"]
+    for position, category in enumerate(CATEGORIES):
+        if category in budget["missing"]:
+            continue
+        cells = "".join(f"{value:>11,.0f}" if not np.isnan(value) else f"{'-':>11}"
+                        for value in budget["totals"][:, position])
+        unit = quantity.get(category, f"per person per day × {budget['travelers']} × {budget['days']} days")
+        lines.append(f"{category.replace('_', ' '):<16}{cells}  {unit} ({budget['basis'].get(category, '-')})")
+    lines.append(f"{'total':<16}" + "".join(f"{value:>11,.0f}" for value in budget["tier_totals"]))
+    lines.append(f"{'per person':<16}" + "".join(f"{value:>11,.0f}" for value in budget["per_person"]))
+    if budget["preference"] in BUDGET_TIERS:
+        index = BUDGET_TIERS.index(budget["preference"])
+        lines.append(f"Selected tier ({budget['preference']}): ${budget['tier_totals'][index]:,.0f} total, "
+                     f"${budget['per_person'][index]:,.0f} per person")
+    if np.isnan(budget["totals"]).any(axis=0).sum() > len(budget["missing"]):
+        lines.append("Totals leave out the '-' cells (no price for that tier)")
+    if budget["missing"]:
+        lines.append(f"Not included (no data): {', '.join(budget['missing'])}")
+    if budget.get("conflict"):
+        lines.append(f"Note: {budget['conflict']}")
+    return "\n".join(lines)
@@ -0,0 +1,227 @@
+"""
+Spatial Hotel Ranking for the CrewAI Travel Planning System
+
+The hotel agent used to pick hotels without knowing where the trip goes.
+This module ranks the hotels of the rate inventory (travel_inventory.py) by
+their distance to the attractions the trip visits (travel_knowledge.py):
+
+- GeoGrid indexes points in cells of about cell_km × cell_km (a fixed
+  lat/lon grid, like a geohash prefix). Points are sorted by cell, so
+  each grid row of a radius query is one binary-searched slice.
+- rank_hotels takes the hotels nearest the trip's weighted centre from the
+  grid. It scores them with one vectorized haversine matrix
+  (hotels × attractions): the weighted mean distance to the stops. Given
+  days, every day weighs the same however many stops it has.
+- Stops farther than DAY_TRIP_KM from the city are left out of the score,
+  because day tours pick guests up in town.
+
+The answer is deterministic and takes milliseconds, so the agent reads a
+ranking instead of reasoning about maps.
+
+Usage:
+    python cli.py inventory near Iceland --attractions "Hallgrímskirkja, Harpa; Sky Lagoon"
+
+    from travel_geo import hotels_near_attractions_table
+    print(hotels_near_attractions_table("Iceland", "January 15-20, 2026"))
+"""
+
+import threading
+import unicodedata
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from travel_inventory import get_inventory, hotel_city_for, parse_date_window
+from travel_knowledge import get_knowledge
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+DAY_TRIP_KM = 12.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km; arguments broadcast like NumPy arrays"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(value, dtype=np.float64)) for value in (lat1, lon1, lat2, lon2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+class GeoGrid:
+    """Fixed-size lat/lon cell index over a set of points, sorted by cell"""
+
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_km: float = 1.0):
+        """
+        Args:
+            lat, lon: Point coordinates in degrees
+            cell_km: Approximate cell edge (north-south) in km
+        """
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.columns = int(np.ceil(360 / self.cell_deg)) + 1
+        keys = self._row(self.lat) * self.columns + self._column(self.lon)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def _row(self, lat) -> np.ndarray:
+        return np.floor((np.asarray(lat) + 90) / self.cell_deg).astype(np.int64)
+
+    def _column(self, lon) -> np.ndarray:
+        return np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(np.int64)
+
+    def within(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Indices of the points within radius_km of (lat, lon)"""
+        row_span = int(np.ceil(radius_km / KM_PER_DEGREE / self.cell_deg))
+        lon_km = KM_PER_DEGREE * max(np.cos(np.radians(lat)), 1e-6)
+        column_span = int(np.ceil(radius_km / lon_km / self.cell_deg))
+        row, column = int(self._row(lat)), int(self._column(lon))
+        first = max(column - column_span, 0)
+        last = min(column + column_span, self.columns - 1)
+        starts = [(row + offset) * self.columns + first for offset in range(-row_span, row_span + 1)]
+        bounds = zip(np.searchsorted(self.keys, starts, side="left"),
+                     np.searchsorted(self.keys, [start + last - first for start in starts], side="right"))
+        candidates = np.concatenate([self.order[start:stop] for start, stop in bounds] or [np.zeros(0, np.int64)])
+        return candidates[haversine_km(lat, lon, self.lat[candidates], self.lon[candidates]) <= radius_km]
+
+    def nearest(self, lat: float, lon: float, k: int) -> np.ndarray:
+        """Indices of the k points nearest (lat, lon), nearest first"""
+        k = min(k, len(self))
+        radius = self.cell_deg * KM_PER_DEGREE
+        found = self.within(lat, lon, radius)
+        while len(found) < k and radius < 2 * np.pi * EARTH_RADIUS_KM:
+            radius *= 2
+            found = self.within(lat, lon, radius)
+        if len(found) < k:
+            found = np.arange(len(self))
+        distance = haversine_km(lat, lon, self.lat[found], self.lon[found])
+        return found[np.argsort(distance, kind="stable")[:k]]
+
+
+def rank_hotels(grid: GeoGrid, stops_lat: np.ndarray, stops_lon: np.ndarray,
+                weights: Optional[np.ndarray] = None, candidates: int = 300) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hotels ranked by weighted mean distance to the stops.
+
+    The grid narrows the field to the candidates nearest the stops' weighted
+    centre; they are then scored exactly with one distance matrix.
+
+    Returns:
+        Tuple of hotel indices (best first), weighted mean km and farthest-stop km
+    """
+    weights = np.ones(len(stops_lat)) if weights is None else np.asarray(weights, dtype=np.float64)
+    weights = weights / weights.sum()
+    centre_lat, centre_lon = float(stops_lat @ weights), float(stops_lon @ weights)
+    hotels = grid.nearest(centre_lat, centre_lon, candidates)
+    distances = haversine_km(grid.lat[hotels][:, None], grid.lon[hotels][:, None],
+                             stops_lat[None, :], stops_lon[None, :])
+    scores = distances @ weights
+    order = np.argsort(scores, kind="stable")
+    return hotels[order], scores[order], distances[order].max(axis=1)
+
+
+# ============================================================================
+# TOOL ANSWER
+# ============================================================================
+
+_GRIDS: Dict[str, Tuple[Dict[str, np.ndarray], GeoGrid]] = {}
+_GRIDS_LOCK = threading.Lock()
+
+
+def fold_name(text: str) -> str:
+    """Lowercase text without accents, for matching attraction names"""
+    return "".join(char for char in unicodedata.normalize("NFKD", text.lower()) if not unicodedata.combining(char))
+
+
+def _hotel_grid(city: str) -> Optional[Tuple[Dict[str, np.ndarray], GeoGrid]]:
+    """Hotel points of a city and their grid, built once per process"""
+    points = get_inventory().hotel_points(city)
+    if points is None:
+        return None
+    with _GRIDS_LOCK:
+        key = hotel_city_for(city).lower()
+        if key not in _GRIDS or _GRIDS[key][0] is not points:
+            _GRIDS[key] = (points, GeoGrid(points["lat"], points["lon"]))
+        return _GRIDS[key]
+
+
+def plan_stops(destination: str, attractions: str = "") -> List[List[Dict[str, Any]]]:
+    """
+    Attraction records per day from "A, B; C" (days separated by semicolons).
+
+    Names match knowledge-store attractions by case- and accent-insensitive
+    substring; unknown names are skipped. Without names, every attraction of
+    the destination counts as one day.
+    """
+    records = [record for record in get_knowledge().records(destination, "attraction")
+               if record.get("lat") is not None and record.get("lon") is not None]
+    if not attractions.strip():
+        return [records] if records else []
+    days = []
+    for day in attractions.split(";"):
+        stops = []
+        for name in filter(None, (fold_name(part.strip()) for part in day.split(","))):
+            match = next((record for record in records
+                          if name in fold_name(record["name"]) or fold_name(record["name"]) in name), None)
+            if match is not None and match not in stops:
+                stops.append(match)
+        if stops:
+            days.append(stops)
+    return days
+
+
+def hotels_near_attractions_table(destination: str, check_in_date: str = "", attractions: str = "",
+                                  nights: int = 0, min_rating: Optional[float] = None,
+                                  max_nightly: Optional[float] = None, limit: int = 6) -> Optional[str]:
+    """
+    Compact table of the hotels closest to the trip's attractions, or None
+    when the destination has no hotel or attraction data.
+
+    With a stay in check_in_date only hotels available every night are
+    listed, with their average nightly rate.
+    """
+    located = _hotel_grid(destination)
+    days = plan_stops(destination, attractions)
+    if located is None or not days:
+        return None
+    points, grid = located
+    centre = float(np.median(points["lat"])), float(np.median(points["lon"]))
+    stops, weights, day_trips = [], [], []
+    for day in days:
+        in_town = [stop for stop in day if haversine_km(*centre, stop["lat"], stop["lon"]) <= DAY_TRIP_KM]
+        day_trips += [stop["name"] for stop in day if stop not in in_town]
+        stops += in_town
+        weights += [1.0 / len(in_town)] * len(in_town) if in_town else []
+    if not stops:
+        return None
+
+    hotels, scores, farthest = rank_hotels(grid, np.array([stop["lat"] for stop in stops]),
+                                           np.array([stop["lon"] for stop in stops]), np.array(weights))
+    rates, window = {}, parse_date_window(check_in_date) if check_in_date else None
+    if window is not None:
+        nights = nights or max(1, (window[1] - window[0]).days)
+        rates = {hotel["hotel"]: hotel["nightly_usd"] for hotel in get_inventory().search_hotels(
+            destination, window[0], nights, max_nightly, min_rating, limit=len(points["name"]))}
+    lines = [f"Hotels in {hotel_city_for(destination)} closest to {len(stops)} planned stop(s) "
+             f"over {len(days)} day(s) (weighted mean straight-line km):",
+             f"{'hotel':<32} {'stars':>5} {'rating':>6} {'avg km':>6} {'max km':>6}"
+             + (f" {'nightly':>8}" if window else "")]
+    shown = 0
+    for index, score, far in zip(hotels, scores, farthest):
+        name = str(points["name"][index])
+        if window is not None and name not in rates:
+            continue
+        if window is None and min_rating and points["rating"][index] < min_rating:
+            continue
+        lines.append(f"{name[:32]:<32} {int(points['stars'][index]):>5} {float(points['rating'][index]):>6.1f} "
+                     f"{score:>6.2f} {far:>6.2f}" + (f" {rates[name]:>8.0f}" if window else ""))
+        shown += 1
+        if shown == limit:
+            break
+    if not shown:
+        return None
+    if day_trips:
+        lines.append(f"Day trips not counted (tours pick up in town): {', '.join(day_trips)}")
+    return "\n".join(lines)
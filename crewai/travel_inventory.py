@@ -0,0 +1,547 @@
+"""
+Columnar Flight-Fare and Hotel-Rate Inventory for the CrewAI Travel Planning System
+
+The flight and hotel tools used to hand the agents a research prompt and no
+data. The inventory loads fare and nightly room-rate datasets into NumPy
+column arrays and answers the tools' questions with vectorized scans:
+
+- fares: origin, destination (airport codes), date, airline, stops,
+  duration_minutes, price_usd, depart_time
+- rates: city, hotel, date, nightly_usd, rating (0-10), stars, lat, lon
+
+Datasets are CSV or Parquet files (Parquet needs pyarrow). On first use each
+file is converted to a column store: one .npy file per column, text columns
+dictionary-encoded, rows sorted by (route, date) or (city, date). Later loads
+memory-map the columns, so a process is ready in milliseconds even with
+millions of rows. A route or city plus a date window is a contiguous slice
+found by binary search. Price, stop and rating filters and top-k selection
+(argpartition) only touch that slice.
+
+generate_fares / generate_rates write synthetic datasets for testing.
+
+Usage:
+    python cli.py inventory generate --fare-rows 2000000 --hotels-per-city 460
+    python cli.py inventory flights "New York" Iceland --dates "January 15-20, 2026" --max-stops 1
+    python cli.py inventory hotels Reykjavik --dates "January 15-20, 2026" --min-rating 8
+
+    from travel_inventory import get_inventory
+    inventory = get_inventory()
+    print(inventory.flights_table("New York", "Iceland", "January 15-20, 2026"))
+"""
+
+import re
+import csv
+import json
+import threading
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from shared_config import Config
+from destination_resolver import get_resolver
+
+FARE_COLUMNS = ("origin", "destination", "date", "airline", "stops", "duration_minutes", "price_usd", "depart_time")
+RATE_COLUMNS = ("city", "hotel", "date", "nightly_usd", "rating", "stars", "lat", "lon")
+TEXT_COLUMNS = ("origin", "destination", "airline", "city", "hotel")
+DAY_SPAN = 1 << 20  # Sort key = group code * DAY_SPAN + day number
+EPOCH = date(1970, 1, 1)
+
+_MONTHS = {name: index for index, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+_DATE_RANGE = re.compile(
+    r"([a-z]{3})[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?"
+    r"(?:\s*(?:-|–|to)\s*(?:([a-z]{3})[a-z]*\.?\s+)?(\d{1,2})(?:st|nd|rd|th)?)?"
+    r"(?:,?\s*(\d{4}))?", re.IGNORECASE)
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+
+
+def parse_date_window(text: str, default_year: Optional[int] = None) -> Optional[Tuple[date, date]]:
+    """
+    First and last day of a trip-date string, or None if it has no date.
+
+    Understands "January 15-20, 2026", "Jan 30 - Feb 3 2026", "March 3, 2026"
+    and ISO dates ("2026-01-15" or "2026-01-15 to 2026-01-20").
+    """
+    text = text or ""
+    iso = [date(int(y), int(m), int(d)) for y, m, d in _ISO_DATE.findall(text)]
+    if iso:
+        return iso[0], iso[-1]
+    match = _DATE_RANGE.search(text)
+    if not match or match.group(1).lower() not in _MONTHS:
+        return None
+    month, day, end_month, end_day, year = match.groups()
+    year = int(year) if year else (default_year or date.today().year)
+    start = date(year, _MONTHS[month.lower()], int(day))
+    if not end_day:
+        return start, start
+    end_month = _MONTHS.get((end_month or month).lower(), start.month)
+    end = date(year + (end_month < start.month), end_month, int(end_day))
+    return start, end
+
+
+def day_number(value: date) -> int:
+    return (value - EPOCH).days
+
+
+def airports_for(place: str) -> Tuple[str, ...]:
+    """Airport codes for a city, country (its hub city) or airport code"""
+    place = (place or "").strip()
+    resolved = get_resolver().resolve(place)
+    if re.fullmatch(r"[A-Z]{3}", place) and (resolved is None or resolved["match"] not in ("exact", "airport code")):
+        return (place,)  # An airport code the gazetteer does not list
+    return resolved["airports"] if resolved else ()
+
+
+def hotel_city_for(place: str) -> str:
+    """City the hotel rates are listed under for a city or country"""
+    place = (place or "").strip()
+    return get_resolver().hub_city(place) or place
+
+
+# ============================================================================
+# COLUMN STORE
+# ============================================================================
+
+def _read_source(path: Path, columns: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """Raw columns of a CSV or Parquet file"""
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=list(columns))
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in columns}
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = list(reader)
+        return {name: np.array([row[header.index(name)] for row in rows] if name in header else [""] * len(rows))
+                for name in columns}
+    table = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(
+        column_types={"date": "string", "depart_time": "string"}))
+    return {name: table.column(name).to_numpy(zero_copy_only=False) if name in table.column_names
+            else np.full(table.num_rows, "") for name in columns}
+
+
+def _encode(values: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """Dictionary-encode a text column"""
+    labels, codes = np.unique(values.astype(str), return_inverse=True)
+    return codes.astype(np.int32), [str(label) for label in labels]
+
+
+def _days(values: np.ndarray) -> np.ndarray:
+    """Day numbers of ISO date strings"""
+    return np.asarray(values.astype("datetime64[D]").astype(np.int64), dtype=np.int32)
+
+
+def _minutes(values: np.ndarray) -> np.ndarray:
+    """Minutes after midnight of HH:MM strings (-1 when missing)"""
+    text = values.astype(str)
+    valid = np.char.str_len(text) >= 4
+    parts = np.char.partition(np.where(valid, text, "0:0"), ":")
+    minutes = parts[:, 0].astype(np.int32) * 60 + parts[:, 2].astype(np.int32)
+    return np.where(valid, minutes, -1).astype(np.int16)
+
+
+class ColumnTable:
+    """Memory-mapped column arrays sorted by a (group, day) key, plus text dictionaries"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        with open(self.directory / "meta.json") as f:
+            self.meta = json.load(f)
+        self.labels: Dict[str, List[str]] = self.meta["labels"]
+        self.codes = {name: {label.lower(): code for code, label in enumerate(labels)}
+                      for name, labels in self.labels.items()}
+        self.columns = {name: np.load(self.directory / f"{name}.npy", mmap_mode="r")
+                        for name in self.meta["columns"]}
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def code(self, column: str, label: str) -> Optional[int]:
+        return self.codes[column].get((label or "").lower())
+
+    def slice(self, group: int, first_day: int, last_day: int) -> slice:
+        """Rows of one group within [first_day, last_day], found by binary search on the sort key"""
+        key = self.columns["key"]
+        start = int(np.searchsorted(key, group * DAY_SPAN + first_day, side="left"))
+        stop = int(np.searchsorted(key, group * DAY_SPAN + last_day, side="right"))
+        return slice(start, stop)
+
+    @staticmethod
+    def build(source: Path, directory: Path, kind: str) -> "ColumnTable":
+        """Convert a CSV/Parquet dataset into a sorted column store"""
+        raw = _read_source(source, FARE_COLUMNS if kind == "fares" else RATE_COLUMNS)
+        labels, columns = {}, {}
+        for name, values in raw.items():
+            if name in TEXT_COLUMNS:
+                columns[name], labels[name] = _encode(values)
+        columns["day"] = _days(raw["date"])
+        if kind == "fares":
+            routes = np.char.add(np.char.add(raw["origin"].astype(str), "-"), raw["destination"].astype(str))
+            columns["route"], labels["route"] = _encode(routes)
+            columns["stops"] = raw["stops"].astype(np.int8)
+            columns["duration_minutes"] = raw["duration_minutes"].astype(np.int16)
+            columns["price_usd"] = raw["price_usd"].astype(np.float32)
+            columns["depart_minute"] = _minutes(raw["depart_time"])
+            group = columns["route"]
+        else:
+            columns["nightly_usd"] = raw["nightly_usd"].astype(np.float32)
+            columns["rating"] = raw["rating"].astype(np.float32)
+            columns["stars"] = raw["stars"].astype(np.int8)
+            columns["lat"] = raw["lat"].astype(np.float32)
+            columns["lon"] = raw["lon"].astype(np.float32)
+            group = columns["city"]
+        columns["key"] = group.astype(np.int64) * DAY_SPAN + columns["day"]
+        order = np.argsort(columns["key"], kind="stable")
+
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, values in columns.items():
+            np.save(directory / f"{name}.npy", values[order])
+        stat = source.stat()
+        with open(directory / "meta.json", "w") as f:
+            json.dump({"kind": kind, "source": [str(source), stat.st_mtime_ns, stat.st_size],
+                       "rows": int(len(order)), "columns": list(columns), "labels": labels}, f)
+        return ColumnTable(directory)
+
+    @staticmethod
+    def open(source: Path, kind: str) -> "ColumnTable":
+        """Column store for a dataset, (re)built when the source file changed"""
+        directory = source.with_name(source.name + ".columns")
+        stat = source.stat()
+        try:
+            with open(directory / "meta.json") as f:
+                if json.load(f)["source"] == [str(source), stat.st_mtime_ns, stat.st_size]:
+                    return ColumnTable(directory)
+        except (OSError, ValueError, KeyError):
+            pass
+        return ColumnTable.build(source, directory, kind)
+
+
+# ============================================================================
+# INVENTORY
+# ============================================================================
+
+class TravelInventory:
+    """Fare and room-rate queries over the column stores"""
+
+    def __init__(self, fares_file: Optional[str] = None, rates_file: Optional[str] = None):
+        """
+        Args:
+            fares_file: Fare dataset, CSV or Parquet (default: INVENTORY_FARES)
+            rates_file: Nightly rate dataset, CSV or Parquet (default: INVENTORY_RATES)
+        """
+        self.fares_file = Path(fares_file or Config.INVENTORY_FARES)
+        self.rates_file = Path(rates_file or Config.INVENTORY_RATES)
+        self._fares: Optional[ColumnTable] = None
+        self._rates: Optional[ColumnTable] = None
+        self._hotel_points: Dict[int, Dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def fares(self) -> Optional[ColumnTable]:
+        with self._lock:
+            if self._fares is None and self.fares_file.exists():
+                self._fares = ColumnTable.open(self.fares_file, "fares")
+            return self._fares
+
+    @property
+    def rates(self) -> Optional[ColumnTable]:
+        with self._lock:
+            if self._rates is None and self.rates_file.exists():
+                self._rates = ColumnTable.open(self.rates_file, "rates")
+            return self._rates
+
+    def search_flights(self, origin: str, destination: str, first_day: date, last_day: Optional[date] = None,
+                       max_price: Optional[float] = None, max_stops: Optional[int] = None,
+                       airline: Optional[str] = None, sort: str = "price", limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Cheapest (or shortest) fares between two places departing in a date window.
+
+        Args:
+            origin, destination: City, country or airport code (see airports_for)
+            first_day, last_day: Departure date window (last_day defaults to first_day)
+            max_price: Highest fare in USD
+            max_stops: Most stops allowed
+            airline: Only this airline
+            sort: "price" or "duration"
+            limit: Number of fares returned
+        """
+        fares = self.fares
+        if fares is None:
+            return []
+        last_day = last_day or first_day
+        slices = []
+        for start in airports_for(origin):
+            for end in airports_for(destination):
+                route = fares.code("route", f"{start}-{end}")
+                if route is not None:
+                    found = fares.slice(route, day_number(first_day), day_number(last_day))
+                    slices.append(np.arange(found.start, found.stop))
+        if not slices:
+            return []
+        rows = np.concatenate(slices)
+        columns = fares.columns
+        mask = np.ones(len(rows), dtype=bool)
+        if max_price:
+            mask &= columns["price_usd"][rows] <= max_price
+        if max_stops is not None and max_stops >= 0:
+            mask &= columns["stops"][rows] <= max_stops
+        if airline:
+            code = fares.code("airline", airline)
+            mask &= columns["airline"][rows] == (code if code is not None else -1)
+        rows = rows[mask]
+        order_by = columns["duration_minutes" if sort == "duration" else "price_usd"][rows]
+        rows = rows[_top_k(order_by, limit)]
+        return [{
+            "date": str(EPOCH + timedelta(days=int(columns["day"][row]))),
+            "origin": fares.labels["origin"][columns["origin"][row]],
+            "destination": fares.labels["destination"][columns["destination"][row]],
+            "airline": fares.labels["airline"][columns["airline"][row]],
+            "stops": int(columns["stops"][row]),
+            "duration_minutes": int(columns["duration_minutes"][row]),
+            "depart_minute": int(columns["depart_minute"][row]),
+            "price_usd": round(float(columns["price_usd"][row]), 2),
+        } for row in rows]
+
+    def search_hotels(self, city: str, check_in: date, nights: int = 1, max_nightly: Optional[float] = None,
+                      min_rating: Optional[float] = None, min_stars: Optional[int] = None,
+                      sort: str = "price", limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Hotels with a rate for every night of a stay, cheapest (or best rated) first.
+
+        Args:
+            city: City, or a country with a known hotel city (see hotel_city_for)
+            check_in: First night
+            nights: Nights in the stay
+            max_nightly: Highest average nightly rate in USD
+            min_rating: Lowest guest rating (0-10)
+            min_stars: Fewest stars
+            sort: "price" or "rating"
+            limit: Number of hotels returned
+        """
+        rates = self.rates
+        code = rates.code("city", hotel_city_for(city)) if rates is not None else None
+        if code is None:
+            return []
+        nights = max(1, int(nights))
+        found = rates.slice(code, day_number(check_in), day_number(check_in) + nights - 1)
+        columns = {name: values[found] for name, values in rates.columns.items()}
+        hotels, first_row, inverse = np.unique(columns["hotel"], return_index=True, return_inverse=True)
+        totals = np.bincount(inverse, weights=columns["nightly_usd"], minlength=len(hotels))
+        counts = np.bincount(inverse, minlength=len(hotels))
+        rating, stars = columns["rating"][first_row], columns["stars"][first_row]
+
+        mask = counts == nights
+        if max_nightly:
+            mask &= totals / nights <= max_nightly
+        if min_rating:
+            mask &= rating >= min_rating
+        if min_stars:
+            mask &= stars >= min_stars
+        candidates = np.flatnonzero(mask)
+        order_by = -rating[candidates] if sort == "rating" else totals[candidates]
+        candidates = candidates[_top_k(order_by, limit)]
+        return [{
+            "hotel": rates.labels["hotel"][hotels[index]],
+            "city": rates.labels["city"][code],
+            "stars": int(stars[index]),
+            "rating": round(float(rating[index]), 1),
+            "nightly_usd": round(float(totals[index] / nights), 2),
+            "total_usd": round(float(totals[index]), 2),
+            "lat": float(columns["lat"][first_row[index]]),
+            "lon": float(columns["lon"][first_row[index]]),
+        } for index in candidates]
+
+    def hotel_points(self, city: str) -> Optional[Dict[str, np.ndarray]]:
+        """One entry per hotel listed in a city: name, stars, rating, lat, lon arrays (None without data)"""
+        rates = self.rates
+        code = rates.code("city", hotel_city_for(city)) if rates is not None else None
+        if code is None:
+            return None
+        with self._lock:
+            if code not in self._hotel_points:
+                found = rates.slice(code, 0, DAY_SPAN - 1)
+                hotel = rates.columns["hotel"][found]
+                codes, first_row = np.unique(hotel, return_index=True)
+                rows = first_row + found.start
+                self._hotel_points[code] = {
+                    "name": np.array(rates.labels["hotel"])[codes],
+                    **{name: np.asarray(rates.columns[name][rows]) for name in ("stars", "rating", "lat", "lon")},
+                }
+            return self._hotel_points[code]
+
+    # ------------------------------------------------------------------
+    # Tool answers
+    # ------------------------------------------------------------------
+
+    def flights_table(self, origin: str, destination: str, trip_dates: str, max_stops: Optional[int] = None,
+                      max_price: Optional[float] = None, limit: int = 5) -> Optional[str]:
+        """Compact outbound and return fare tables, or None when there is no matching data"""
+        window = parse_date_window(trip_dates)
+        if window is None or self.fares is None:
+            return None
+        outbound = self.search_flights(origin, destination, window[0], window[0], max_price, max_stops, limit=limit)
+        inbound = self.search_flights(destination, origin, window[1], window[1], max_price, max_stops, limit=limit)
+        if not outbound and not inbound:
+            return None
+        lines = []
+        for title, fares in ((f"Outbound {origin} → {destination}", outbound),
+                             (f"Return {destination} → {origin}", inbound)):
+            lines.append(f"{title} (fares per person, USD):")
+            lines.append(f"{'date':<11} {'route':<8} {'airline':<20} {'stops':>5} {'time':>6} {'departs':>8} {'price':>7}")
+            for fare in fares:
+                departs = (f"{fare['depart_minute'] // 60:02d}:{fare['depart_minute'] % 60:02d}"
+                           if fare["depart_minute"] >= 0 else "-")
+                lines.append(f"{fare['date']:<11} {fare['origin'] + '-' + fare['destination']:<8} "
+                             f"{fare['airline'][:20]:<20} {fare['stops']:>5} "
+                             f"{fare['duration_minutes'] // 60:>3}h{fare['duration_minutes'] % 60:02d} "
+                             f"{departs:>8} {fare['price_usd']:>7.0f}")
+            if not fares:
+                lines.append("(no fares in the inventory)")
+        return "\n".join(lines)
+
+    def hotels_table(self, location: str, check_in_date: str, nights: int = 0, min_rating: Optional[float] = None,
+                     max_nightly: Optional[float] = None, limit: int = 6) -> Optional[str]:
+        """Compact table of hotels available for the whole stay, or None when there is no matching data"""
+        window = parse_date_window(check_in_date)
+        if window is None or self.rates is None:
+            return None
+        nights = nights or max(1, (window[1] - window[0]).days)
+        hotels = self.search_hotels(location, window[0], nights, max_nightly, min_rating, limit=limit)
+        if not hotels:
+            return None
+        lines = [f"Hotels in {hotels[0]['city']}, {nights} night(s) from {window[0]} (USD per room):",
+                 f"{'hotel':<32} {'stars':>5} {'rating':>6} {'nightly':>8} {'total':>8}"]
+        for hotel in hotels:
+            lines.append(f"{hotel['hotel'][:32]:<32} {hotel['stars']:>5} {hotel['rating']:>6.1f} "
+                         f"{hotel['nightly_usd']:>8.0f} {hotel['total_usd']:>8.0f}")
+        return "\n".join(lines)
+
+
+def _top_k(values: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k smallest values, in ascending order"""
+    if len(values) > k:
+        candidates = np.argpartition(values, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(values[candidates], kind="stable")]
+
+
+_INVENTORY: Optional[TravelInventory] = None
+_INVENTORY_LOCK = threading.Lock()
+
+
+def get_inventory() -> TravelInventory:
+    """Process-wide inventory over INVENTORY_FARES and INVENTORY_RATES"""
+    global _INVENTORY
+    with _INVENTORY_LOCK:
+        if _INVENTORY is None:
+            _INVENTORY = TravelInventory()
+        return _INVENTORY
+
+
+# ============================================================================
+# SYNTHETIC DATA
+# ============================================================================
+
+# Airport coordinates for synthetic routes (lat, lon)
+_AIRPORTS = {
+    "JFK": (40.64, -73.78), "EWR": (40.69, -74.17), "LGA": (40.78, -73.87), "LAX": (33.94, -118.41),
+    "ORD": (41.97, -87.91), "SFO": (37.62, -122.38), "BOS": (42.36, -71.01), "SEA": (47.45, -122.31),
+    "KEF": (63.99, -22.62), "CDG": (49.01, 2.55), "ORY": (48.73, 2.37), "HND": (35.55, 139.78),
+    "NRT": (35.77, 140.39), "FCO": (41.80, 12.25), "LHR": (51.47, -0.45), "LGW": (51.15, -0.19),
+}
+_AIRLINES = ("Icelandair", "PLAY", "Delta", "United", "American Airlines", "Air France", "British Airways",
+             "Lufthansa", "ITA Airways", "JAL", "ANA", "Virgin Atlantic", "KLM", "JetBlue")
+# City centres for synthetic hotels (lat, lon, price factor)
+_HOTEL_CITIES = {
+    "Reykjavik": (64.1466, -21.9426, 1.2), "Paris": (48.8566, 2.3522, 1.3), "Tokyo": (35.6812, 139.7671, 1.0),
+    "Rome": (41.9028, 12.4964, 1.1), "London": (51.5074, -0.1278, 1.4), "New York": (40.7128, -74.0060, 1.5),
+}
+_HOTEL_WORDS = (("Grand", "Harbour", "Central", "Old Town", "Riverside", "Park", "Royal", "City", "Garden",
+                 "Station", "Cathedral", "Market", "Opera", "Skyline", "Northern"),
+                ("Hotel", "Inn", "Suites", "Residence", "Guesthouse", "Lodge", "Boutique Hotel", "Apartments"))
+
+
+def _great_circle_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lon1, lat2, lon2 = map(np.radians, (a[0], a[1], b[0], b[1]))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return float(6371 * 2 * np.arcsin(np.sqrt(h)))
+
+
+def _write_dataset(path: Path, columns: Dict[str, np.ndarray]) -> Path:
+    """Write columns as CSV, or Parquet when the path ends in .parquet"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table(columns), path)
+        return path
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(list(columns))
+        writer.writerows(zip(*(values.tolist() for values in columns.values())))
+    return path
+
+
+def generate_fares(path: str, rows: int = 1_000_000, start: Optional[date] = None, days: int = 365,
+                   seed: int = 0) -> Path:
+    """Write a synthetic fare dataset (from January 1 this year): random routes between _AIRPORTS, priced by distance, stops and season"""
+    rng = np.random.default_rng(seed)
+    start = start or date(date.today().year, 1, 1)
+    codes = np.array(list(_AIRPORTS))
+    origin = rng.integers(0, len(codes), rows)
+    destination = (origin + rng.integers(1, len(codes), rows)) % len(codes)
+    distance = np.array([[_great_circle_km(_AIRPORTS[a], _AIRPORTS[b]) for b in codes] for a in codes])[
+        origin, destination]
+    stops = rng.choice([0, 1, 2], rows, p=[0.45, 0.4, 0.15])
+    day = rng.integers(0, days, rows)
+    season = 1 + 0.25 * np.sin((day_number(start) + day) / 365.25 * 2 * np.pi - 1.2)
+    price = (60 + distance * 0.085) * season * (1 - 0.12 * stops) * rng.lognormal(0, 0.25, rows)
+    duration = (distance / 780 * 60 + 35) * (1 + 0.35 * stops) + rng.integers(0, 90, rows) * (stops > 0)
+    depart = rng.integers(6 * 12, 23 * 12, rows) * 5
+    dates = (np.datetime64(start) + day.astype("timedelta64[D]")).astype(str)
+    return _write_dataset(Path(path), {
+        "origin": codes[origin], "destination": codes[destination], "date": dates,
+        "airline": np.array(_AIRLINES)[rng.integers(0, len(_AIRLINES), rows)],
+        "stops": stops, "duration_minutes": duration.astype(int), "price_usd": price.round(2),
+        "depart_time": np.char.add(np.char.add(np.char.zfill((depart // 60).astype(str), 2), ":"),
+                                   np.char.zfill((depart % 60).astype(str), 2)),
+    })
+
+
+def generate_rates(path: str, hotels_per_city: int = 460, start: Optional[date] = None, days: int = 365,
+                   seed: int = 0) -> Path:
+    """Write a synthetic nightly-rate dataset (from January 1 this year): hotels_per_city hotels per _HOTEL_CITIES city, every night"""
+    rng = np.random.default_rng(seed)
+    start = start or date(date.today().year, 1, 1)
+    cities, names, stars, rating, base, lat, lon = [], [], [], [], [], [], []
+    for city, (center_lat, center_lon, factor) in _HOTEL_CITIES.items():
+        first, second = _HOTEL_WORDS
+        for index in range(hotels_per_city):
+            cities.append(city)
+            names.append(f"{first[index % len(first)]} {second[(index // len(first)) % len(second)]}"
+                         f"{'' if index < len(first) * len(second) else f' {index // (len(first) * len(second)) + 1}'}")
+            hotel_stars = int(rng.choice([2, 3, 4, 5], p=[0.15, 0.4, 0.33, 0.12]))
+            stars.append(hotel_stars)
+            rating.append(round(float(np.clip(rng.normal(6.2 + 0.55 * hotel_stars, 0.6), 5.0, 9.8)), 1))
+            base.append(factor * (45 + 40 * hotel_stars ** 1.6) * rng.lognormal(0, 0.15))
+            lat.append(center_lat + rng.normal(0, 0.02))
+            lon.append(center_lon + rng.normal(0, 0.03))
+    hotels = len(names)
+    hotel = np.repeat(np.arange(hotels), days)
+    day = np.tile(np.arange(days), hotels)
+    absolute = day_number(start) + day
+    season = 1 + 0.3 * np.sin(absolute / 365.25 * 2 * np.pi - 1.2)
+    weekend = 1 + 0.15 * np.isin((absolute + 3) % 7, [4, 5])  # Friday and Saturday nights
+    nightly = np.array(base)[hotel] * season * weekend * rng.lognormal(0, 0.08, len(hotel))
+    return _write_dataset(Path(path), {
+        "city": np.array(cities)[hotel], "hotel": np.array(names)[hotel],
+        "date": (np.datetime64(start) + day.astype("timedelta64[D]")).astype(str),
+        "nightly_usd": nightly.round(2), "rating": np.array(rating)[hotel], "stars": np.array(stars)[hotel],
+        "lat": np.array(lat).round(5)[hotel], "lon": np.array(lon).round(5)[hotel],
+    })
@@ -0,0 +1,287 @@
+"""
+Local Travel Knowledge Store for the CrewAI Travel Planning System
+
+The research tools used to return instructions ("please research ..."), so
+the agents had to invent every fact and spent many tokens doing it. The
+knowledge store holds attractions (coordinates, opening hours, fees, visit
+times), daily cost baselines per budget tier and practical tips per
+destination. The tools answer from it with short ranked snippets, offline.
+
+Data comes from the bundled data/travel_knowledge.jsonl plus any files in
+TRAVEL_KNOWLEDGE_FILES (.jsonl, .json list or .csv with the same fields):
+
+    {"kind": "attraction", "destination": "Iceland", "city": "Reykjavik", "name": "Hallgrímskirkja",
+     "lat": 64.14, "lon": -21.93, "opens": "10:00", "closes": "17:00", "closed_days": "",
+     "fee_usd": 10, "visit_minutes": 45, "tags": "church viewpoint", "text": "..."}
+    {"kind": "cost", "destination": "Iceland", "category": "meals", "budget": 40,
+     "mid-range": 85, "luxury": 170, "text": "Per person per day ..."}
+    {"kind": "tip", "destination": "Iceland", "name": "Airport transfer", "text": "..."}
+
+The records are indexed in a SQLite database (TRAVEL_KNOWLEDGE_DB) with an
+FTS5 table ranked by BM25. Where SQLite lacks FTS5, matching falls back to
+term counts. The index is rebuilt when a data file changes.
+
+Usage:
+    python cli.py knowledge "waterfalls hiking" --destination Iceland
+
+    from travel_knowledge import get_knowledge
+    knowledge = get_knowledge()
+    print(knowledge.attractions_snippet("Iceland", "northern lights"))
+    print(knowledge.costs_snippet("Japan"))
+"""
+
+import os
+import re
+import csv
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from shared_config import Config
+from destination_resolver import get_resolver
+
+BUNDLED_FILE = Path(__file__).parent / "data" / "travel_knowledge.jsonl"
+NUMERIC_FIELDS = ("lat", "lon", "fee_usd", "visit_minutes", "budget", "mid-range", "luxury")
+BUDGET_TIERS = ("budget", "mid-range", "luxury")
+_TERM = re.compile(r"\w{2,}", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    city TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_destination ON entries (destination COLLATE NOCASE, kind);
+CREATE INDEX IF NOT EXISTS entries_city ON entries (city COLLATE NOCASE, kind);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    name, tags, text, content='entries', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+def load_records(path: Path) -> List[Dict[str, Any]]:
+    """Records from a .jsonl, .json (list) or .csv knowledge file"""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".csv":
+            records = list(csv.DictReader(f))
+        elif path.suffix == ".json":
+            records = json.load(f)
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+    for record in records:
+        for field in NUMERIC_FIELDS:
+            if record.get(field) not in (None, ""):
+                record[field] = float(record[field])
+    return records
+
+
+def knowledge_files() -> List[Path]:
+    """Bundled data file plus the files listed in TRAVEL_KNOWLEDGE_FILES"""
+    extra = [Path(item.strip()) for item in re.split(rf"[,{os.pathsep}]", Config.TRAVEL_KNOWLEDGE_FILES)
+             if item.strip()]
+    return [BUNDLED_FILE] + extra
+
+
+def _terms(text: str) -> List[str]:
+    """Lower-cased words with a plural "s" removed (FTS5 uses the Porter stemmer instead)"""
+    return [term[:-1] if len(term) > 3 and term.endswith("s") and not term.endswith("ss") else term
+            for term in (word.lower() for word in _TERM.findall(text or ""))]
+
+
+# ============================================================================
+# STORE
+# ============================================================================
+
+class TravelKnowledge:
+    """Attractions, cost baselines and tips per destination, searchable by text"""
+
+    def __init__(self, path: Optional[str] = None, files: Optional[List[Path]] = None):
+        """
+        Args:
+            path: SQLite index file (default: TRAVEL_KNOWLEDGE_DB; ":memory:" for a private index)
+            files: Data files to load (default: knowledge_files())
+        """
+        self.path = path or Config.TRAVEL_KNOWLEDGE_DB
+        self.files = [Path(file) for file in (files or knowledge_files())]
+        self.fts5 = True
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the crew's tool threads; queries take milliseconds
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._ensure_index()
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _signature(self) -> str:
+        return json.dumps([[str(file), file.stat().st_mtime_ns, file.stat().st_size]
+                           for file in self.files if file.exists()])
+
+    def _ensure_index(self) -> None:
+        """(Re)build the index when the data files differ from the ones it was built from"""
+        signature = self._signature()
+        with self._lock:
+            db = self._db
+            db.executescript(SCHEMA)
+            try:
+                db.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                self.fts5 = False
+            row = db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+            if row and row[0] == signature:
+                return
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM entries")
+                if self.fts5:
+                    db.execute("INSERT INTO entries_fts (entries_fts) VALUES ('delete-all')")
+                for file in self.files:
+                    if not file.exists():
+                        print(f"⚠️  Travel knowledge file not found: {file}")
+                        continue
+                    for record in load_records(file):
+                        self._insert(db, record)
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _insert(self, db: sqlite3.Connection, record: Dict[str, Any]) -> None:
+        values = (record.get("kind", "tip"), record.get("destination", ""), record.get("city") or "",
+                  record.get("name") or record.get("category") or "", record.get("tags") or "",
+                  record.get("text") or "")
+        cursor = db.execute("INSERT INTO entries (kind, destination, city, name, tags, text, data) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)", values + (json.dumps(record, ensure_ascii=False),))
+        if self.fts5:
+            db.execute("INSERT INTO entries_fts (rowid, name, tags, text) VALUES (?, ?, ?, ?)",
+                       (cursor.lastrowid,) + values[3:])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def destinations(self) -> List[str]:
+        """Destinations with at least one record"""
+        return [row[0] for row in self._query("SELECT DISTINCT destination FROM entries ORDER BY destination")]
+
+    def search(self, query: str = "", destination: Optional[str] = None, kinds: Optional[List[str]] = None,
+               limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Records ranked by relevance to query (BM25 over name, tags and text).
+
+        Args:
+            query: Free text; without it records come in data-file order
+            destination: Only records for this destination or city
+            kinds: Only these kinds ("attraction", "cost", "tip")
+            limit: Maximum number of records
+        """
+        where, params = [], []
+        if destination:
+            # The text as given and its canonical spelling ("reykjavík", "Japn", "the UK")
+            names = [destination.strip(), get_resolver().canonical(destination) or destination.strip()]
+            where.append("(e.destination COLLATE NOCASE IN (?, ?) OR e.city COLLATE NOCASE IN (?, ?))")
+            params += names + names
+        if kinds:
+            where.append(f"e.kind IN ({', '.join('?' * len(kinds))})")
+            params += list(kinds)
+        terms = _terms(query)
+
+        if terms and self.fts5:
+            match = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+            sql = ("SELECT e.data FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+                   f"WHERE entries_fts MATCH ? {''.join(' AND ' + clause for clause in where)} "
+                   "ORDER BY bm25(entries_fts, 5.0, 3.0, 1.0), e.id LIMIT ?")
+            rows = self._query(sql, [match] + params + [limit])
+            ranked = [json.loads(row[0]) for row in rows]
+        else:
+            sql = "SELECT e.data, e.name, e.tags, e.text FROM entries e"
+            rows = self._query(sql + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY e.id", params)
+            if terms:
+                wanted = set(terms)
+
+                def score(row) -> int:
+                    return (3 * len(wanted.intersection(_terms(row[1]))) + 2 * len(wanted.intersection(_terms(row[2])))
+                            + sum(1 for term in _terms(row[3]) if term in wanted))
+                rows = [row for row in sorted(rows, key=score, reverse=True) if score(row) > 0]
+            ranked = [json.loads(row[0]) for row in rows[:limit]]
+        return ranked
+
+    def records(self, destination: str, kind: str) -> List[Dict[str, Any]]:
+        """All records of one kind for a destination or city, in data-file order"""
+        return self.search(destination=destination, kinds=[kind], limit=10000)
+
+    # ------------------------------------------------------------------
+    # Tool answers
+    # ------------------------------------------------------------------
+
+    def attractions_snippet(self, destination: str, interests: str = "", limit: int = 8) -> Optional[str]:
+        """Ranked attraction lines for a destination, or None when it has no data"""
+        found = self.search(interests, destination, ["attraction"], limit) if interests else []
+        if len(found) < limit:
+            seen = {record["name"] for record in found}
+            found += [record for record in self.records(destination, "attraction")
+                      if record["name"] not in seen][:limit - len(found)]
+        if not found:
+            return None
+        lines = [f"Attractions in {found[0]['destination']} (local data; fees per adult in USD):"]
+        for index, record in enumerate(found, 1):
+            lines.append(f"{index}. {format_attraction(record)}")
+        tips = self.search(interests or "transport", destination, ["tip"], 2)
+        lines += [f"Tip - {tip['name']}: {tip['text']}" for tip in tips]
+        return "\n".join(lines)
+
+    def costs_snippet(self, destination: str) -> Optional[str]:
+        """Daily cost baselines per budget tier plus money tips, or None when it has no data"""
+        costs = self.records(destination, "cost")
+        if not costs:
+            return None
+        lines = [f"Daily cost baselines for {costs[0]['destination']} (USD):",
+                 f"{'category':<16}{'budget':>8}{'mid-range':>11}{'luxury':>8}  note"]
+        for record in costs:
+            lines.append(f"{record['category']:<16}{record['budget']:>8.0f}{record['mid-range']:>11.0f}"
+                         f"{record['luxury']:>8.0f}  {record.get('text', '')}")
+        fees = [record for record in self.records(destination, "attraction") if record.get("fee_usd")]
+        if fees:
+            lines.append("Entry fees: " + "; ".join(f"{record['name']} ${record['fee_usd']:.0f}" for record in fees))
+        lines += [f"Tip - {tip['name']}: {tip['text']}"
+                  for tip in self.search("money saving currency budget airport", destination, ["tip"], 3)]
+        return "\n".join(lines)
+
+
+def format_attraction(record: Dict[str, Any]) -> str:
+    """One line: name, place, hours, fee, visit time and description"""
+    hours = "open 24h" if (record.get("opens"), record.get("closes")) == ("00:00", "23:59") else \
+        f"{record.get('opens', '?')}-{record.get('closes', '?')}"
+    if record.get("closed_days"):
+        hours += f", closed {record['closed_days']}"
+    fee = f"${record['fee_usd']:.0f}" if record.get("fee_usd") else "free"
+    place = f" ({record['city']})" if record.get("city") else ""
+    return f"{record['name']}{place} - {hours}, {fee}, ~{record.get('visit_minutes', 60):.0f} min. {record.get('text', '')}"
+
+
+_KNOWLEDGE: Optional[TravelKnowledge] = None
+_KNOWLEDGE_LOCK = threading.Lock()
+
+
+def get_knowledge() -> TravelKnowledge:
+    """Process-wide knowledge store, built on first use"""
+    global _KNOWLEDGE
+    with _KNOWLEDGE_LOCK:
+        if _KNOWLEDGE is None:
+            _KNOWLEDGE = TravelKnowledge()
+        return _KNOWLEDGE
@@ -0,0 +1,407 @@
+"""
+Itinerary Route Optimizer for the CrewAI Travel Planning System
+
+The itinerary agent used to guess travel times and the order of visits
+itself. This solver does the planning offline and returns a schedule the
+agent can present as is:
+
+1. Travel times: one vectorized haversine matrix turned into minutes
+   (walking for short hops, city transport, then road speed), or a
+   caller-supplied time matrix.
+2. Days: nearby stops are merged into groups that fit one day, and the
+   groups seed one centre per day. Stops are then clustered around those
+   centres (k-means on coordinates) under a daily time budget. The stops
+   with the most to lose from a second-best day are assigned first.
+   Clusters then go to the calendar days that close the fewest of their
+   stops.
+3. Order: each day is a tour from the hotel, built by nearest neighbour
+   under opening-hour windows and improved with 2-opt. All segment
+   reversals are scored in one NumPy delta matrix, and a reversal is kept
+   only if the day stays feasible: every window is kept and the ride back
+   reaches the hotel by DAY_END.
+4. Stops that do not fit are inserted wherever they add the least travel,
+   or reported as unscheduled.
+
+A few hundred stops take milliseconds to tens of milliseconds.
+
+Usage:
+    python cli.py itinerary France --days 4 --dates "January 15-18, 2026"
+    python cli.py itinerary Japan --days 3 --attractions "Senso-ji, Skytree, Shibuya Sky, Meiji Jingu, Akihabara"
+
+    from travel_routes import itinerary_table
+    print(itinerary_table("France", 4, "January 15-18, 2026", hotel="Opera Boutique Hotel"))
+"""
+
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from travel_geo import haversine_km, plan_stops, fold_name
+from travel_inventory import get_inventory, parse_date_window
+
+DAY_START = 9 * 60           # Minutes after midnight the day's tour leaves the hotel
+DAY_END = 21 * 60            # Latest return, except for evening stops
+EVENING = 18 * 60            # Stops opening this late may run past DAY_END
+WALK_KM = 1.5                # Hops up to this distance are walked
+WALK_KMH, CITY_KMH, ROAD_KMH = 4.5, 18.0, 75.0
+CITY_KM = 20.0               # Beyond this, road speed applies
+DETOUR = 1.3                 # Street distance over straight-line distance
+TRANSFER_MINUTES = 8         # Waiting/parking overhead per ride
+SPILL_MINUTES = 30           # How much farther than its nearest day a stop may be moved for capacity
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def travel_minutes(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Door-to-door minutes between points; arguments broadcast like haversine_km"""
+    km = haversine_km(lat1, lon1, lat2, lon2) * DETOUR
+    city = np.minimum(km, CITY_KM)
+    ride = TRANSFER_MINUTES + city / CITY_KMH * 60 + np.maximum(km - CITY_KM, 0) / ROAD_KMH * 60
+    return np.where(km <= WALK_KM * DETOUR, km / WALK_KMH * 60, ride)
+
+
+def _clock(text: Optional[str], default: int) -> int:
+    """Minutes after midnight of "HH:MM" """
+    try:
+        hours, minutes = str(text).split(":")
+        return int(hours) * 60 + int(minutes)
+    except (ValueError, AttributeError):
+        return default
+
+
+def _closed_weekdays(text: str) -> List[int]:
+    return [WEEKDAYS.index(part.strip()[:3].lower()) for part in (text or "").split(",")
+            if part.strip()[:3].lower() in WEEKDAYS]
+
+
+class _Stops:
+    """Column arrays of the stops plus the hotel (last row of the time matrix)"""
+
+    def __init__(self, stops: Sequence[Dict[str, Any]], hotel: Optional[Tuple[float, float]],
+                 matrix: Optional[np.ndarray]):
+        self.records = list(stops)
+        self.lat = np.array([float(stop["lat"]) for stop in stops])
+        self.lon = np.array([float(stop["lon"]) for stop in stops])
+        self.visit = np.array([float(stop.get("visit_minutes") or 60) for stop in stops])
+        self.opens = np.array([_clock(stop.get("opens"), 0) for stop in stops], dtype=np.float64)
+        closes = np.array([_clock(stop.get("closes"), 24 * 60 - 1) for stop in stops], dtype=np.float64)
+        closes = np.where(closes <= self.opens, closes + 24 * 60, closes)  # Past midnight
+        # The visit should end by closing time; short windows (a ceremony) only bound the start
+        self.latest_start = np.maximum(self.opens, closes - self.visit)
+        self.closed = [_closed_weekdays(stop.get("closed_days", "")) for stop in stops]
+        self.hotel = hotel or (float(np.median(self.lat)), float(np.median(self.lon)))
+        self.home = len(self.records)
+        if matrix is None:
+            lat, lon = np.append(self.lat, self.hotel[0]), np.append(self.lon, self.hotel[1])
+            matrix = travel_minutes(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+        self.minutes = np.asarray(matrix, dtype=np.float64)
+
+    def simulate(self, order: Sequence[int]) -> Optional[List[Tuple[float, float, float]]]:
+        """
+        (arrival, start, travel) per stop of a day's tour, or None if a window
+        or the day end is missed. The ride back to the hotel counts toward
+        DAY_END unless the day ends with an evening stop.
+        """
+        now, previous, timeline = float(DAY_START), self.home, []
+        for stop in order:
+            travel = self.minutes[previous, stop]
+            arrival = now + travel
+            start = max(arrival, self.opens[stop])
+            if start > self.latest_start[stop]:
+                return None
+            now = start + self.visit[stop]
+            if now > DAY_END and self.opens[stop] < EVENING:
+                return None
+            timeline.append((arrival, start, travel))
+            previous = stop
+        if order and self.opens[previous] < EVENING and now + self.minutes[previous, self.home] > DAY_END:
+            return None
+        return timeline
+
+    def travel(self, order: Sequence[int]) -> float:
+        path = [self.home, *order, self.home]
+        return float(self.minutes[path[:-1], path[1:]].sum())
+
+
+# ============================================================================
+# SOLVER
+# ============================================================================
+
+def _seed_centres(stops: _Stops, points: np.ndarray, scale: float, load: np.ndarray, days: int,
+                  capacity: float) -> np.ndarray:
+    """
+    Centres of up to `days` groups of nearby stops, the heaviest groups first.
+
+    Deterministic average-linkage clustering on travel minutes: the two
+    closest groups merge while their loads plus the round trip from the
+    hotel to their centre still fit one day.
+    """
+    count = len(load)
+    minutes = stops.minutes[:count, :count]
+    linkage = (minutes + minutes.T) / 2
+    np.fill_diagonal(linkage, np.inf)
+    size, total, sums = np.ones(count), load.astype(np.float64), points.copy()
+    active = np.ones(count, dtype=bool)
+
+    def fits(group: int) -> np.ndarray:
+        """Whether group and each other group fit one day together"""
+        centre = (sums[group] + sums) / (size[group] + size)[:, None]
+        trip = 2 * travel_minutes(*stops.hotel, centre[:, 0], centre[:, 1] / scale)
+        return active & (total[group] + total + trip <= capacity)
+
+    distance = np.full((count, count), np.inf)
+    for group in range(count):
+        distance[group] = np.where(fits(group), linkage[group], np.inf)
+    np.fill_diagonal(distance, np.inf)
+    for _ in range(count - days):
+        a, b = divmod(int(np.argmin(distance)), count)
+        if not np.isfinite(distance[a, b]):
+            break
+        linkage[a] = linkage[:, a] = (size[a] * linkage[a] + size[b] * linkage[b]) / (size[a] + size[b])
+        size[a], total[a], sums[a] = size[a] + size[b], total[a] + total[b], sums[a] + sums[b]
+        active[b] = False
+        linkage[b] = linkage[:, b] = np.inf
+        linkage[a, a] = np.inf
+        distance[a] = distance[:, a] = np.where(fits(a), linkage[a], np.inf)
+        distance[b] = distance[:, b] = np.inf
+        distance[a, a] = np.inf
+    groups = np.flatnonzero(active)
+    groups = groups[np.argsort(-total[groups], kind="stable")][:days]
+    return sums[groups] / size[groups][:, None]
+
+
+def _partition(stops: _Stops, days: int, capacity: float, iterations: int = 12) -> List[List[int]]:
+    """
+    Capacity-limited k-means over the stops' coordinates, one cluster per day,
+    seeded with groups of nearby stops (_seed_centres).
+
+    A day's budget first pays the round trip from the hotel to its centre. A
+    stop that does not fit its nearest day only moves to a day whose centre
+    is at most SPILL_MINUTES farther away; otherwise it is left over for
+    least-travel insertion. The last list holds the left-over stops.
+    """
+    count = len(stops.records)
+    scale = np.cos(np.radians(np.mean(stops.lat)))
+    points = np.column_stack([stops.lat, stops.lon * scale])
+    hotel = np.array([stops.hotel[0], stops.hotel[1] * scale])
+    # A stop's load: its visit plus the time to reach it from its nearest neighbour
+    near = np.where(np.eye(count, dtype=bool), np.inf, stops.minutes[:count, :count]).min(axis=1) if count > 1 \
+        else np.zeros(count)
+    load = stops.visit + np.minimum(near, stops.minutes[stops.home, :count])
+    centres = _seed_centres(stops, points, scale, load, days, capacity)
+    while len(centres) < days:
+        centres = np.vstack([centres, hotel])
+
+    assignment = np.full(count, -1)
+    for _ in range(iterations):
+        centre_lat, centre_lon = centres[:, 0], centres[:, 1] / scale
+        distance = travel_minutes(stops.lat[:, None], stops.lon[:, None], centre_lat[None, :], centre_lon[None, :])
+        used = 2 * travel_minutes(*stops.hotel, centre_lat, centre_lon)
+        ranked = np.sort(distance, axis=1)
+        regret = ranked[:, 1] - ranked[:, 0] if days > 1 else np.zeros(count)
+        new_assignment = np.full(count, -1)
+        for stop in np.argsort(-regret, kind="stable"):
+            for day in np.argsort(distance[stop], kind="stable"):
+                if distance[stop, day] > ranked[stop, 0] + SPILL_MINUTES:
+                    break
+                if used[day] + load[stop] <= capacity:
+                    new_assignment[stop], used[day] = day, used[day] + load[stop]
+                    break
+        if np.array_equal(new_assignment, assignment):
+            break
+        assignment = new_assignment
+        for day in range(days):
+            members = assignment == day
+            if members.any():
+                centres[day] = points[members].mean(axis=0)
+    return [list(np.flatnonzero(assignment == day)) for day in range(days)] + [list(np.flatnonzero(assignment < 0))]
+
+
+def _assign_dates(stops: _Stops, clusters: List[List[int]], weekdays: List[Optional[int]]) -> List[List[int]]:
+    """Reorder clusters over the calendar so the fewest stops fall on their closing day"""
+    if all(weekday is None for weekday in weekdays):
+        return clusters
+    cost = np.array([[sum(stops.visit[stop] for stop in cluster if weekday in stops.closed[stop])
+                      for weekday in weekdays] for cluster in clusters])
+    ordered: List[Optional[List[int]]] = [None] * len(weekdays)
+    for cluster in np.argsort(-cost.max(axis=1), kind="stable"):
+        free = [day for day in range(len(weekdays)) if ordered[day] is None]
+        ordered[min(free, key=lambda day: cost[cluster, day])] = clusters[cluster]
+    return ordered
+
+
+def _route_day(stops: _Stops, members: List[int]) -> Tuple[List[int], List[int]]:
+    """Nearest-neighbour tour under time windows, improved by 2-opt; returns (order, stops left out)"""
+    order, now, previous = [], float(DAY_START), stops.home
+    remaining = list(members)
+    while remaining:
+        candidates = np.array(remaining)
+        arrival = now + stops.minutes[previous, candidates]
+        start = np.maximum(arrival, stops.opens[candidates])
+        finish = start + stops.visit[candidates]
+        back = stops.minutes[candidates, stops.home]
+        feasible = (start <= stops.latest_start[candidates]) & \
+                   ((finish + back <= DAY_END) | (stops.opens[candidates] >= EVENING))
+        if not feasible.any():
+            break
+        # Least travel plus waiting; the stop closing soonest wins ties
+        score = np.where(feasible, start - now + stops.latest_start[candidates] * 1e-6, np.inf)
+        chosen = int(candidates[np.argmin(score)])
+        order.append(chosen)
+        remaining.remove(chosen)
+        now = float(finish[np.argmin(score)])
+        previous = chosen
+    return _two_opt(stops, order), remaining
+
+
+def _two_opt(stops: _Stops, order: List[int], rounds: int = 50) -> List[int]:
+    """Reverse segments while it shortens the tour and keeps every window"""
+    if len(order) < 3:
+        return order
+    for _ in range(rounds):
+        path = np.array([stops.home, *order, stops.home])
+        size = len(path)
+        i, j = np.triu_indices(size - 1, k=1)
+        valid = (i >= 1) & (j <= size - 2)
+        i, j = i[valid], j[valid]
+        delta = (stops.minutes[path[i - 1], path[j]] + stops.minutes[path[i], path[j + 1]]
+                 - stops.minutes[path[i - 1], path[i]] - stops.minutes[path[j], path[j + 1]])
+        improved = False
+        for candidate in np.argsort(delta, kind="stable"):
+            if delta[candidate] >= -1e-6:
+                break
+            a, b = i[candidate] - 1, j[candidate] - 1  # Positions in order
+            trial = order[:a] + order[a:b + 1][::-1] + order[b + 1:]
+            if stops.simulate(trial) is not None:
+                order, improved = trial, True
+                break
+        if not improved:
+            break
+    return order
+
+
+def _insert(stops: _Stops, days: List[List[int]], stop: int) -> bool:
+    """Insert a left-over stop where it adds the least travel and keeps its day feasible"""
+    candidates = []
+    for day, order in enumerate(days):
+        path = np.array([stops.home, *order, stops.home])
+        added = stops.minutes[path[:-1], stop] + stops.minutes[stop, path[1:]] - stops.minutes[path[:-1], path[1:]]
+        # Without evening stops a day cannot hold more than DAY_END - DAY_START of travel (the ride
+        # back to the hotel included) and visits; simulate() then checks the windows and the day end
+        if stops.opens[stop] < EVENING and not any(stops.opens[other] >= EVENING for other in order):
+            busy = stops.travel(order) + stops.visit[order].sum() + stops.visit[stop]
+            added = np.where(busy + added <= DAY_END - DAY_START, added, np.inf)
+        candidates += [(cost, day, position) for position, cost in enumerate(added) if cost < np.inf]
+    for _, day, position in sorted(candidates):
+        trial = days[day][:position] + [stop] + days[day][position:]
+        if stops.simulate(trial) is not None:
+            days[day] = trial
+            return True
+    return False
+
+
+def plan_itinerary(stops: Sequence[Dict[str, Any]], days: int, start: Optional[date] = None,
+                   hotel: Optional[Tuple[float, float]] = None,
+                   matrix: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """
+    Partition stops into days and order each day.
+
+    Args:
+        stops: Dicts with name, lat, lon and optionally visit_minutes, opens,
+            closes ("HH:MM") and closed_days ("Mon,Fri")
+        days: Days to plan
+        start: Date of the first day (needed for closed days)
+        hotel: (lat, lon) each day starts and ends at (default: the stops' median point)
+        matrix: Travel minutes between the stops, with the hotel as the last row and column
+
+    Returns:
+        Dict with "days" (per day: date, stops with arrive/start/end minutes
+        and travel minutes, travel and visit totals) and "unscheduled" stop names
+    """
+    days = max(1, int(days))
+    if not stops:
+        return {"days": [], "unscheduled": []}
+    table = _Stops(stops, hotel, matrix)
+    clusters = _partition(table, days, capacity=float(DAY_END - DAY_START))
+    leftover = clusters.pop()
+    weekdays = [((start + timedelta(days=day)).weekday() if start else None) for day in range(days)]
+    clusters = _assign_dates(table, clusters, weekdays)
+
+    routes = []
+    for day, members in enumerate(clusters):
+        open_members = [stop for stop in members if weekdays[day] not in table.closed[stop]]
+        leftover += [stop for stop in members if stop not in open_members]
+        order, dropped = _route_day(table, open_members)
+        routes.append(order)
+        leftover += dropped
+    unscheduled = []
+    for stop in sorted(leftover, key=lambda stop: -table.visit[stop]):
+        # Each day's own closures still apply when a stop moves there
+        allowed = [route if weekdays[day] not in table.closed[stop] else None for day, route in enumerate(routes)]
+        candidates = [(day, route) for day, route in enumerate(allowed) if route is not None]
+        trial_days = [route for _, route in candidates]
+        if trial_days and _insert(table, trial_days, stop):
+            for (day, _), route in zip(candidates, trial_days):
+                routes[day] = route
+        else:
+            unscheduled.append(table.records[stop]["name"])
+
+    planned = []
+    for day, order in enumerate(routes):
+        timeline = table.simulate(order) or []
+        entries = [{"name": table.records[stop]["name"], "arrive": arrive, "start": begin,
+                    "end": begin + table.visit[stop], "travel": travel}
+                   for stop, (arrive, begin, travel) in zip(order, timeline)]
+        back = float(table.minutes[order[-1], table.home]) if order else 0.0
+        planned.append({"day": day + 1, "date": start + timedelta(days=day) if start else None, "stops": entries,
+                        "travel_minutes": sum(entry["travel"] for entry in entries) + back,
+                        "visit_minutes": float(sum(table.visit[stop] for stop in order))})
+    return {"days": planned, "unscheduled": unscheduled}
+
+
+def _hhmm(minutes: float) -> str:
+    minutes = int(round(minutes)) % (24 * 60)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_itinerary(plan: Dict[str, Any]) -> str:
+    """Compact day-by-day schedule"""
+    lines = []
+    for day in plan["days"]:
+        when = f" ({day['date']:%a %Y-%m-%d})" if day["date"] else ""
+        lines.append(f"Day {day['day']}{when}: {len(day['stops'])} stop(s), "
+                     f"{day['visit_minutes'] / 60:.1f} h visiting, {day['travel_minutes']:.0f} min travel")
+        for entry in day["stops"]:
+            wait = f", wait {entry['start'] - entry['arrive']:.0f} min" if entry["start"] - entry["arrive"] >= 5 else ""
+            lines.append(f"  {_hhmm(entry['start'])}-{_hhmm(entry['end'])}  {entry['name']} "
+                         f"({entry['travel']:.0f} min there{wait})")
+        if not day["stops"]:
+            lines.append("  Free day")
+    if plan["unscheduled"]:
+        lines.append(f"Did not fit: {', '.join(plan['unscheduled'])}")
+    return "\n".join(lines)
+
+
+def itinerary_table(destination: str, days: int, trip_dates: str = "", attractions: str = "",
+                    hotel: str = "") -> Optional[str]:
+    """
+    Schedule for the destination's attractions (or the named ones, comma-separated),
+    or None when none of them have coordinates.
+
+    hotel is a hotel name from the rate inventory; each day starts and ends there
+    (default: the middle of the city's hotels, else of the stops).
+    """
+    stops = [stop for day in plan_stops(destination, attractions.replace(";", ",")) for stop in day]
+    if not stops:
+        return None
+    window = parse_date_window(trip_dates) if trip_dates else None
+    located = None
+    points = get_inventory().hotel_points(destination)
+    if points is not None:
+        # The named hotel, else the middle of the city's hotels
+        matches = [index for index, name in enumerate(points["name"])
+                   if hotel and fold_name(hotel) in fold_name(str(name))]
+        located = ((float(points["lat"][matches[0]]), float(points["lon"][matches[0]])) if matches else
+                   (float(np.median(points["lat"])), float(np.median(points["lon"]))))
+    plan = plan_itinerary(stops, days, window[0] if window else None, located)
+    return format_itinerary(plan)
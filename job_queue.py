@@ -0,0 +1,390 @@
+"""
+Durable Lease-Based Job Queue for AutoGen and CrewAI Lab Demo
+
+Lets several worker processes, on one machine or many, work through the same
+backlog of interview and travel jobs. Jobs live in a SQLite database
+(QUEUE_DB, which can sit on shared storage). A worker claims a job with a
+time-limited lease and renews it with heartbeats while crew.kickoff or
+execute_workflow runs. If the worker dies, the lease expires and the job goes
+back on the queue for another worker, up to QUEUE_MAX_ATTEMPTS attempts.
+
+Other backends can implement the JobQueue interface; SQLiteJobQueue is the
+local (and shared-file) implementation. With QUEUE_SCHEDULER=sjf (the default)
+workers claim the job with the shortest predicted run time first (see
+job_scheduler.py); QUEUE_SCHEDULER=fifo claims in arrival order.
+
+Usage:
+    python cli.py enqueue travel destination=France trip_duration="7 days"
+    python cli.py enqueue --file overnight_jobs.jsonl      # one {"kind", "params"} per line
+    python cli.py work                                     # run jobs until interrupted
+    python cli.py work --drain                             # stop when the backlog is empty
+    python cli.py queue-status                             # backlog depth and throughput
+
+    from job_queue import SQLiteJobQueue, QueueWorker
+    queue = SQLiteJobQueue()
+    queue.enqueue("travel", {"destination": "Japan"})
+    QueueWorker(queue).run(drain=True)
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional
+
+from shared_config import Config
+
+
+# ============================================================================
+# QUEUE INTERFACE
+# ============================================================================
+
+class JobQueue:
+    """Operations a durable job queue backend provides"""
+
+    def enqueue(self, kind: str, params: Optional[Dict[str, Any]] = None,
+                max_attempts: Optional[int] = None) -> str:
+        """Add a job and return its id"""
+        raise NotImplementedError
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """Lease the next queued job to worker_id, or return None if there is none"""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a lease; False means the worker no longer holds it"""
+        raise NotImplementedError
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        """Mark a leased job done"""
+        raise NotImplementedError
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        """Release a leased job after an error, re-queueing it if attempts remain"""
+        raise NotImplementedError
+
+    def stats(self, window_seconds: float = 3600) -> Dict[str, Any]:
+        """Backlog depth, leases and recent throughput"""
+        raise NotImplementedError
+
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id        TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    params        TEXT NOT NULL,
+    status        TEXT NOT NULL,          -- queued, leased, done, failed
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    enqueued      REAL NOT NULL,
+    started       REAL,
+    finished      REAL,
+    result        TEXT,
+    error         TEXT,
+    predicted     REAL                    -- scheduler's run time estimate at enqueue (seconds)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, enqueued);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """JobQueue stored in one SQLite file; safe for many processes and threads"""
+
+    def __init__(self, path: Optional[str] = None, max_attempts: Optional[int] = None, scheduler=None):
+        """
+        Args:
+            path: Database file (default: QUEUE_DB)
+            max_attempts: Default attempts per job before it is failed (default: QUEUE_MAX_ATTEMPTS)
+            scheduler: Picks the next job from the queued ones, e.g. job_scheduler.ShortestJobFirst
+                (default: per QUEUE_SCHEDULER; None with "fifo" claims in arrival order)
+        """
+        self.path = path or Config.QUEUE_DB
+        self.max_attempts = max_attempts or Config.QUEUE_MAX_ATTEMPTS
+        if scheduler is None and Config.QUEUE_SCHEDULER == "sjf":
+            from job_scheduler import ShortestJobFirst
+            scheduler = ShortestJobFirst()
+        self.scheduler = scheduler
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+            columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "predicted" not in columns:
+                # Queue files created before predictions were stored at enqueue
+                try:
+                    db.execute("ALTER TABLE jobs ADD COLUMN predicted REAL")
+                except sqlite3.OperationalError:
+                    pass  # Another process added it first
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps the queue usable from
+        # any thread; BEGIN IMMEDIATE serializes writers across processes
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        return db
+
+    def _write(self, sql: str, args=()) -> int:
+        db = self._connect()
+        try:
+            return db.execute(sql, args).rowcount
+        finally:
+            db.close()
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(self, kind: str, params: Optional[Dict[str, Any]] = None,
+                max_attempts: Optional[int] = None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        # Predict once here so claims, which hold the write lock, only add aging
+        predicted = self.scheduler.predictor.predict(kind, params) if self.scheduler is not None else None
+        self._write(
+            "INSERT INTO jobs (job_id, kind, params, status, max_attempts, enqueued, predicted) "
+            "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, kind, json.dumps(params or {}), max_attempts or self.max_attempts, time.time(), predicted),
+        )
+        return job_id
+
+    def requeue_expired(self, db: Optional[sqlite3.Connection] = None) -> int:
+        """Return jobs whose lease ran out to the queue (or fail them when out of attempts)"""
+        own = db is None
+        db = db or self._connect()
+        try:
+            now = time.time()
+            db.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, lease_owner = NULL, "
+                "error = 'lease expired after final attempt' "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            return db.execute(
+                "UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_expires = NULL "
+                "WHERE status = 'leased' AND lease_expires < ?",
+                (now,),
+            ).rowcount
+        finally:
+            if own:
+                db.close()
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            self.requeue_expired(db)
+            if self.scheduler is None:
+                row = db.execute(
+                    "SELECT job_id FROM jobs WHERE status = 'queued' ORDER BY enqueued LIMIT 1"
+                ).fetchone()
+            else:
+                row = self.scheduler.pick(self._queued(db))
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            now = time.time()
+            db.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, started = ? WHERE job_id = ?",
+                (worker_id, now + lease_seconds, now, row["job_id"]),
+            )
+            job = db.execute("SELECT * FROM jobs WHERE job_id = ?", (row["job_id"],)).fetchone()
+            db.execute("COMMIT")
+            return self._row_to_job(job)
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def _queued(self, db: sqlite3.Connection) -> List[Dict[str, Any]]:
+        jobs = []
+        for row in db.execute("SELECT job_id, kind, enqueued, predicted FROM jobs WHERE status = 'queued'"):
+            job = dict(row)
+            if job["predicted"] is None:
+                # Enqueued without a scheduler (or before the column existed): predict from params
+                params = db.execute("SELECT params FROM jobs WHERE job_id = ?", (job["job_id"],)).fetchone()
+                job["predicted"] = self.scheduler.predictor.predict(job["kind"], json.loads(params["params"]))
+            jobs.append(job)
+        return jobs
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        return self._write(
+            "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time() + lease_seconds, job_id, worker_id),
+        ) == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]) -> bool:
+        return self._write(
+            "UPDATE jobs SET status = 'done', finished = ?, lease_owner = NULL, result = ? "
+            "WHERE job_id = ? AND lease_owner = ? AND status = 'leased'",
+            (time.time(), json.dumps(result, default=str), job_id, worker_id),
+        ) == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry: bool = True) -> bool:
+        return self._write(
+            "UPDATE jobs SET status = CASE WHEN ? AND attempts < max_attempts THEN 'queued' ELSE 'failed' END, "
+            "finished = CASE WHEN ? AND attempts < max_attempts THEN NULL ELSE ? END, "
+            "lease_owner = NULL, lease_expires = NULL, error = ? "
+            "WHERE job_id = ? AND lease_owner = ? AND status = 'leased'",
+            (retry, retry, time.time(), error, job_id, worker_id),
+        ) == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """One job with its params and result"""
+        db = self._connect()
+        try:
+            row = db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return self._row_to_job(row) if row else None
+        finally:
+            db.close()
+
+    def stats(self, window_seconds: float = 3600) -> Dict[str, Any]:
+        db = self._connect()
+        try:
+            now = time.time()
+            counts = {"queued": 0, "leased": 0, "done": 0, "failed": 0}
+            for row in db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+            recent = db.execute(
+                "SELECT COUNT(*) AS n, AVG(finished - started) AS seconds FROM jobs "
+                "WHERE status = 'done' AND finished >= ?",
+                (now - window_seconds,),
+            ).fetchone()
+            oldest = db.execute("SELECT MIN(enqueued) AS t FROM jobs WHERE status = 'queued'").fetchone()["t"]
+            workers = db.execute(
+                "SELECT COUNT(DISTINCT lease_owner) AS n FROM jobs WHERE status = 'leased' AND lease_expires >= ?",
+                (now,),
+            ).fetchone()["n"]
+            predicted = None
+            if self.scheduler is not None:
+                predicted = sum(job["predicted"] for job in self._queued(db))
+        finally:
+            db.close()
+
+        throughput = recent["n"] / window_seconds * 3600
+        return {
+            **counts,
+            "backlog": counts["queued"] + counts["leased"],
+            "active_workers": workers,
+            "done_per_hour": round(throughput, 2),
+            "average_job_seconds": round(recent["seconds"], 1) if recent["seconds"] else None,
+            "oldest_queued_seconds": round(now - oldest, 1) if oldest else None,
+            "predicted_queued_seconds": round(predicted, 1) if predicted is not None else None,
+            # Hours to clear the backlog at the recent rate (None without recent completions)
+            "drain_hours": round((counts["queued"] + counts["leased"]) / throughput, 2) if throughput else None,
+        }
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+class QueueWorker:
+    """Claims jobs from a queue and runs them on a warm JobRunner, heartbeating its lease"""
+
+    def __init__(self, queue: JobQueue, runner=None, worker_id: Optional[str] = None,
+                 lease_seconds: Optional[float] = None):
+        """
+        Args:
+            queue: Queue to take jobs from
+            runner: JobRunner to run jobs on (default: a new one)
+            worker_id: Name recorded as lease owner (default: host:pid:random)
+            lease_seconds: Lease length; renewed every third of it (default: QUEUE_LEASE_SECONDS)
+        """
+        if runner is None:
+            from job_runner import JobRunner
+            runner = JobRunner()
+        self.queue = queue
+        self.runner = runner
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds or Config.QUEUE_LEASE_SECONDS
+        self.stop_event = threading.Event()
+        self.jobs_run = 0
+
+    def _heartbeat(self, job_id: str, run_context, finished: threading.Event) -> None:
+        while not finished.wait(self.lease_seconds / 3):
+            try:
+                held = self.queue.heartbeat(job_id, self.worker_id, self.lease_seconds)
+            except sqlite3.Error as e:
+                print(f"⚠️  Heartbeat for job {job_id} failed: {e}")
+                continue
+            if not held:
+                # Another worker now owns the job; stop working on it
+                run_context.cancel("lease lost")
+                return
+
+    def run_one(self) -> bool:
+        """Claim and run one job; returns False if the queue was empty"""
+        from run_context import RunContext
+
+        job = self.queue.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+
+        print(f"▶ {self.worker_id} running {job['kind']} job {job['job_id']} (attempt {job['attempts']})")
+        # Queued work is batch work: it only uses LLM capacity left over by interactive runs
+        params = dict(job["params"])
+        run_context = RunContext(tenant=params.pop("tenant", None), priority="batch")
+        finished = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["job_id"], run_context, finished),
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            result = self.runner.run(job["kind"], params, run_context)
+        except Exception as e:
+            finished.set()
+            self.queue.fail(job["job_id"], self.worker_id, str(e))
+            print(f"❌ Job {job['job_id']} failed: {e}")
+        else:
+            finished.set()
+            if result["cancelled"]:
+                self.queue.fail(job["job_id"], self.worker_id, run_context.cancel_reason or "cancelled")
+            else:
+                self.queue.complete(job["job_id"], self.worker_id, result)
+                scheduler = getattr(self.queue, "scheduler", None)
+                if scheduler is not None:
+                    scheduler.observe(job, result["elapsed"])
+                print(f"✓ Job {job['job_id']} done in {result['elapsed']:.1f}s")
+        heartbeat.join()
+        self.jobs_run += 1
+        return True
+
+    def run(self, drain: bool = False, poll_interval: Optional[float] = None,
+            max_jobs: Optional[int] = None) -> int:
+        """
+        Run jobs until stopped.
+
+        Args:
+            drain: Return once the queue is empty instead of polling for more
+            poll_interval: Seconds between claims while the queue is empty (default: QUEUE_POLL_INTERVAL)
+            max_jobs: Return after this many jobs
+
+        Returns:
+            int: Number of jobs run
+        """
+        poll_interval = poll_interval or Config.QUEUE_POLL_INTERVAL
+        while not self.stop_event.is_set():
+            if max_jobs is not None and self.jobs_run >= max_jobs:
+                break
+            if not self.run_one():
+                if drain:
+                    break
+                self.stop_event.wait(poll_interval)
+        return self.jobs_run
+
+
+def load_jobs_file(path: str) -> List[Dict[str, Any]]:
+    """Read {"kind", "params"} job definitions from a JSON-lines file"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
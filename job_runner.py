@@ -0,0 +1,248 @@
+"""
+Warm Workflow Job Runner for AutoGen and CrewAI Lab Demo
+
+Runs interview and travel workflow jobs inside a long-lived process. The first
+use of each job kind imports its framework, builds its agents (kept in the
+agent pools) and creates its clients; later jobs of the same kind reuse all of
+that, so per-job overhead is only the LLM calls themselves.
+
+Job kinds:
+- "interview":         Full AutoGen interview platform workflow
+- "interview-simple":  Simplified interview workflow on the routed OpenAI client
+- "interview-native":  Interview workflow specs run by the framework-free native engine
+- "travel":            CrewAI travel planning crew (params mirror crewai_demo.main)
+
+Usage:
+    from job_runner import JobRunner
+
+    runner = JobRunner()
+    runner.warm_up()
+    result = runner.run("travel", {"destination": "France", "trip_duration": "7 days"})
+    print(result["outputs"])
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from shared_config import Config, ProviderConfig
+from run_context import RunContext, RunCancelled
+
+PROJECT_ROOT = Path(__file__).parent
+
+JOB_KINDS = ("interview", "interview-simple", "interview-native", "travel")
+
+# Provider settings a job may override; endpoints, api_base and api_key stay server-side
+JOB_PROVIDER_FIELDS = {"model": str, "small_model": str, "temperature": float, "max_tokens": int}
+
+# Defaults for travel jobs, matching crewai_demo.main
+TRAVEL_DEFAULTS = {
+    "destination": "Iceland",
+    "trip_duration": "5 days",
+    "trip_dates": "January 15-20, 2026",
+    "departure_city": "New York",
+    "travelers": 2,
+    "budget_preference": "mid-range",
+}
+
+
+def job_provider_overrides(overrides: Any) -> Dict[str, Any]:
+    """
+    Validated per-job provider overrides (JOB_PROVIDER_FIELDS only).
+
+    Raises:
+        ValueError: If overrides is not a mapping, names another setting or has a bad value
+    """
+    if not overrides:
+        return {}
+    if not isinstance(overrides, dict):
+        raise ValueError(f"provider must be an object, got {type(overrides).__name__}")
+    refused = sorted(set(overrides) - set(JOB_PROVIDER_FIELDS))
+    if refused:
+        raise ValueError(f"provider settings not allowed per job: {', '.join(refused)} "
+                         f"(allowed: {', '.join(JOB_PROVIDER_FIELDS)})")
+    checked = {}
+    for name, value in overrides.items():
+        try:
+            checked[name] = JOB_PROVIDER_FIELDS[name](value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid provider {name}: {value!r}") from None
+    return checked
+
+
+class JobRunner:
+    """Keeps frameworks imported and agents/clients built between jobs"""
+
+    def __init__(self):
+        self._warm_lock = threading.Lock()
+        self._provider = ProviderConfig.from_env()
+        self._interview_platform = None
+        self._simple_demo = None
+        self._native_engine = None
+        self._planner = None
+        self._crewai_demo = None
+
+    # ------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------
+
+    def warm_up(self, kinds=JOB_KINDS) -> Dict[str, float]:
+        """
+        Import frameworks and build agents/clients ahead of the first job.
+
+        Returns:
+            Dict[str, float]: Seconds spent warming each job kind
+        """
+        timings = {}
+        for kind in kinds:
+            started = time.perf_counter()
+            self._ensure_warm(kind)
+            timings[kind] = time.perf_counter() - started
+        return timings
+
+    def _ensure_warm(self, kind: str) -> None:
+        with self._warm_lock:
+            if kind.startswith("interview"):
+                autogen_dir = str(PROJECT_ROOT / "autogen")
+                if autogen_dir not in sys.path:
+                    sys.path.insert(0, autogen_dir)
+                if kind != "interview" and self._planner is None:
+                    from token_planner import TokenPlanner
+                    self._router_for(self._provider)
+                    self._planner = TokenPlanner()
+            if kind == "interview" and self._interview_platform is None:
+                import autogen_interview_platform
+                self._interview_platform = autogen_interview_platform
+                autogen_interview_platform.INTERVIEW_AGENT_POOL.warm(
+                    autogen_interview_platform.agent_pool_key(self._provider), provider=self._provider
+                )
+            elif kind == "interview-simple" and self._simple_demo is None:
+                import autogen_simple_demo
+                self._simple_demo = autogen_simple_demo
+            elif kind == "interview-native" and self._native_engine is None:
+                import native_engine
+                self._native_engine = native_engine
+            elif kind == "travel" and self._crewai_demo is None:
+                crewai_dir = str(PROJECT_ROOT / "crewai")
+                if crewai_dir not in sys.path:
+                    sys.path.insert(0, crewai_dir)
+                import crewai_demo
+                crewai_demo.TRAVEL_CREW_POOL.warm(crewai_demo.travel_crew_pool_key(Config.DEBUG, self._provider),
+                                                  verbose=Config.DEBUG, provider=self._provider)
+                self._crewai_demo = crewai_demo
+
+    def _router_for(self, provider: ProviderConfig):
+        """Shared router for a provider's endpoints (a bounded LRU, see llm_router.get_router)"""
+        from llm_router import get_router
+
+        return get_router(provider)
+
+    # ------------------------------------------------------------------
+    # Running jobs
+    # ------------------------------------------------------------------
+
+    def run(self, kind: str, params: Optional[Dict[str, Any]] = None,
+            run_context: Optional[RunContext] = None) -> Dict[str, Any]:
+        """
+        Run one job and return its outputs.
+
+        Args:
+            kind: One of JOB_KINDS
+            params: Job parameters (travel jobs accept the crewai_demo.main arguments).
+                An optional "provider" dict overrides JOB_PROVIDER_FIELDS for
+                this job only, e.g. {"model": "gpt-4o-mini"}
+            run_context: Optional deadline/cancellation; its on_output callback
+                receives each phase or task output as soon as it is ready
+
+        Returns:
+            Dict[str, Any]: {"kind", "outputs", "files", "cancelled", "elapsed"}
+
+        Raises:
+            ValueError: If kind is unknown or the provider overrides are not allowed
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind} (expected one of {', '.join(JOB_KINDS)})")
+        params = dict(params or {})
+        provider = self._provider.override(**job_provider_overrides(params.pop("provider", None)))
+        run_context = run_context or RunContext()
+        self._ensure_warm(kind)
+
+        started = time.perf_counter()
+        files = []
+        try:
+            if kind == "interview":
+                outputs, files = self._run_interview(run_context, provider)
+            elif kind == "interview-simple":
+                outputs = self._run_interview_simple(run_context, provider)
+            elif kind == "interview-native":
+                outputs, files = self._run_interview_native(run_context, provider)
+            else:
+                outputs, files = self._run_travel(params, run_context, provider)
+        finally:
+            run_context.close()
+
+        return {
+            "kind": kind,
+            "outputs": outputs,
+            "files": [str(path) for path in files],
+            "cancelled": run_context.cancelled,
+            "elapsed": time.perf_counter() - started,
+        }
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Agent pool statistics (builds, reuses, build time saved) per warm job kind"""
+        stats = {}
+        if self._interview_platform is not None:
+            stats["interview"] = self._interview_platform.INTERVIEW_AGENT_POOL.stats()
+        if self._crewai_demo is not None:
+            stats["travel"] = self._crewai_demo.TRAVEL_CREW_POOL.stats()
+        return stats
+
+    def _run_interview(self, run_context: RunContext, provider: ProviderConfig):
+        platform = self._interview_platform
+        pool = platform.INTERVIEW_AGENT_POOL
+        with pool.acquire(platform.agent_pool_key(provider), provider=provider) as agents_manager:
+            workflow = platform.InterviewPlatformWorkflow(agents_manager, run_context)
+            outputs = workflow.execute_workflow()
+            if run_context.cancelled:
+                pool.discard(agents_manager)
+                return outputs, []
+        output_manager = platform.OutputManager(provider=provider)
+        return outputs, [output_manager.save_outputs(outputs), output_manager.create_summary(outputs)]
+
+    def _run_interview_simple(self, run_context: RunContext, provider: ProviderConfig):
+        workflow = self._simple_demo.SimpleInterviewPlatformWorkflow(run_context=run_context,
+                                                                     router=self._router_for(provider),
+                                                                     planner=self._planner,
+                                                                     provider=provider)
+        return workflow.run()
+
+    def _run_interview_native(self, run_context: RunContext, provider: ProviderConfig):
+        engine = self._native_engine.NativeWorkflowEngine(router=self._router_for(provider),
+                                                          run_context=run_context,
+                                                          planner=self._planner, provider=provider)
+        outputs = engine.run()
+        if run_context.cancelled:
+            return outputs, []
+        output_manager = self._native_engine.OutputManager(workflow="interview-native", provider=provider)
+        return outputs, [output_manager.save_outputs(outputs), output_manager.create_summary(outputs)]
+
+    def _run_travel(self, params: Dict[str, Any], run_context: RunContext, provider: ProviderConfig):
+        demo = self._crewai_demo
+        trip = {key: params.get(key, default) for key, default in TRAVEL_DEFAULTS.items()}
+        trip["travelers"] = int(trip["travelers"])
+        key = demo.travel_crew_pool_key(Config.DEBUG, provider)
+        run_context.label("travel", trip["destination"])
+        with demo.TRAVEL_CREW_POOL.acquire(key, verbose=Config.DEBUG, provider=provider) as crew:
+            demo.bind_run_context(crew, run_context)
+            try:
+                result = run_context.run(crew.kickoff, inputs=demo.trip_inputs(**trip))
+            except RunCancelled:
+                demo.TRAVEL_CREW_POOL.discard(crew)
+                return dict(run_context.partial_outputs), []
+        outputs = dict(run_context.partial_outputs)
+        outputs["final"] = str(result)
+        return outputs, [demo.save_travel_plan(result, outputs=run_context.partial_outputs,
+                                               provider=provider, **trip)]
@@ -0,0 +1,209 @@
+"""
+Shortest-Predicted-Job-First Scheduling for AutoGen and CrewAI Lab Demo
+
+In a first-in-first-out batch, a 14-day trip for six travelers makes every
+short job queued behind it wait, which drives up mean completion time. The
+scheduler predicts each queued job's run time from its inputs and hands out
+the cheapest job first. Every second a job waits lowers its score by
+QUEUE_AGING_RATE seconds, so long jobs are never starved.
+
+A job's predicted cost is:
+    seconds_per_unit[kind] * work_units * correction[kind/destination]
+
+- work_units grows with the number of phases (agent turns or crew tasks),
+  the trip length and the number of travelers.
+- seconds_per_unit is learned per job kind.
+- correction is learned per destination, because some destinations produce
+  longer research and itineraries than others.
+
+Both are moving averages, updated online as jobs finish. They are kept in
+JOB_COST_HISTORY_FILE so they carry over between batches.
+
+Usage:
+    from job_scheduler import ShortestJobFirst
+    from job_queue import SQLiteJobQueue
+
+    queue = SQLiteJobQueue(scheduler=ShortestJobFirst())   # QUEUE_SCHEDULER=sjf does this by default
+    ShortestJobFirst().predictor.predict("travel", {"trip_duration": "7 days"})
+"""
+
+import os
+import re
+import json
+import math
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from shared_config import Config
+
+# Phases per job kind: agent turns for interviews, crew tasks for travel
+JOB_PHASES = {
+    "interview": 4,
+    "interview-simple": 4,
+    "interview-native": 4,
+    "travel": 4,
+}
+
+DEFAULT_SECONDS_PER_UNIT = 20.0
+DEFAULT_TRIP_DAYS = 5
+DAY_WEIGHT = 0.1        # Each trip day adds 10% to every phase (itineraries and budgets grow per day)
+TRAVELER_WEIGHT = 0.05  # Each extra traveler adds 5%
+
+_NUMBER = re.compile(r"\d+")
+
+
+def trip_days(trip_duration: Any) -> int:
+    """Number of days in a trip_duration such as "7 days" (DEFAULT_TRIP_DAYS if none)"""
+    match = _NUMBER.search(str(trip_duration or ""))
+    return int(match.group()) if match else DEFAULT_TRIP_DAYS
+
+
+def _count(value: Any, default: float) -> float:
+    """value as a non-negative number, or default when it is missing or unparsable"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if math.isfinite(number) and number >= 0 else default
+
+
+# ============================================================================
+# COST PREDICTION
+# ============================================================================
+
+class JobCostPredictor:
+    """Predicts job run time from its inputs and learns from finished jobs"""
+
+    def __init__(self, history_file: Optional[str] = None, smoothing: float = 0.2):
+        """
+        Args:
+            history_file: JSON file the learned rates are loaded from and saved to
+                (default: JOB_COST_HISTORY_FILE; empty string keeps them in memory)
+            smoothing: Weight of each new observation in the moving averages
+        """
+        self.history_file = Config.JOB_COST_HISTORY_FILE if history_file is None else history_file
+        self.smoothing = smoothing
+        self._rates: Dict[str, float] = {}
+        self._corrections: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.history_file or not Path(self.history_file).exists():
+            return
+        try:
+            with open(self.history_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable job cost history {self.history_file}: {e}")
+            return
+        self._rates = data.get("rates", {})
+        self._corrections = data.get("corrections", {})
+        self._samples = data.get("samples", {})
+
+    def _save(self) -> None:
+        if not self.history_file:
+            return
+        data = {"rates": self._rates, "corrections": self._corrections, "samples": self._samples}
+        # Atomic swap: other workers and a later _load see the old or the new history, never half a file
+        path = Path(self.history_file)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temporary, "w") as f:
+                json.dump(data, f)
+            os.replace(temporary, path)
+        except OSError as e:
+            temporary.unlink(missing_ok=True)
+            if Config.DEBUG:
+                print(f"⚠️  Could not save job cost history: {e}")
+
+    @staticmethod
+    def work_units(kind: str, params: Dict[str, Any]) -> float:
+        """Relative amount of work in a job, before any learning"""
+        # Scoring runs inside the queue's claim transaction, so a malformed
+        # value falls back to its default instead of raising and stalling every claim
+        units = _count(params.get("phases"), JOB_PHASES.get(kind, 4))
+        if kind == "travel":
+            units *= 1 + DAY_WEIGHT * trip_days(params.get("trip_duration"))
+            units *= 1 + TRAVELER_WEIGHT * max(0, int(_count(params.get("travelers"), 2)) - 1)
+        return units
+
+    @staticmethod
+    def _destination_key(kind: str, params: Dict[str, Any]) -> Optional[str]:
+        destination = params.get("destination")
+        return f"{kind}/{str(destination).strip().lower()}" if destination else None
+
+    def predict(self, kind: str, params: Optional[Dict[str, Any]] = None) -> float:
+        """Predicted run time of a job in seconds"""
+        params = params or {}
+        destination = self._destination_key(kind, params)
+        with self._lock:
+            rate = self._rates.get(kind, DEFAULT_SECONDS_PER_UNIT)
+            correction = self._corrections.get(destination, 1.0)
+        return rate * self.work_units(kind, params) * correction
+
+    def observe(self, kind: str, params: Optional[Dict[str, Any]], seconds: float) -> None:
+        """Learn from a finished job's actual run time"""
+        params = params or {}
+        units = self.work_units(kind, params)
+        destination = self._destination_key(kind, params)
+        with self._lock:
+            correction = self._corrections.get(destination, 1.0)
+            rate = self._ewma(self._rates.get(kind), seconds / (units * correction))
+            self._rates[kind] = rate
+            if destination:
+                self._corrections[destination] = self._ewma(self._corrections.get(destination),
+                                                            seconds / (units * rate))
+            self._samples[kind] = self._samples.get(kind, 0) + 1
+            self._save()
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return (1 - self.smoothing) * current + self.smoothing * sample
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Learned seconds per work unit and sample count for every job kind"""
+        with self._lock:
+            return {kind: {"seconds_per_unit": round(rate, 2), "samples": self._samples.get(kind, 0)}
+                    for kind, rate in self._rates.items()}
+
+
+# ============================================================================
+# SCHEDULING POLICY
+# ============================================================================
+
+class ShortestJobFirst:
+    """Orders queued jobs by predicted run time minus an aging credit for time waited"""
+
+    def __init__(self, predictor: Optional[JobCostPredictor] = None, aging_rate: Optional[float] = None):
+        """
+        Args:
+            predictor: Cost predictor (default: one backed by JOB_COST_HISTORY_FILE)
+            aging_rate: Seconds of predicted cost forgiven per second waited (default: QUEUE_AGING_RATE)
+        """
+        self.predictor = predictor or JobCostPredictor()
+        self.aging_rate = Config.QUEUE_AGING_RATE if aging_rate is None else aging_rate
+
+    def score(self, job: Dict[str, Any], now: Optional[float] = None) -> float:
+        """
+        Lower runs sooner; job needs "enqueued" (epoch seconds) and either "predicted"
+        (seconds, e.g. stored at enqueue) or "kind" and "params"
+        """
+        waited = (now or time.time()) - job["enqueued"]
+        predicted = job.get("predicted")
+        if predicted is None:
+            predicted = self.predictor.predict(job["kind"], job["params"])
+        return predicted - self.aging_rate * waited
+
+    def pick(self, jobs: List[Dict[str, Any]], now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """The job to run next, or None if jobs is empty"""
+        now = now or time.time()
+        return min(jobs, key=lambda job: self.score(job, now), default=None)
+
+    def observe(self, job: Dict[str, Any], seconds: float) -> None:
+        """Feed a finished job's run time back into the predictor"""
+        self.predictor.observe(job["kind"], job["params"], seconds)
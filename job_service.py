@@ -0,0 +1,395 @@
+"""
+HTTP Job Service for AutoGen and CrewAI Lab Demo
+
+A resident local HTTP service that queues interview and travel workflow jobs
+and runs them on a bounded pool of worker threads sharing one warm JobRunner
+(see job_runner.py). Tools submit a job, get a job id back immediately and
+then poll or stream its progress instead of spawning a script per request.
+SERVICE_WORKERS caps how many jobs (and so provider calls) run at once.
+
+Usage:
+    python cli.py service                        # listens on SERVICE_HOST:SERVICE_PORT
+
+    curl -X POST localhost:8765/jobs -d '{"kind": "travel", "params": {"destination": "France"}}'
+    curl localhost:8765/jobs/<job_id>             # poll status, outputs and result
+    curl localhost:8765/jobs/<job_id>/events      # stream events (newline-delimited JSON)
+    curl -X DELETE localhost:8765/jobs/<job_id>   # cancel
+
+Endpoints:
+    POST   /jobs                {"kind", "params", "deadline", "tenant", "priority"} -> 202 {"job_id", "status"}
+    GET    /jobs                All known jobs (without outputs)
+    GET    /jobs/<id>           Job status, outputs so far and result
+    GET    /jobs/<id>/events    Event stream; ?since=N skips the first N events
+    DELETE /jobs/<id>           Cancel a queued or running job
+    GET    /health              Worker and queue counts, shared LLM capacity per tenant
+
+"tenant" (or an X-Tenant header) charges the job's LLM calls to a team's quota
+and fair share; "priority" is "interactive" (default) or "batch" (see
+llm_scheduler.py).
+
+Events use the worker daemon's format: {"event": "output", "name", "output"},
+{"event": "done", "result"} or {"event": "error", "error"}.
+"""
+
+import json
+import math
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse, parse_qs
+
+from shared_config import Config
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+# ============================================================================
+# JOB MANAGER
+# ============================================================================
+
+class Job:
+    """One submitted workflow job and the events it has produced"""
+
+    def __init__(self, kind: str, params: Dict[str, Any], deadline: Optional[float],
+                 tenant: Optional[str] = None, priority: str = "interactive"):
+        self.job_id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.deadline = deadline
+        self.tenant = tenant or Config.DEFAULT_TENANT
+        self.priority = priority
+        self.status = "queued"
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.run_context = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def to_dict(self, include_outputs: bool = True) -> Dict[str, Any]:
+        job = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "tenant": self.tenant,
+            "priority": self.priority,
+            "status": self.status,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "error": self.error,
+        }
+        if include_outputs:
+            job["outputs"] = {event["name"]: event["output"] for event in self.events if event["event"] == "output"}
+            job["result"] = self.result
+        return job
+
+
+class JobManager:
+    """Queues jobs and runs them on a bounded worker pool"""
+
+    def __init__(self, runner=None, workers: Optional[int] = None, max_queued: Optional[int] = None,
+                 max_finished: int = 1000):
+        """
+        Args:
+            runner: JobRunner shared by all workers (default: a new one)
+            workers: Jobs run at once (default: SERVICE_WORKERS)
+            max_queued: Jobs waiting for a worker before submissions are refused
+                (default: SERVICE_MAX_QUEUE)
+            max_finished: Finished jobs kept for polling; the oldest are dropped
+        """
+        if runner is None:
+            from job_runner import JobRunner
+            runner = JobRunner()
+        self.runner = runner
+        self.workers = workers or Config.SERVICE_WORKERS
+        self.max_queued = max_queued or Config.SERVICE_MAX_QUEUE
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job-worker")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._changed = threading.Condition()
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None,
+               deadline: Optional[float] = None, tenant: Optional[str] = None,
+               priority: str = "interactive") -> Job:
+        """
+        Queue a job.
+
+        Raises:
+            ValueError: If kind or priority is unknown, deadline is not a number of seconds >= 0,
+                or params["provider"] sets more than job_runner.JOB_PROVIDER_FIELDS
+            OverflowError: If max_queued jobs are already waiting
+        """
+        from job_runner import JOB_KINDS, job_provider_overrides
+        from llm_scheduler import PRIORITIES
+
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind} (expected one of {', '.join(JOB_KINDS)})")
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})")
+        if deadline is not None:
+            try:
+                deadline = float(deadline)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid deadline: {deadline!r} (expected seconds)") from None
+            if not math.isfinite(deadline) or deadline < 0:
+                raise ValueError(f"Invalid deadline: {deadline} (expected seconds >= 0)")
+        job_provider_overrides((params or {}).get("provider"))
+        job = Job(kind, dict(params or {}), deadline, tenant, priority)
+        with self._changed:
+            if self.counts()["queued"] >= self.max_queued:
+                raise OverflowError(f"Job queue is full ({self.max_queued} queued)")
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: Job) -> None:
+        from run_context import RunContext, RunCancelled
+
+        with self._changed:
+            if job.status != "queued":
+                return  # Cancelled while waiting
+            job.status = "running"
+            job.started = time.time()
+            try:
+                job.run_context = RunContext(job.deadline, on_output=lambda name, output: self._add_event(
+                    job, {"event": "output", "name": name, "output": output}), tenant=job.tenant,
+                    priority=job.priority)
+            except Exception as e:
+                job.status, job.error, job.finished = "failed", str(e), time.time()
+                job.events.append({"event": "error", "error": str(e)})
+                return
+            finally:
+                self._changed.notify_all()
+
+        try:
+            result = self.runner.run(job.kind, job.params, job.run_context)
+        except RunCancelled as e:
+            with self._changed:
+                job.status, job.error = "cancelled", str(e)
+            self._add_event(job, {"event": "error", "error": str(e)})
+        except Exception as e:
+            with self._changed:
+                job.status, job.error = "failed", str(e)
+            self._add_event(job, {"event": "error", "error": str(e)})
+        else:
+            with self._changed:
+                job.status = "cancelled" if result["cancelled"] else "done"
+                job.result = result
+            self._add_event(job, {"event": "done", "result": result})
+        finally:
+            with self._changed:
+                job.finished = time.time()
+                self._changed.notify_all()
+
+    def _add_event(self, job: Job, event: Dict[str, Any]) -> None:
+        with self._changed:
+            job.events.append(event)
+            self._changed.notify_all()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._changed:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._changed:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job; returns None if the job is unknown"""
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished = time.time()
+                job.events.append({"event": "error", "error": "cancelled before it started"})
+                self._changed.notify_all()
+            elif job.status == "running" and job.run_context is not None:
+                job.run_context.cancel("cancelled by client")
+            return job
+
+    def events(self, job: Job, since: int = 0, timeout: float = 15.0):
+        """
+        Yield a job's events from index since, waiting for new ones until it finishes.
+
+        Yields None after timeout seconds without events so callers can send a keep-alive.
+        """
+        index = since
+        while True:
+            with self._changed:
+                if index >= len(job.events) and job.finished is None:
+                    self._changed.wait(timeout)
+                new_events = job.events[index:]
+                finished = job.finished is not None
+            if not new_events and not finished:
+                yield None
+            for event in new_events:
+                yield event
+            index += len(new_events)
+            if finished and index >= len(job.events):
+                return
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs in each state"""
+        with self._changed:
+            counts = {state: 0 for state in ("queued", "running") + FINISHED_STATES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self) -> None:
+        """Cancel running jobs and stop the workers"""
+        for job in self.jobs():
+            self.cancel(job.job_id)
+        self._executor.shutdown(wait=False)
+
+
+# ============================================================================
+# HTTP SERVER
+# ============================================================================
+
+class JobServiceHandler(BaseHTTPRequestHandler):
+    """Maps the REST endpoints onto the server's JobManager"""
+
+    server_version = "MultiAgentJobService/1.0"
+
+    def log_message(self, format: str, *args) -> None:
+        if Config.DEBUG:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, body: Any) -> None:
+        data = json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _job_or_404(self, job_id: str) -> Optional[Job]:
+        job = self.server.manager.get(job_id)
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job: {job_id}"})
+        return job
+
+    def do_POST(self) -> None:
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job = self.server.manager.submit(request["kind"], request.get("params"), request.get("deadline"),
+                                             request.get("tenant") or self.headers.get("X-Tenant"),
+                                             request.get("priority", "interactive"))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {"error": f"Invalid job request: {e}"})
+            return
+        except OverflowError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        self._send_json(202, {"job_id": job.job_id, "status": job.status})
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        manager = self.server.manager
+
+        if parts == ["health"]:
+            from llm_scheduler import LLM_SCHEDULER
+            self._send_json(200, {"workers": manager.workers, "max_queued": manager.max_queued, **manager.counts(),
+                                  "llm": LLM_SCHEDULER.get_stats()})
+        elif parts == ["jobs"]:
+            self._send_json(200, [job.to_dict(include_outputs=False) for job in manager.jobs()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self._job_or_404(parts[1])
+            if job is not None:
+                self._send_json(200, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            job = self._job_or_404(parts[1])
+            if job is None:
+                return
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+                if since < 0:
+                    raise ValueError(f"since must be >= 0, got {since}")
+            except ValueError as e:
+                self._send_json(400, {"error": f"Invalid since: {e}"})
+                return
+            self._stream_events(job, since)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _stream_events(self, job: Job, since: int) -> None:
+        # HTTP/1.0 response without Content-Length: the body ends when the job does
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for event in self.server.manager.events(job, since):
+                line = json.dumps(event, default=str) if event is not None else ""
+                self.wfile.write((line + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except OSError:
+            pass  # Client went away; the job keeps running
+
+    def do_DELETE(self) -> None:
+        parts = [part for part in urlparse(self.path).path.split("/") if part]
+        if len(parts) != 2 or parts[0] != "jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+        job = self.server.manager.cancel(parts[1])
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+        else:
+            self._send_json(200, {"job_id": job.job_id, "status": job.status})
+
+
+class JobService(ThreadingHTTPServer):
+    """HTTP server that owns one JobManager"""
+
+    daemon_threads = True
+
+    def __init__(self, address, manager: JobManager):
+        self.manager = manager
+        super().__init__(address, JobServiceHandler)
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None,
+          warm_kinds=None) -> None:
+    """
+    Start the HTTP job service and block until interrupted.
+
+    Args:
+        host: Interface to bind (default: SERVICE_HOST)
+        port: Port to listen on (default: SERVICE_PORT)
+        workers: Jobs run at once (default: SERVICE_WORKERS)
+        warm_kinds: Job kinds to warm up before accepting jobs (default: all)
+    """
+    from job_runner import JobRunner, JOB_KINDS
+
+    runner = JobRunner()
+    for kind, seconds in runner.warm_up(warm_kinds or JOB_KINDS).items():
+        print(f"✓ Warmed {kind} in {seconds:.2f}s")
+
+    manager = JobManager(runner, workers)
+    address = (host or Config.SERVICE_HOST, port or Config.SERVICE_PORT)
+    with JobService(address, manager) as server:
+        print(f"✓ Job service listening on http://{address[0]}:{address[1]} ({manager.workers} worker(s))")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down job service...")
+        finally:
+            manager.shutdown()
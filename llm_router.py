@@ -0,0 +1,369 @@
+"""
+Latency-Aware LLM Router for AutoGen and CrewAI Lab Demo
+
+This module routes chat completion calls across several OpenAI-compatible
+endpoints (see LLM_ENDPOINTS in shared_config.py). For every call it picks the
+endpoint with the best expected latency, taking into account:
+
+- Observed latency (EWMA and a rolling window used for percentiles)
+- Recent error rate
+- Remaining rate-limit headroom reported in the x-ratelimit-* response headers
+
+Optionally a slow call is hedged: if the first request has not answered after
+the endpoint's p95 latency, a second request is sent to another endpoint and
+the first answer wins.
+
+Usage:
+    from llm_router import LLMRouter
+
+    router = LLMRouter()
+    response = router.complete(
+        messages=[{"role": "user", "content": "Hello"}],
+        temperature=0.7,
+    )
+    print(response.choices[0].message.content)
+    print(router.get_stats())
+
+    # Per-run provider/model (nothing process-wide is changed)
+    router = LLMRouter(provider=ProviderConfig.from_env().override(model="gpt-4o-mini"))
+
+    # Process-wide router per provider settings (engines and job runners share it)
+    router = get_router(ProviderConfig.from_env())
+
+A router owns OpenAI clients and, once a call is hedged, a thread pool;
+close() releases them (a closed router still works and reopens them lazily).
+"""
+
+import re
+import json
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional
+
+from shared_config import Config, ProviderConfig
+from llm_scheduler import LLM_SCHEDULER, estimate_tokens
+
+
+# ============================================================================
+# ENDPOINT STATISTICS
+# ============================================================================
+
+def _parse_reset(value: Optional[str]) -> float:
+    """Parse a rate-limit reset header such as "1s", "6m0s" or "250ms" into seconds."""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    seconds = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        seconds += float(amount) * {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}[unit]
+    return seconds
+
+
+class EndpointStats:
+    """Rolling latency, error and rate-limit statistics for one endpoint"""
+
+    WINDOW_SIZE = 200
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, initial_latency: float = 5.0):
+        self.latencies = deque(maxlen=self.WINDOW_SIZE)
+        self.ewma_latency = initial_latency
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.remaining_requests: Optional[int] = None
+        self.limit_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.limit_tokens: Optional[int] = None
+        self.cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.requests += 1
+
+    def record_success(self, latency: float, headers: Optional[Dict[str, str]] = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.latencies.append(latency)
+            self.ewma_latency += self.EWMA_ALPHA * (latency - self.ewma_latency)
+            self.error_rate *= (1 - self.EWMA_ALPHA)
+            self._update_rate_limits(headers)
+
+    def record_failure(self, headers: Optional[Dict[str, str]] = None, status_code: Optional[int] = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.errors += 1
+            self.error_rate += self.EWMA_ALPHA * (1 - self.error_rate)
+            self._update_rate_limits(headers)
+            if status_code == 429:
+                retry_after = _parse_reset((headers or {}).get("retry-after")) or 1.0
+                self.cooldown_until = time.monotonic() + retry_after
+
+    def _update_rate_limits(self, headers: Optional[Dict[str, str]]) -> None:
+        if not headers:
+            return
+        for attr, header in (
+            ("remaining_requests", "x-ratelimit-remaining-requests"),
+            ("limit_requests", "x-ratelimit-limit-requests"),
+            ("remaining_tokens", "x-ratelimit-remaining-tokens"),
+            ("limit_tokens", "x-ratelimit-limit-tokens"),
+        ):
+            value = headers.get(header)
+            if value is not None:
+                try:
+                    setattr(self, attr, int(float(value)))
+                except ValueError:
+                    pass
+        if self.remaining_requests == 0 or self.remaining_tokens == 0:
+            reset = max(
+                _parse_reset(headers.get("x-ratelimit-reset-requests")),
+                _parse_reset(headers.get("x-ratelimit-reset-tokens")),
+            )
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + (reset or 1.0))
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile over the rolling window, or None without enough samples"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < 5:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))
+        return samples[index]
+
+    def headroom(self) -> float:
+        """Fraction (0-1) of the rate-limit window still available"""
+        fractions = []
+        if self.remaining_requests is not None and self.limit_requests:
+            fractions.append(self.remaining_requests / self.limit_requests)
+        if self.remaining_tokens is not None and self.limit_tokens:
+            fractions.append(self.remaining_tokens / self.limit_tokens)
+        return min(fractions) if fractions else 1.0
+
+    def score(self, weight: float = 1.0) -> float:
+        """Expected cost of sending the next call here (lower is better)"""
+        if time.monotonic() < self.cooldown_until:
+            return float("inf")
+        expected = self.ewma_latency * (1 + self.in_flight)
+        expected *= 1 + 4 * self.error_rate
+        expected /= max(self.headroom(), 0.05)
+        return expected / max(weight, 1e-6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "error_rate": round(self.error_rate, 3),
+            "ewma_latency": round(self.ewma_latency, 3),
+            "p95_latency": self.percentile(95),
+            "headroom": round(self.headroom(), 3),
+        }
+
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+class LLMRouter:
+    """Picks an endpoint per call and optionally hedges slow calls"""
+
+    def __init__(self, endpoints: Optional[List[Dict[str, Any]]] = None,
+                 hedge: Optional[bool] = None, hedge_percentile: Optional[float] = None,
+                 hedge_min_delay: Optional[float] = None, timeout: Optional[float] = None,
+                 provider: Optional[ProviderConfig] = None):
+        provider = provider or ProviderConfig.from_env()
+        self.endpoints = endpoints or provider.get_endpoints()
+        self.hedge = Config.ROUTER_HEDGE if hedge is None else hedge
+        self.hedge_percentile = hedge_percentile or Config.ROUTER_HEDGE_PERCENTILE
+        self.hedge_min_delay = Config.ROUTER_HEDGE_MIN_DELAY if hedge_min_delay is None else hedge_min_delay
+        self.timeout = timeout or provider.timeout
+        self.stats = {endpoint["name"]: EndpointStats() for endpoint in self.endpoints}
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None  # Created by the first hedged call
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._clients_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(self.endpoints)),
+                                                    thread_name_prefix="llm-router")
+            return self._executor
+
+    def close(self) -> None:
+        """Shut down the hedging threads and close the endpoint clients"""
+        with self._clients_lock:
+            executor, self._executor = self._executor, None
+            clients, self._clients = list(self._clients.values()), {}
+        if executor is not None:
+            executor.shutdown(wait=False)
+        for client in clients:
+            client.close()
+
+    def __enter__(self) -> "LLMRouter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _client(self, endpoint: Dict[str, Any]):
+        """Return the (cached) OpenAI client for an endpoint"""
+        with self._clients_lock:
+            client = self._clients.get(endpoint["name"])
+            if client is None:
+                from openai import OpenAI
+                client = OpenAI(api_key=endpoint["api_key"], base_url=endpoint["api_base"],
+                                timeout=self.timeout, max_retries=0)
+                self._clients[endpoint["name"]] = client
+            return client
+
+    def choose(self, exclude: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Pick the endpoint with the lowest expected cost, skipping excluded names"""
+        exclude = exclude or []
+        candidates = [endpoint for endpoint in self.endpoints if endpoint["name"] not in exclude]
+        if not candidates:
+            return None
+        return min(candidates,
+                   key=lambda endpoint: self.stats[endpoint["name"]].score(endpoint.get("weight", 1.0)))
+
+    def _call(self, endpoint: Dict[str, Any], messages: List[Dict[str, str]], kwargs: Dict[str, Any],
+              run_context=None):
+        """Send one request to one endpoint and record its outcome"""
+        from openai import APIStatusError
+
+        stats = self.stats[endpoint["name"]]
+        client = self._client(endpoint)
+        params = dict(kwargs)
+        if params.pop("model_tier", "large") == "small" and endpoint.get("small_model"):
+            params.setdefault("model", endpoint["small_model"])
+        params.setdefault("model", endpoint["model"])
+        # Wait for the run's tenant to get a fair share of the shared capacity
+        with LLM_SCHEDULER.slot(run_context, estimate_tokens(messages, params.get("max_tokens"))) as ticket:
+            if run_context is not None:
+                # Per-call timeout shrinks to the time left in the run, and the
+                # request goes through the run's HTTP client so cancel() aborts it
+                params["timeout"] = run_context.timeout_for(self.timeout)
+                client = run_context.bind_client(client)
+            stats.start()
+            started = time.monotonic()
+            try:
+                raw = client.chat.completions.with_raw_response.create(
+                    messages=messages, **params
+                )
+            except APIStatusError as e:
+                stats.record_failure(dict(e.response.headers), e.status_code)
+                raise
+            except Exception:
+                stats.record_failure()
+                raise
+            stats.record_success(time.monotonic() - started, dict(raw.headers))
+            response = raw.parse()
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                ticket.tokens = usage.total_tokens
+            ticket.model = params["model"]
+        return response
+
+    def _hedge_delay(self, endpoint: Dict[str, Any]) -> float:
+        observed = self.stats[endpoint["name"]].percentile(self.hedge_percentile)
+        return max(self.hedge_min_delay, observed or 0.0)
+
+    def complete(self, messages: List[Dict[str, str]], run_context=None, **kwargs):
+        """
+        Create a chat completion on the best endpoint.
+
+        Falls back to the next-best endpoint on errors. When hedging is enabled
+        and more than one endpoint is configured, a second request is started
+        after the p95 delay and the first successful answer is returned.
+
+        Args:
+            messages: Chat messages in OpenAI format
+            run_context: Optional RunContext whose deadline and cancellation apply
+            **kwargs: Extra parameters for chat.completions.create (model defaults
+                to the chosen endpoint's model, or its small_model with model_tier="small")
+
+        Returns:
+            The parsed ChatCompletion response
+        """
+        tried = []
+        last_error = None
+        while len(tried) < len(self.endpoints):
+            if run_context is not None:
+                run_context.check()
+            primary = self.choose(exclude=tried)
+            tried.append(primary["name"])
+            try:
+                if self.hedge and len(tried) < len(self.endpoints):
+                    return self._complete_hedged(primary, tried, messages, kwargs, run_context)
+                return self._call(primary, messages, kwargs, run_context)
+            except Exception as e:
+                if run_context is not None:
+                    run_context.check()
+                last_error = e
+                if Config.DEBUG:
+                    print(f"⚠️  Endpoint {primary['name']} failed: {e}")
+        raise last_error
+
+    def _complete_hedged(self, primary: Dict[str, Any], tried: List[str],
+                         messages: List[Dict[str, str]], kwargs: Dict[str, Any], run_context=None):
+        futures = {self._pool().submit(self._call, primary, messages, kwargs, run_context): primary}
+        done, _ = wait(futures, timeout=self._hedge_delay(primary))
+        if not done:
+            backup = self.choose(exclude=tried)
+            tried.append(backup["name"])
+            futures[self._pool().submit(self._call, backup, messages, kwargs, run_context)] = backup
+
+        pending = set(futures)
+        last_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                # The losing request keeps running in the background and still
+                # feeds its latency into the endpoint statistics
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint routing statistics"""
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+
+# ============================================================================
+# SHARED ROUTERS
+# ============================================================================
+
+_ROUTERS: "OrderedDict[str, LLMRouter]" = OrderedDict()
+_ROUTERS_LOCK = threading.Lock()
+
+
+def get_router(provider: Optional[ProviderConfig] = None) -> LLMRouter:
+    """
+    Process-wide router for a provider's endpoints and timeout.
+
+    At most ROUTER_CACHE_SIZE routers are kept; the least recently used one
+    is closed when another is needed, so per-job model overrides cannot pile
+    up clients and threads.
+    """
+    provider = provider or ProviderConfig.from_env()
+    key = json.dumps([provider.get_endpoints(), provider.timeout], sort_keys=True)
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+        if router is not None:
+            _ROUTERS.move_to_end(key)
+            return router
+        router = _ROUTERS[key] = LLMRouter(provider=provider)
+        evicted = []
+        while len(_ROUTERS) > max(1, Config.ROUTER_CACHE_SIZE):
+            evicted.append(_ROUTERS.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return router
@@ -0,0 +1,284 @@
+"""
+Weighted Fair LLM Scheduling and Tenant Quotas for AutoGen and CrewAI Lab Demo
+
+Several teams share one API key. Without coordination, one team's bulk travel
+batch can fill every request slot and every token of the rate limit, and
+interactive interview runs queue behind it. Every LLM call goes through the
+process-wide LLM_SCHEDULER before it is sent:
+
+- Each call is tagged with its run's tenant and priority (RunContext.tenant
+  and RunContext.priority): "interactive" for CLI, daemon and service runs,
+  "batch" for durable-queue workers.
+- At most LLM_MAX_CONCURRENCY calls are in flight. LLM_INTERACTIVE_RESERVE of
+  those slots are kept for interactive calls, so batch work can only use the
+  leftover capacity.
+- Waiting calls are served by weighted fair queuing. Each (tenant, priority)
+  flow gets a share of capacity, measured in estimated tokens, proportional to
+  its weight: the tenant weight times LLM_INTERACTIVE_WEIGHT for interactive
+  calls.
+- Per-tenant requests-per-minute and tokens-per-minute quotas (TENANT_QUOTAS,
+  or TENANT_DEFAULT_RPM / TENANT_DEFAULT_TPM) hold a tenant's calls back until
+  its one-minute window has room. Other tenants keep going meanwhile.
+
+Quotas and fair shares apply per process. Run shared workloads through the
+HTTP job service or the worker daemon so they share one scheduler.
+
+Usage:
+    # TENANT_QUOTAS={"growth": {"rpm": 60, "tpm": 90000, "weight": 2}, "batch-team": {"tpm": 30000}}
+
+    from llm_scheduler import LLM_SCHEDULER, estimate_tokens
+
+    with LLM_SCHEDULER.slot(run_context, estimate_tokens(messages, max_tokens)) as ticket:
+        response = client.chat.completions.create(messages=messages, ...)
+        ticket.tokens = response.usage.total_tokens   # replace the estimate with actual usage
+        ticket.model = response.model
+    print(LLM_SCHEDULER.get_stats())
+"""
+
+import json
+import time
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple
+
+from shared_config import Config
+
+PRIORITIES = ("interactive", "batch")
+QUOTA_WINDOW = 60.0
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(content: Any, max_tokens: Optional[int] = None) -> int:
+    """
+    Rough token count of a prompt (a string or OpenAI-style message list) plus
+    the completion budget, used until the actual usage is known.
+    """
+    if isinstance(content, list):
+        content = " ".join(str(message.get("content") or "") if isinstance(message, dict) else str(message)
+                           for message in content)
+    return len(str(content or "")) // CHARS_PER_TOKEN + int(max_tokens or 0)
+
+
+def _parse_quotas(raw: str) -> Dict[str, Dict[str, float]]:
+    if not raw:
+        return {}
+    try:
+        quotas = json.loads(raw)
+    except ValueError as e:
+        print(f"⚠️  Ignoring invalid TENANT_QUOTAS: {e}")
+        return {}
+    return quotas if isinstance(quotas, dict) else {}
+
+
+class Ticket:
+    """One admitted call; set tokens (and model) to the actual usage once it is known"""
+
+    def __init__(self, tenant: str, priority: str, tokens: int, window_entry: Optional[List[float]] = None,
+                 run_context=None):
+        self.tenant = tenant
+        self.priority = priority
+        self.tokens = tokens
+        self.window_entry = window_entry
+        self.run_context = run_context
+        self.model: Optional[str] = None
+
+
+class _Waiter:
+    __slots__ = ("tenant", "priority", "cost", "start", "finish", "seq")
+
+    def __init__(self, tenant, priority, cost, start, finish, seq):
+        self.tenant = tenant
+        self.priority = priority
+        self.cost = cost
+        self.start = start
+        self.finish = finish
+        self.seq = seq
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+class LLMScheduler:
+    """Admits LLM calls by weighted fair queuing within per-tenant quotas"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, interactive_reserve: Optional[int] = None,
+                 quotas: Optional[Dict[str, Dict[str, float]]] = None,
+                 interactive_weight: Optional[float] = None):
+        """
+        Args:
+            max_concurrency: Calls in flight at once (default: LLM_MAX_CONCURRENCY; 0 admits every call at once)
+            interactive_reserve: Slots batch calls may not use (default: LLM_INTERACTIVE_RESERVE;
+                capped at max_concurrency - 1 so batch calls always get a slot)
+            quotas: {tenant: {"rpm", "tpm", "weight"}} (default: TENANT_QUOTAS)
+            interactive_weight: Weight multiplier for interactive calls (default: LLM_INTERACTIVE_WEIGHT)
+        """
+        self.max_concurrency = Config.LLM_MAX_CONCURRENCY if max_concurrency is None else max_concurrency
+        reserve = Config.LLM_INTERACTIVE_RESERVE if interactive_reserve is None else interactive_reserve
+        # A reserve covering every slot would never admit a batch call
+        self.interactive_reserve = max(0, min(reserve, self.max_concurrency - 1))
+        self.quotas = _parse_quotas(Config.TENANT_QUOTAS) if quotas is None else quotas
+        self.interactive_weight = interactive_weight or Config.LLM_INTERACTIVE_WEIGHT
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: List[_Waiter] = []
+        self._in_flight = {priority: 0 for priority in PRIORITIES}
+        self._virtual_time = 0.0
+        self._last_finish: Dict[Tuple[str, str], float] = {}
+        self._windows: Dict[str, deque] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Policy
+    # ------------------------------------------------------------------
+
+    def _limits(self, tenant: str) -> Tuple[float, float]:
+        quota = self.quotas.get(tenant, {})
+        return quota.get("rpm", Config.TENANT_DEFAULT_RPM), quota.get("tpm", Config.TENANT_DEFAULT_TPM)
+
+    def _weight(self, tenant: str, priority: str) -> float:
+        weight = float(self.quotas.get(tenant, {}).get("weight", 1.0))
+        return weight * (self.interactive_weight if priority == "interactive" else 1.0)
+
+    def _slot_free(self, priority: str) -> bool:
+        in_flight = sum(self._in_flight.values())
+        if priority == "batch":
+            return in_flight < self.max_concurrency - self.interactive_reserve
+        return in_flight < self.max_concurrency
+
+    def _quota_wait(self, tenant: str, cost: int, now: float) -> float:
+        """Seconds until the tenant's one-minute window has room for a call of this cost"""
+        window = self._windows.setdefault(tenant, deque())
+        while window and window[0][0] <= now - QUOTA_WINDOW:
+            window.popleft()
+        rpm, tpm = self._limits(tenant)
+        waits = []
+        if rpm and len(window) >= rpm:
+            waits.append(window[len(window) - int(rpm)][0] + QUOTA_WINDOW - now)
+        if tpm and window:
+            excess = sum(entry[1] for entry in window) + cost - tpm
+            freed = 0
+            for started, tokens in window:
+                if excess <= 0:
+                    break
+                freed += tokens
+                if freed >= excess:
+                    waits.append(started + QUOTA_WINDOW - now)
+                    break
+        return max(waits, default=0.0)
+
+    def _admit_delay(self, waiter: _Waiter, now: float) -> float:
+        """0 if waiter goes next, else how long to wait before looking again"""
+        own_wait = self._quota_wait(waiter.tenant, waiter.cost, now)
+        if own_wait > 0:
+            return own_wait
+        if not self._slot_free(waiter.priority):
+            return 1.0
+        for other in self._waiting:
+            if other is waiter or (other.finish, other.seq) > (waiter.finish, waiter.seq):
+                continue
+            if self._slot_free(other.priority) and self._quota_wait(other.tenant, other.cost, now) == 0:
+                return 1.0  # An eligible call with an earlier finish tag goes first
+        return 0.0
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _tags(run_context) -> Tuple[str, str]:
+        if run_context is None:
+            return Config.DEFAULT_TENANT, "interactive"
+        priority = run_context.priority if run_context.priority in PRIORITIES else "interactive"
+        return run_context.tenant or Config.DEFAULT_TENANT, priority
+
+    def acquire(self, run_context=None, tokens: int = 0) -> Ticket:
+        """
+        Wait until a call of about this many tokens may be sent.
+
+        Raises:
+            RunCancelled: If the run is cancelled while the call waits
+        """
+        tenant, priority = self._tags(run_context)
+        if self.max_concurrency <= 0:
+            return Ticket(tenant, priority, tokens, run_context=run_context)
+
+        waited_from = time.monotonic()
+        with self._cond:
+            flow = (tenant, priority)
+            start = max(self._virtual_time, self._last_finish.get(flow, 0.0))
+            waiter = _Waiter(tenant, priority, tokens, start, start + max(tokens, 1) / self._weight(tenant, priority),
+                             next(self._seq))
+            self._last_finish[flow] = waiter.finish
+            self._waiting.append(waiter)
+            try:
+                while True:
+                    if run_context is not None:
+                        run_context.check()
+                    delay = self._admit_delay(waiter, time.monotonic())
+                    if delay <= 0:
+                        break
+                    self._cond.wait(min(delay, 1.0))
+            finally:
+                self._waiting.remove(waiter)
+                self._cond.notify_all()
+
+            now = time.monotonic()
+            self._in_flight[priority] += 1
+            self._virtual_time = max(self._virtual_time, waiter.start)
+            entry = [now, tokens]
+            self._windows[tenant].append(entry)
+            stats = self._stats.setdefault(tenant, {"requests": 0, "tokens": 0, "wait_seconds": 0.0,
+                                                    "max_wait_seconds": 0.0})
+            stats["requests"] += 1
+            stats["wait_seconds"] += now - waited_from
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], now - waited_from)
+        return Ticket(tenant, priority, tokens, entry, run_context)
+
+    def release(self, ticket: Ticket) -> None:
+        """Free the ticket's slot and charge its (actual) tokens to the tenant and run"""
+        if ticket.run_context is not None:
+            ticket.run_context.record_usage(ticket.tokens, ticket.model)
+        if ticket.window_entry is None:
+            return
+        with self._cond:
+            self._in_flight[ticket.priority] -= 1
+            ticket.window_entry[1] = ticket.tokens
+            self._stats[ticket.tenant]["tokens"] += ticket.tokens
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, run_context=None, tokens: int = 0):
+        """Hold a call slot for the duration of the with block (see acquire)"""
+        ticket = self.acquire(run_context, tokens)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Calls in flight and waiting, plus per-tenant usage and queueing delay"""
+        with self._cond:
+            now = time.monotonic()
+            tenants = {}
+            for tenant, stats in self._stats.items():
+                window = [entry for entry in self._windows.get(tenant, ()) if entry[0] > now - QUOTA_WINDOW]
+                tenants[tenant] = {
+                    "requests": stats["requests"],
+                    "tokens": stats["tokens"],
+                    "requests_last_minute": len(window),
+                    "tokens_last_minute": sum(entry[1] for entry in window),
+                    "average_wait_seconds": round(stats["wait_seconds"] / stats["requests"], 3),
+                    "max_wait_seconds": round(stats["max_wait_seconds"], 3),
+                }
+            return {
+                "in_flight": dict(self._in_flight),
+                "waiting": len(self._waiting),
+                "tenants": tenants,
+            }
+
+
+# Process-wide scheduler shared by every router, crew and agent call
+LLM_SCHEDULER = LLMScheduler()
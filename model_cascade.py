@@ -0,0 +1,142 @@
+"""
+Cheap-First Model Cascade for AutoGen and CrewAI Lab Demo
+
+Every agent used to run on the large OPENAI_MODEL. With a cascade, a phase is
+first answered by the endpoint's small model (SMALL_MODEL, or "small_model" in
+LLM_ENDPOINTS) and only escalated to the large model when the output fails
+the phase's validator, e.g. it is too short or misses a required section.
+
+Validators are declarative rule dicts, so they live next to the agent specs:
+    {"min_words": 250, "required_sections": ["competitor", "trend"], "min_items": 3}
+
+Each agent chooses its model tier:
+- "cascade": small model first, large model if validation fails
+- "small":   small model only
+- "large":   large model only (the default, and the fallback when no small model is set)
+
+Usage:
+    from model_cascade import MODEL_CASCADE
+
+    output = MODEL_CASCADE.run("ResearchAgent", attempt, rules, model_tier="cascade")
+    # attempt(tier) calls the LLM with model_tier=tier and returns the output text
+"""
+
+import re
+import threading
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from shared_config import Config, ProviderConfig
+
+MODEL_TIERS = {
+    "cascade": ("small", "large"),
+    "small": ("small",),
+    "large": ("large",),
+}
+
+_LIST_ITEM = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+", re.MULTILINE)
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def validate_output(text: Any, rules: Optional[Dict[str, Any]]) -> List[str]:
+    """
+    Check an output against validator rules.
+
+    Args:
+        text: The agent output (non-strings are converted with str())
+        rules: Optional dict with any of:
+            min_words: Minimum number of words
+            required_sections: Phrases that must all appear (case-insensitive)
+            min_items: Minimum number of numbered or bulleted list items
+
+    Returns:
+        List[str]: One message per failed rule (empty when the output passes)
+    """
+    if not rules:
+        return []
+    text = "" if text is None else str(text)
+    problems = []
+
+    min_words = rules.get("min_words")
+    if min_words and len(text.split()) < min_words:
+        problems.append(f"{len(text.split())} words (< {min_words})")
+
+    lowered = text.lower()
+    missing = [section for section in rules.get("required_sections", []) if section.lower() not in lowered]
+    if missing:
+        problems.append(f"missing {', '.join(missing)}")
+
+    min_items = rules.get("min_items")
+    if min_items and len(_LIST_ITEM.findall(text)) < min_items:
+        problems.append(f"fewer than {min_items} list items")
+
+    return problems
+
+
+# ============================================================================
+# CASCADE
+# ============================================================================
+
+class ModelCascade:
+    """Runs attempts from the cheapest model tier up until one passes validation"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def tiers(self, model_tier: str = "large", provider: Optional[ProviderConfig] = None) -> Tuple[str, ...]:
+        """
+        Model tiers to try, in order, for an agent's model_tier setting.
+
+        Args:
+            model_tier: The agent's tier setting (see MODEL_TIERS)
+            provider: The run's provider settings (default: from the environment);
+                without a small model every tier falls back to "large"
+        """
+        if not (provider or ProviderConfig.from_env()).has_small_model():
+            return ("large",)
+        if model_tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier: {model_tier} (expected one of {', '.join(MODEL_TIERS)})")
+        return MODEL_TIERS[model_tier]
+
+    def run(self, key: str, attempt: Callable[[str], Any], rules: Optional[Dict[str, Any]] = None,
+            model_tier: str = "large", provider: Optional[ProviderConfig] = None) -> Any:
+        """
+        Call attempt(tier) for each tier until an output passes validation.
+
+        The last tier's output is returned even if it fails validation.
+
+        Args:
+            key: Agent name used for statistics and log messages
+            attempt: Produces an output for the given tier ("small" or "large")
+            rules: Validator rules (see validate_output)
+            model_tier: The agent's tier setting (see MODEL_TIERS)
+            provider: The run's provider settings (see tiers)
+        """
+        tiers = self.tiers(model_tier, provider)
+        for index, tier in enumerate(tiers):
+            output = attempt(tier)
+            problems = validate_output(output, rules)
+            if not problems or index == len(tiers) - 1:
+                self.record(key, tier, escalated=index > 0)
+                return output
+            if Config.VERBOSE:
+                print(f"   ↑ {key}: {tier} model output failed validation ({'; '.join(problems)}), escalating")
+
+    def record(self, key: str, tier: str, escalated: bool = False) -> None:
+        """Count which tier produced an accepted output"""
+        with self._lock:
+            stats = self._stats.setdefault(key, {"small": 0, "large": 0, "escalations": 0})
+            stats[tier] += 1
+            stats["escalations"] += int(escalated)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Accepted outputs per tier and escalation counts for every agent"""
+        with self._lock:
+            return {key: dict(stats) for key, stats in self._stats.items()}
+
+
+# Process-wide cascade shared by the AutoGen and CrewAI workflows
+MODEL_CASCADE = ModelCascade()
@@ -0,0 +1,162 @@
+"""
+Prompt Compiler for AutoGen and CrewAI Lab Demo
+
+Agent system messages, phase prompts and CrewAI goals/backstories are written
+as indented triple-quoted or concatenated strings. Sent as-is, every call pays
+for the source indentation, and per-run {placeholders} that sit ahead of
+static instructions break the shared prefix that provider-side prompt caching
+matches on. The compiler turns each template into its wire form once:
+
+1. Normalize whitespace: dedent, strip trailing spaces, collapse repeated
+   spaces and blank lines (relative indentation of nested lists is kept)
+2. Stable-prefix layout: paragraphs (or sentences) containing {placeholders}
+   are moved after the static ones, keeping their relative order
+
+Compiled templates are cached, and the compiler keeps a before/after
+token count for each one. Counts use tiktoken when it is installed and a
+~4 characters per token estimate otherwise.
+
+Usage:
+    from prompt_compiler import PROMPT_COMPILER
+
+    system_message = PROMPT_COMPILER.compile("ResearchAgent", raw_system_message)
+    PROMPT_COMPILER.print_report()
+"""
+
+import re
+import inspect
+import threading
+from typing import Dict, List, Any, Optional
+
+from shared_config import Config
+
+PLACEHOLDER_PATTERN = re.compile(r"\{[A-Za-z_][A-Za-z0-9_]*\}")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_INNER_SPACES = re.compile(r"(?<=\S)[ \t]{2,}")
+
+
+# ============================================================================
+# TRANSFORMS
+# ============================================================================
+
+def normalize_whitespace(text: str) -> str:
+    """Dedent a template and drop whitespace that carries no meaning."""
+    lines = [_INNER_SPACES.sub(" ", line.rstrip()) for line in inspect.cleandoc(text).splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def has_placeholder(text: str) -> bool:
+    """Whether text contains a {placeholder} filled in per run."""
+    return PLACEHOLDER_PATTERN.search(text) is not None
+
+
+def order_static_first(text: str, unit: str = "paragraph") -> str:
+    """
+    Move the units of text that contain {placeholders} after the static ones.
+
+    Args:
+        text: Normalized template text
+        unit: "paragraph" (split on blank lines) or "sentence" (for one-line
+            texts such as CrewAI backstories)
+    """
+    if unit == "paragraph":
+        parts, joiner = text.split("\n\n"), "\n\n"
+    elif unit == "sentence":
+        parts, joiner = _SENTENCE_END.split(text), " "
+    else:
+        raise ValueError(f"Unknown unit: {unit} (expected 'paragraph' or 'sentence')")
+
+    static = [part for part in parts if not has_placeholder(part)]
+    variable = [part for part in parts if has_placeholder(part)]
+    return joiner.join(static + variable)
+
+
+# ============================================================================
+# TOKEN COUNTING
+# ============================================================================
+
+_ENCODINGS: Dict[str, Any] = {}
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count for text with the model's tokenizer (estimated without tiktoken)."""
+    model = model or Config.OPENAI_MODEL
+    if model not in _ENCODINGS:
+        try:
+            import tiktoken
+            try:
+                _ENCODINGS[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _ENCODINGS[model] = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _ENCODINGS[model] = None
+    encoding = _ENCODINGS[model]
+    if encoding is None:
+        return max(1, round(len(text) / 4)) if text else 0
+    return len(encoding.encode(text))
+
+
+# ============================================================================
+# COMPILER
+# ============================================================================
+
+class PromptCompiler:
+    """Compiles prompt templates once and remembers their token savings"""
+
+    def __init__(self, model: Optional[str] = None):
+        """
+        Args:
+            model: Model whose tokenizer is used for the report (default: OPENAI_MODEL)
+        """
+        self.model = model
+        self._compiled: Dict[tuple, str] = {}
+        self._report: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, name: str, template: str, unit: str = "paragraph") -> str:
+        """
+        Compiled form of template, built on the first call for this template.
+
+        Args:
+            name: Report label (e.g. "ResearchAgent.system_message")
+            template: Raw template text; {placeholders} are left in place
+            unit: Reordering unit passed to order_static_first()
+        """
+        key = (name, template, unit)
+        with self._lock:
+            compiled = self._compiled.get(key)
+        if compiled is not None:
+            return compiled
+
+        compiled = order_static_first(normalize_whitespace(template), unit)
+        with self._lock:
+            self._compiled[key] = compiled
+            self._report[name] = {
+                "name": name,
+                "tokens_before": count_tokens(template, self.model),
+                "tokens_after": count_tokens(compiled, self.model),
+            }
+        return compiled
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Before/after token counts for every compiled template"""
+        with self._lock:
+            return [dict(entry) for entry in self._report.values()]
+
+    def print_report(self) -> None:
+        """Print the token counts of every compiled template"""
+        entries = self.report()
+        if not entries:
+            return
+        width = max(len(entry["name"]) for entry in entries)
+        print("📝 Prompt compilation (tokens before → after):")
+        for entry in entries:
+            saved = entry["tokens_before"] - entry["tokens_after"]
+            print(f"   {entry['name']:<{width}}  {entry['tokens_before']:>5} → {entry['tokens_after']:>5}  (-{saved})")
+        before = sum(entry["tokens_before"] for entry in entries)
+        after = sum(entry["tokens_after"] for entry in entries)
+        print(f"   {'Total':<{width}}  {before:>5} → {after:>5}  (-{before - after})")
+
+
+# Process-wide compiler shared by the AutoGen and CrewAI workflows
+PROMPT_COMPILER = PromptCompiler()
@@ -0,0 +1,339 @@
+"""
+Append-Only Run Archive for AutoGen and CrewAI Lab Demo
+
+Each run used to leave one or two timestamped text files behind
+(workflow_outputs_*.txt, summary_*.txt, crewai_output_<destination>.txt), and
+at our volume that means hundreds of thousands of small files. The archive
+keeps every run in a few large append-only segment files under ARCHIVE_DIR:
+
+- Each record is compressed on its own (zlib) and framed with a length and a
+  CRC, so a record can be read with one seek and a torn write is detected
+- Phase outputs are stored by content (SHA-256), so identical texts across
+  runs are stored once
+- A run record lists its workflow, timestamp, metadata and the content hash
+  of each output
+- index.db (SQLite) finds runs by id, workflow and timestamp and blobs by
+  hash. It can be rebuilt from the segments at any time.
+- With SEARCH_INDEX_RUNS, each run is also added to the search index
+  (search_index.py)
+
+Writes from several threads and processes are serialized with a lock file, so
+concurrent workers can share one archive.
+
+Usage:
+    python cli.py archive list --workflow travel --since 2026-01-01
+    python cli.py archive show <run_id>
+    python cli.py archive stats
+
+    from run_archive import get_archive
+    run_id = get_archive().put_run("travel", {"final": plan}, metadata={"destination": "Iceland"})
+    get_archive().get_run(run_id)["outputs"]["final"]
+"""
+
+import os
+import json
+import time
+import uuid
+import zlib
+import fcntl
+import struct
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from shared_config import Config
+
+MAGIC = b"RA01"
+HEADER = struct.Struct(">4sBII")   # magic, record kind, compressed length, CRC-32 of the compressed bytes
+KIND_BLOB = 1
+KIND_RUN = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash     TEXT PRIMARY KEY,
+    segment  INTEGER NOT NULL,
+    offset   INTEGER NOT NULL,
+    size     INTEGER NOT NULL,           -- uncompressed bytes
+    stored   INTEGER NOT NULL            -- compressed bytes on disk
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id   TEXT PRIMARY KEY,
+    workflow TEXT NOT NULL,
+    created  REAL NOT NULL,
+    segment  INTEGER NOT NULL,
+    offset   INTEGER NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_workflow_created ON runs (workflow, created);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+"""
+
+
+def content_hash(text: str) -> str:
+    """Content address of an output"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ArchiveCorrupted(Exception):
+    """Raised when a segment record fails its framing or checksum"""
+
+
+class RunArchive:
+    """Append-only, content-addressed store of workflow runs"""
+
+    def __init__(self, directory: Optional[str] = None, segment_bytes: Optional[int] = None):
+        """
+        Args:
+            directory: Archive directory (default: ARCHIVE_DIR)
+            segment_bytes: Size at which a new segment file is started (default: ARCHIVE_SEGMENT_BYTES)
+        """
+        self.directory = Path(directory or Config.ARCHIVE_DIR)
+        self.segment_bytes = segment_bytes or Config.ARCHIVE_SEGMENT_BYTES
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._write_lock():
+            db = self._connect()
+            try:
+                db.executescript(_SCHEMA)
+            finally:
+                db.close()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(str(self.directory / "index.db"), timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    @contextmanager
+    def _write_lock(self):
+        # The thread lock orders writers in this process; the file lock orders processes
+        with self._lock, open(self.directory / "archive.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"segment-{number:06d}.log"
+
+    def _segments(self) -> List[int]:
+        return sorted(int(path.stem.split("-")[1]) for path in self.directory.glob("segment-*.log"))
+
+    def _append(self, kind: int, payload: bytes) -> Tuple[int, int, int]:
+        """Append one compressed record to the active segment; returns (segment, offset, stored bytes)"""
+        segments = self._segments()
+        number = segments[-1] if segments else 1
+        if self._segment_path(number).exists() and self._segment_path(number).stat().st_size >= self.segment_bytes:
+            number += 1
+        data = zlib.compress(payload)
+        with open(self._segment_path(number), "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(HEADER.pack(MAGIC, kind, len(data), zlib.crc32(data)) + data)
+            f.flush()
+        return number, offset, len(data)
+
+    def _read(self, segment: int, offset: int) -> Tuple[int, bytes]:
+        """Read and decompress the record at offset; returns (kind, payload)"""
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return self._read_record(f)
+
+    @staticmethod
+    def _read_record(f) -> Tuple[int, bytes]:
+        header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise EOFError
+        magic, kind, length, crc = HEADER.unpack(header)
+        data = f.read(length)
+        if magic != MAGIC or len(data) < length or zlib.crc32(data) != crc:
+            raise ArchiveCorrupted(f"bad record at offset {f.tell() - len(data) - HEADER.size}")
+        return kind, zlib.decompress(data)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _put_blob(self, db: sqlite3.Connection, text: str) -> str:
+        digest = content_hash(text)
+        if db.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+            payload = text.encode("utf-8")
+            segment, offset, stored = self._append(KIND_BLOB, payload)
+            db.execute("INSERT INTO blobs VALUES (?, ?, ?, ?, ?)", (digest, segment, offset, len(payload), stored))
+        return digest
+
+    def put_run(self, workflow: str, outputs: Dict[str, Any], run_id: Optional[str] = None,
+                metadata: Optional[Dict[str, Any]] = None, created: Optional[float] = None) -> str:
+        """
+        Archive one run.
+
+        Args:
+            workflow: Workflow name, e.g. "interview", "interview-native" or "travel"
+            outputs: Phase/task name -> output text (stored deduplicated by content)
+            run_id: Id to store the run under (default: a new random id)
+            metadata: JSON-serializable run details, e.g. trip parameters or model
+            created: Run timestamp in epoch seconds (default: now)
+
+        Returns:
+            str: The run id
+        """
+        record = {
+            "run_id": run_id or uuid.uuid4().hex[:12],
+            "workflow": workflow,
+            "created": created or time.time(),
+            "metadata": metadata or {},
+        }
+        with self._write_lock():
+            db = self._connect()
+            try:
+                with db:
+                    record["outputs"] = {name: self._put_blob(db, str(text)) for name, text in outputs.items()}
+                    segment, offset, _ = self._append(KIND_RUN, json.dumps(record, default=str).encode("utf-8"))
+                    self._index_run(db, record, segment, offset)
+            finally:
+                db.close()
+
+        if Config.SEARCH_INDEX_RUNS:
+            # Keep the search index current; a failure here never loses the archived run
+            from search_index import get_search_index
+            try:
+                get_search_index().add_run(record["run_id"], workflow, record["created"], outputs, record["metadata"])
+            except sqlite3.Error as e:
+                print(f"⚠️  Could not index run {record['run_id']} for search: {e}")
+        return record["run_id"]
+
+    @staticmethod
+    def _index_run(db: sqlite3.Connection, record: Dict[str, Any], segment: int, offset: int) -> None:
+        db.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+            (record["run_id"], record["workflow"], record["created"], segment, offset,
+             json.dumps(record["metadata"], default=str)),
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def get_blob(self, digest: str) -> Optional[str]:
+        """Output text stored under a content hash"""
+        db = self._connect()
+        try:
+            row = db.execute("SELECT segment, offset FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        finally:
+            db.close()
+        return self._read(row["segment"], row["offset"])[1].decode("utf-8") if row else None
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """A run with its metadata and output texts, or None if unknown"""
+        db = self._connect()
+        try:
+            row = db.execute("SELECT segment, offset FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        record = json.loads(self._read(row["segment"], row["offset"])[1])
+        record["outputs"] = {name: self.get_blob(digest) for name, digest in record["outputs"].items()}
+        return record
+
+    def runs(self, workflow: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+             limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """Runs (without outputs), newest first, filtered by workflow and creation time"""
+        clauses, args = [], []
+        for clause, value in (("workflow = ?", workflow), ("created >= ?", since), ("created < ?", until)):
+            if value is not None:
+                clauses.append(clause)
+                args.append(value)
+        sql = "SELECT run_id, workflow, created, metadata FROM runs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        db = self._connect()
+        try:
+            return [{"run_id": row["run_id"], "workflow": row["workflow"], "created": row["created"],
+                     "metadata": json.loads(row["metadata"])} for row in db.execute(sql, args)]
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Run and blob counts, and how much compression and deduplication save"""
+        db = self._connect()
+        try:
+            runs = db.execute("SELECT COUNT(*) AS n FROM runs").fetchone()["n"]
+            blobs = db.execute("SELECT COUNT(*) AS n, SUM(size) AS size, SUM(stored) AS stored FROM blobs").fetchone()
+        finally:
+            db.close()
+        segments = self._segments()
+        return {
+            "runs": runs,
+            "unique_outputs": blobs["n"],
+            "output_bytes": blobs["size"] or 0,
+            "stored_bytes": blobs["stored"] or 0,
+            "segments": len(segments),
+            "segment_bytes": sum(self._segment_path(number).stat().st_size for number in segments),
+        }
+
+    def rebuild_index(self) -> int:
+        """Recreate index.db from the segment files; returns the number of runs found"""
+        with self._write_lock():
+            db = self._connect()
+            try:
+                with db:
+                    db.execute("DELETE FROM blobs")
+                    db.execute("DELETE FROM runs")
+                    for number in self._segments():
+                        self._reindex_segment(db, number)
+                return db.execute("SELECT COUNT(*) AS n FROM runs").fetchone()["n"]
+            finally:
+                db.close()
+
+    def _reindex_segment(self, db: sqlite3.Connection, number: int) -> None:
+        with open(self._segment_path(number), "rb") as f:
+            while True:
+                offset = f.tell()
+                try:
+                    kind, payload = self._read_record(f)
+                except EOFError:
+                    return
+                except ArchiveCorrupted:
+                    # A torn write can only be at the end of a segment
+                    print(f"⚠️  Ignoring damaged tail of {self._segment_path(number).name} at offset {offset}")
+                    return
+                if kind == KIND_BLOB:
+                    db.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?, ?, ?)",
+                               (content_hash(payload.decode("utf-8")), number, offset, len(payload),
+                                f.tell() - offset - HEADER.size))
+                elif kind == KIND_RUN:
+                    self._index_run(db, json.loads(payload), number, offset)
+
+
+_ARCHIVE: Optional[RunArchive] = None
+_ARCHIVE_LOCK = threading.Lock()
+
+
+def get_archive() -> RunArchive:
+    """Process-wide archive in ARCHIVE_DIR"""
+    global _ARCHIVE
+    with _ARCHIVE_LOCK:
+        if _ARCHIVE is None:
+            _ARCHIVE = RunArchive()
+        return _ARCHIVE
+
+
+def archive_reference(run_id: str) -> str:
+    """How an archived run is reported in place of an output file path"""
+    return f"archive:{run_id}"
+
+
+def parse_date(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds for a YYYY-MM-DD (or ISO) date string"""
+    return datetime.fromisoformat(value).timestamp() if value else None
@@ -0,0 +1,241 @@
+"""
+Run Deadlines and Cooperative Cancellation for AutoGen and CrewAI Lab Demo
+
+A RunContext carries one run-level deadline through every phase and task of a
+workflow:
+
+- Each LLM call gets a timeout shrunk to the time left in the run
+- Phases and crew steps check the context and stop once it is cancelled
+- Cancelling (explicitly or when the deadline passes) closes the run's HTTP
+  client, aborting in-flight requests sent through it
+- Outputs gathered so far are kept in partial_outputs
+- With RECORD_METRICS, each finished phase or task is logged with its time,
+  LLM calls and tokens (run_metrics.py)
+
+Usage:
+    from run_context import RunContext, RunCancelled
+
+    run_context = RunContext(deadline_seconds=120)
+    workflow = SimpleInterviewPlatformWorkflow(run_context=run_context)
+    outputs = workflow.run()          # Partial outputs if the deadline hits
+
+    # From another thread (e.g. a request handler whose caller went away)
+    run_context.cancel("client disconnected")
+"""
+
+import time
+import threading
+from typing import Dict, Any, Callable, Optional
+
+from shared_config import Config
+
+
+class RunCancelled(Exception):
+    """Raised inside a run once it has been cancelled"""
+
+
+class DeadlineExceeded(RunCancelled):
+    """Raised inside a run once its deadline has passed"""
+
+
+class RunContext:
+    """Deadline, cancellation flag and partial outputs for one workflow run"""
+
+    # Calls are not started with less than this much time left
+    MIN_CALL_TIMEOUT = 1.0
+
+    def __init__(self, deadline_seconds: Optional[float] = None,
+                 on_output: Optional[Callable[[str, Any], None]] = None,
+                 tenant: Optional[str] = None, priority: str = "interactive",
+                 workflow: Optional[str] = None, destination: Optional[str] = None):
+        """
+        Args:
+            deadline_seconds: Overall time budget for the run. Defaults to
+                Config.RUN_DEADLINE; 0 or None means no deadline.
+            on_output: Optional callback invoked with (name, output) each time a
+                phase or task finishes, e.g. to stream results to a client
+            tenant: Team the run's LLM calls are charged to (default: DEFAULT_TENANT)
+            priority: "interactive" or "batch"; see llm_scheduler.py
+            workflow: Workflow name for run metrics (engines fill it in when unset)
+            destination: Trip destination for run metrics (travel runs)
+        """
+        if deadline_seconds is None:
+            deadline_seconds = Config.RUN_DEADLINE
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds else None
+        self.partial_outputs: Dict[str, Any] = {}
+        self.on_output = on_output
+        self.tenant = tenant or Config.DEFAULT_TENANT
+        self.priority = priority
+        self.workflow = workflow
+        self.destination = destination
+        self.cancel_reason: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._http_client = None
+        self._lock = threading.Lock()
+        self._timer = None
+        self._phase_started = time.monotonic()
+        self._phase_usage = {"tokens": 0, "calls": 0, "model": None}
+        if self.deadline is not None:
+            self._timer = threading.Timer(deadline_seconds, self.cancel, args=("deadline exceeded",))
+            self._timer.daemon = True
+            self._timer.start()
+
+    # ------------------------------------------------------------------
+    # Deadline
+    # ------------------------------------------------------------------
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None when there is no deadline"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout_for(self, call_timeout: Optional[float] = None) -> float:
+        """
+        Timeout for the next call: the per-call timeout shrunk to the time left.
+
+        Raises:
+            RunCancelled: If the run is cancelled or too little time is left
+        """
+        self.check()
+        call_timeout = call_timeout or Config.AGENT_TIMEOUT
+        remaining = self.remaining()
+        if remaining is None:
+            return call_timeout
+        if remaining < self.MIN_CALL_TIMEOUT:
+            self.cancel("deadline exceeded")
+            self.check()
+        return min(call_timeout, remaining)
+
+    # ------------------------------------------------------------------
+    # Cancellation
+    # ------------------------------------------------------------------
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        """Raise if the run has been cancelled or its deadline has passed"""
+        if not self._cancelled.is_set() and self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline exceeded")
+        if self._cancelled.is_set():
+            if self.cancel_reason == "deadline exceeded":
+                raise DeadlineExceeded(self.cancel_reason)
+            raise RunCancelled(self.cancel_reason)
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Cancel the run and abort in-flight HTTP requests sent through it"""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self.cancel_reason = reason
+            self._cancelled.set()
+            http_client, self._http_client = self._http_client, None
+        if self._timer is not None:
+            self._timer.cancel()
+        if http_client is not None:
+            http_client.close()
+
+    def close(self) -> None:
+        """Release the deadline timer and HTTP client once the run is over"""
+        if self._timer is not None:
+            self._timer.cancel()
+        with self._lock:
+            http_client, self._http_client = self._http_client, None
+        if http_client is not None:
+            http_client.close()
+
+    def http_client(self):
+        """HTTP client owned by this run; closing it aborts the run's requests"""
+        with self._lock:
+            if self._cancelled.is_set():
+                raise RunCancelled(self.cancel_reason)
+            if self._http_client is None:
+                import httpx
+                self._http_client = httpx.Client(timeout=None)
+            return self._http_client
+
+    def bind_client(self, client):
+        """Return a copy of an OpenAI client that sends requests through this run"""
+        return client.with_options(http_client=self.http_client())
+
+    # ------------------------------------------------------------------
+    # Outputs
+    # ------------------------------------------------------------------
+
+    def label(self, workflow: str, destination: Optional[str] = None) -> None:
+        """Set the workflow (and destination) run metrics are filed under, unless already set"""
+        self.workflow = self.workflow or workflow
+        self.destination = self.destination or destination
+
+    def record_usage(self, tokens: int, model: Optional[str] = None) -> None:
+        """Charge one LLM call to the phase in progress (called by the LLM scheduler)"""
+        with self._lock:
+            self._phase_usage["tokens"] += tokens
+            self._phase_usage["calls"] += 1
+            self._phase_usage["model"] = model or self._phase_usage["model"]
+
+    def record_output(self, name: str, output: Any) -> None:
+        """Keep a finished phase/task output and pass it to on_output"""
+        self.partial_outputs[name] = output
+        self._record_phase_metrics(name)
+        if self.on_output is not None:
+            self.on_output(name, output)
+
+    def _record_phase_metrics(self, name: str) -> None:
+        """Log the phase that just finished and start timing the next one"""
+        now = time.monotonic()
+        with self._lock:
+            seconds, self._phase_started = now - self._phase_started, now
+            usage, self._phase_usage = self._phase_usage, {"tokens": 0, "calls": 0, "model": None}
+        if not Config.RECORD_METRICS:
+            return
+        from run_metrics import get_metrics_log
+        try:
+            get_metrics_log().record(name, seconds, usage["tokens"], usage["calls"], workflow=self.workflow,
+                                     model=usage["model"], destination=self.destination, tenant=self.tenant)
+        except OSError as e:
+            print(f"⚠️  Could not record run metrics: {e}")
+
+    # ------------------------------------------------------------------
+    # Running blocking work
+    # ------------------------------------------------------------------
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Call fn in a worker thread and wait until it finishes or the run is cancelled.
+
+        Used for framework calls (AutoGen generate_reply, CrewAI kickoff) whose HTTP
+        requests cannot be aborted from outside. On cancellation the caller gets
+        RunCancelled immediately; the worker thread is abandoned and stops at its
+        next cooperative check.
+        """
+        self.check()
+        result = {}
+        finished = threading.Event()
+
+        def target():
+            try:
+                result["value"] = fn(*args, **kwargs)
+            except BaseException as e:
+                result["error"] = e
+            finally:
+                finished.set()
+
+        threading.Thread(target=target, daemon=True, name="run-context-worker").start()
+        while not finished.wait(timeout=0.1):
+            self.check()
+        if "error" in result:
+            raise result["error"]
+        return result["value"]
+
+    def crew_step_callback(self, step_output: Any) -> None:
+        """CrewAI step_callback: stops the crew at the next agent step once cancelled"""
+        self.check()
+
+    def crew_task_callback(self, task_output: Any) -> None:
+        """CrewAI task_callback: keeps each finished task's output as a partial result"""
+        name = getattr(task_output, "agent", None) or f"task_{len(self.partial_outputs) + 1}"
+        self.record_output(str(name), str(getattr(task_output, "raw", task_output)))
+        self.check()
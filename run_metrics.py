@@ -0,0 +1,298 @@
+"""
+Columnar Run Metrics for AutoGen and CrewAI Lab Demo
+
+Every finished phase (or crew task) of a run records one fixed-width row:
+when it finished, how long it took, how many LLM calls and tokens it used,
+and which workflow, phase, model, destination and tenant it belonged to.
+Rows are appended to METRICS_DIR/phases.bin, 28 bytes each, with the text
+columns stored as small integer codes (their values are listed once in
+strings.tsv). A million phase records take 28 MB on disk.
+
+Analysis loads phases.bin as NumPy column arrays, memory-mapped so only the
+columns a query touches are read. Group-bys and percentiles are vectorized:
+rows are sorted once by (group, value), and every group's count, sum, mean,
+max and percentiles are read from the sorted array without a Python loop
+over rows. Besides the stored columns, "hour" (local hour of day, 0-23) and
+"day" can be grouped on.
+
+Usage:
+    python cli.py metrics --by phase                         # p50/p95 phase seconds
+    python cli.py metrics --by model,hour --measure tokens
+    python cli.py metrics --by destination --workflow travel --since 2026-01-01
+
+    from run_metrics import load_metrics
+    frame = load_metrics().filter(workflow="travel")
+    frame.group_by(["phase"], "seconds", percentiles=(50, 95))
+"""
+
+import time
+import fcntl
+import struct
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Sequence
+
+from shared_config import Config
+
+# Row layout (little-endian, packed): finished, seconds, tokens, calls, then one code per dimension
+RECORD = struct.Struct("<dfIHHHHHH")
+DIMENSIONS = ("workflow", "phase", "model", "destination", "tenant")
+MEASURES = ("seconds", "tokens", "calls")
+DERIVED = ("hour", "day")
+MAX_CODES = 65535
+
+
+def record_dtype():
+    """NumPy dtype matching RECORD"""
+    import numpy as np
+    return np.dtype([("finished", "<f8"), ("seconds", "<f4"), ("tokens", "<u4"), ("calls", "<u2")]
+                    + [(name, "<u2") for name in DIMENSIONS])
+
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+class MetricsLog:
+    """Append-only phase metrics file shared by threads and processes"""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: Where phases.bin and strings.tsv live (default: METRICS_DIR)
+        """
+        self.directory = Path(directory or Config.METRICS_DIR)
+        self.path = self.directory / "phases.bin"
+        self.strings_path = self.directory / "strings.tsv"
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in DIMENSIONS}
+        self._strings_offset = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _write_lock(self):
+        """Hold the thread lock and an exclusive lock on metrics.lock"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.directory / "metrics.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_strings(self) -> None:
+        """Read the dictionary entries other processes appended since the last read"""
+        if not self.strings_path.exists():
+            return
+        with open(self.strings_path, encoding="utf-8") as f:
+            f.seek(self._strings_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                column, value = line[:-1].split("\t", 1)
+                codes = self._codes[column]
+                codes.setdefault(value, len(codes))
+                self._strings_offset += len(line.encode("utf-8"))
+
+    def _code(self, column: str, value: Optional[str]) -> int:
+        """Code of a dimension value, adding it to strings.tsv if it is new"""
+        value = " ".join(str(value or "").split())
+        codes = self._codes[column]
+        if value not in codes:
+            if len(codes) >= MAX_CODES:
+                value = "(other)"
+                if value in codes:
+                    return codes[value]
+            line = f"{column}\t{value}\n"
+            with open(self.strings_path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._strings_offset += len(line.encode("utf-8"))
+            codes[value] = len(codes)
+        return codes[value]
+
+    def record(self, phase: str, seconds: float, tokens: int = 0, calls: int = 0,
+               workflow: Optional[str] = None, model: Optional[str] = None,
+               destination: Optional[str] = None, tenant: Optional[str] = None,
+               finished: Optional[float] = None) -> None:
+        """Append one phase record"""
+        with self._write_lock():
+            self._load_strings()
+            labels = {"workflow": workflow, "phase": phase, "model": model,
+                      "destination": destination, "tenant": tenant}
+            row = RECORD.pack(finished or time.time(), seconds, min(int(tokens), 2 ** 32 - 1),
+                              min(int(calls), MAX_CODES), *(self._code(name, labels[name]) for name in DIMENSIONS))
+            with open(self.path, "ab") as f:
+                f.write(row)
+
+    def strings(self) -> Dict[str, List[str]]:
+        """Dimension values by code, per column"""
+        with self._lock:
+            self._load_strings()
+            return {column: list(codes) for column, codes in self._codes.items()}
+
+
+_METRICS_LOG: Optional[MetricsLog] = None
+_METRICS_LOG_LOCK = threading.Lock()
+
+
+def get_metrics_log() -> MetricsLog:
+    """Process-wide metrics log in METRICS_DIR"""
+    global _METRICS_LOG
+    with _METRICS_LOG_LOCK:
+        if _METRICS_LOG is None:
+            _METRICS_LOG = MetricsLog()
+        return _METRICS_LOG
+
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+class MetricsFrame:
+    """Column arrays of phase records with vectorized filters and group-bys"""
+
+    def __init__(self, rows, strings: Dict[str, List[str]]):
+        """
+        Args:
+            rows: Structured array (or memmap) with record_dtype()
+            strings: Dimension values by code (MetricsLog.strings())
+        """
+        self.rows = rows
+        self.strings = strings
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def column(self, name: str):
+        """A stored column, or a derived one ("hour", "day")"""
+        import numpy as np
+        if name == "hour":
+            return ((self.rows["finished"] + _utc_offset()) // 3600 % 24).astype(np.uint8)
+        if name == "day":
+            return ((self.rows["finished"] + _utc_offset()) // 86400).astype(np.int32)
+        return self.rows[name]
+
+    def label(self, name: str, code: int) -> str:
+        """Display value of a group key"""
+        if name == "hour":
+            return f"{int(code):02d}:00"
+        if name == "day":
+            return time.strftime("%Y-%m-%d", time.gmtime(int(code) * 86400))
+        values = self.strings.get(name, [])
+        return (values[code] if code < len(values) else f"#{code}") or "-"
+
+    def filter(self, since: Optional[float] = None, until: Optional[float] = None,
+               **equals: str) -> "MetricsFrame":
+        """Rows finished in [since, until) whose dimensions equal the given values"""
+        import numpy as np
+        mask = np.ones(len(self.rows), dtype=bool)
+        if since is not None:
+            mask &= self.rows["finished"] >= since
+        if until is not None:
+            mask &= self.rows["finished"] < until
+        for name, value in equals.items():
+            if name not in DIMENSIONS:
+                raise ValueError(f"Unknown dimension: {name} (expected one of {', '.join(DIMENSIONS)})")
+            if value is None:
+                continue
+            codes = [code for code, text in enumerate(self.strings.get(name, [])) if text.lower() == value.lower()]
+            mask &= np.isin(self.rows[name], codes)
+        return MetricsFrame(self.rows[mask], self.strings)
+
+    def group_by(self, by: Sequence[str], measure: str = "seconds",
+                 percentiles: Sequence[float] = (50, 95)) -> List[Dict[str, Any]]:
+        """
+        Aggregate a measure per group.
+
+        Returns:
+            List[Dict[str, Any]]: One dict per group, largest count first, with
+            the group's values and count, sum, mean, max and p<N> of the measure
+        """
+        import numpy as np
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown measure: {measure} (expected one of {', '.join(MEASURES)})")
+        for name in by:
+            if name not in DIMENSIONS + DERIVED:
+                raise ValueError(f"Unknown dimension: {name} (expected one of {', '.join(DIMENSIONS + DERIVED)})")
+        if not len(self.rows):
+            return []
+
+        values = np.asarray(self.rows[measure], dtype=np.float64)
+        # Pack the group columns into one int64 key (mixed radix), so grouping is a 1-D unique
+        keys = [np.asarray(self.column(name), dtype=np.int64) for name in by]
+        radixes = [int(key.max()) + 1 for key in keys]
+        packed = np.zeros(len(values), dtype=np.int64)
+        for key, radix in zip(keys, radixes):
+            packed = packed * radix + key
+        unique_packed, inverse = np.unique(packed, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        group_keys = np.zeros((len(unique_packed), len(keys)), dtype=np.int64)
+        for position in range(len(keys) - 1, -1, -1):
+            group_keys[:, position] = unique_packed % radixes[position]
+            unique_packed = unique_packed // radixes[position]
+
+        # One sort by (group, value) puts every group's values in order, side by side
+        order = np.lexsort((values, inverse))
+        sorted_values = values[order]
+        counts = np.bincount(inverse, minlength=len(group_keys))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.bincount(inverse, weights=values, minlength=len(group_keys))
+        columns = {"count": counts, "sum": sums, "mean": sums / counts,
+                   "max": sorted_values[starts + counts - 1]}
+        for q in percentiles:
+            position = starts + (counts - 1) * (q / 100.0)
+            low = np.floor(position).astype(np.int64)
+            high = np.ceil(position).astype(np.int64)
+            columns[f"p{q:g}"] = sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+        groups = []
+        for index in np.argsort(-counts, kind="stable"):
+            group = {name: self.label(name, group_keys[index][position]) for position, name in enumerate(by)}
+            group.update({stat: (int(column[index]) if stat == "count" else float(column[index]))
+                          for stat, column in columns.items()})
+            groups.append(group)
+        return groups
+
+
+def _utc_offset() -> int:
+    """Local UTC offset in seconds (for hour-of-day and day groups)"""
+    return time.localtime().tm_gmtoff
+
+
+def load_metrics(directory: Optional[str] = None, mmap: bool = True) -> MetricsFrame:
+    """
+    Load the phase records as a MetricsFrame.
+
+    Args:
+        directory: Metrics directory (default: METRICS_DIR)
+        mmap: Memory-map phases.bin instead of reading it into memory
+    """
+    import numpy as np
+    log = MetricsLog(directory)
+    dtype = record_dtype()
+    size = log.path.stat().st_size if log.path.exists() else 0
+    count = size // dtype.itemsize  # A torn trailing row is ignored
+    if count == 0:
+        rows = np.zeros(0, dtype=dtype)
+    elif mmap:
+        rows = np.memmap(log.path, dtype=dtype, mode="r", shape=(count,))
+    else:
+        rows = np.fromfile(log.path, dtype=dtype, count=count)
+    return MetricsFrame(rows, log.strings())
+
+
+def format_report(groups: List[Dict[str, Any]], by: Sequence[str], measure: str = "seconds") -> str:
+    """Fixed-width table of group_by results"""
+    if not groups:
+        return "No metrics recorded"
+    stats = [key for key in groups[0] if key not in by]
+    widths = {name: max(len(name), *(len(group[name]) for group in groups)) for name in by}
+    lines = ["  ".join([name.ljust(widths[name]) for name in by] + [stat.rjust(10) for stat in stats])]
+    for group in groups:
+        cells = [group[name].ljust(widths[name]) for name in by]
+        for stat in stats:
+            value = group[stat]
+            cells.append(f"{value:>10d}" if stat == "count" else
+                         f"{value:>10.0f}" if measure != "seconds" or stat == "sum" else f"{value:>10.2f}")
+        lines.append("  ".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,457 @@
+"""
+Search Index over Workflow Outputs for AutoGen and CrewAI Lab Demo
+
+Answers questions such as "which past blueprints mentioned HireVue" or "all
+Iceland budgets under $5k" without grepping output files. Every archived run
+(see run_archive.py) is added to the index as it is saved. Each phase or task
+output becomes one document with these fields:
+
+    workflow     interview, interview-native, interview-simple, travel, ...
+    phase        Output name: the phase for interviews, the agent role for crews
+                 (agent: is an alias)
+    destination  Travel destination, from the run metadata
+    created      Run timestamp
+    amount       Stated total: the selected budget tier's total when the text
+                 has one, else the largest amount on a "total" line, else the
+                 largest dollar amount in the text
+
+Queries combine words, "quoted phrases" and field filters:
+
+    hirevue phase:blueprint
+    "video interviews" workflow:interview since:2026-01-01
+    destination:iceland amount<5000 until:2026-03-01
+
+Backends (SEARCH_BACKEND):
+- "inverted": positional inverted index in SQLite tables (term -> documents
+  and positions); works with any SQLite build
+- "fts5":     SQLite FTS5 full-text index with highlighted snippets
+- "auto":     fts5 when the SQLite build includes it, else inverted
+
+Usage:
+    python cli.py search 'hirevue phase:blueprint'
+    python cli.py search 'destination:iceland amount<5000'
+    python cli.py search --rebuild                   # re-index the whole run archive
+    python cli.py search --import autogen/workflow_outputs_*.txt crewai/crewai_output*.txt
+
+    from search_index import get_search_index
+    for hit in get_search_index().search('"video interviews" phase:research'):
+        print(hit["run_id"], hit["snippet"])
+"""
+
+import re
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from shared_config import Config
+
+_WORD = re.compile(r"[a-z0-9]+")
+_AMOUNT = re.compile(r"\$\s?(\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?\s*([kK]\b)?")
+_SELECTED_TOTAL = re.compile(r"selected tier[^:\n]*:([^\n]*)", re.IGNORECASE)
+_QUERY = re.compile(r'(\w+)(<=|>=|<|>|:)("[^"]*"|\S+)|"([^"]*)"|(\S+)')
+
+FIELD_ALIASES = {"agent": "phase", "run": "run_id"}
+TEXT_FIELDS = ("workflow", "phase", "destination", "run_id")
+
+_DOCS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id      INTEGER PRIMARY KEY,
+    run_id      TEXT NOT NULL,
+    workflow    TEXT NOT NULL,
+    phase       TEXT NOT NULL,
+    destination TEXT,
+    created     REAL NOT NULL,
+    amount      REAL,
+    text        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_run ON docs (run_id);
+CREATE INDEX IF NOT EXISTS docs_created ON docs (created);
+CREATE INDEX IF NOT EXISTS docs_fields ON docs (workflow, phase, destination);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, shared by indexing and querying"""
+    return _WORD.findall(text.lower())
+
+
+def largest_amount(text: str) -> Optional[float]:
+    """Largest dollar amount in a text ("$4,850", "$5k"), or None"""
+    amounts = [float(number.replace(",", "")) * (1000 if thousands else 1)
+               for number, thousands in _AMOUNT.findall(text)]
+    return max(amounts) if amounts else None
+
+
+def stated_amount(text: str) -> Optional[float]:
+    """
+    The amount a document's amount<N / amount>N filters compare against.
+
+    A budget lists every tier, so its largest figure is usually the luxury
+    column; the selected tier ("Selected tier (mid-range): $4,341 total")
+    is the trip's actual total when the budget calculator stated one.
+    """
+    selected = _SELECTED_TOTAL.search(text)
+    first = _AMOUNT.search(selected.group(1)) if selected else None
+    if first:
+        return largest_amount(first.group())
+    totals = [amount for amount in (largest_amount(line) for line in text.splitlines() if "total" in line.lower())
+              if amount is not None]
+    return max(totals) if totals else largest_amount(text)
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """
+    Split a query into words, phrases and filters.
+
+    Returns:
+        Dict[str, Any]: {"words": [...], "phrases": [[...], ...],
+                         "fields": {field: value}, "since", "until", "amount": [(op, value), ...]}
+    """
+    parsed = {"words": [], "phrases": [], "fields": {}, "since": None, "until": None, "amount": []}
+    for field, op, value, phrase, word in _QUERY.findall(query):
+        if phrase:
+            parsed["phrases"].append(tokenize(phrase))
+        elif word:
+            parsed["words"].extend(tokenize(word))
+        else:
+            field = FIELD_ALIASES.get(field.lower(), field.lower())
+            value = value.strip('"')
+            if field in ("since", "until") and op == ":":
+                parsed[field] = datetime.fromisoformat(value).timestamp()
+            elif field == "amount" and op != ":":
+                parsed["amount"].append((op, largest_amount("$" + value.lstrip("$")) or 0.0))
+            elif field in TEXT_FIELDS and op == ":":
+                parsed["fields"][field] = value.lower()
+            else:
+                raise ValueError(f"Unsupported filter: {field}{op}{value}")
+    return parsed
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+class SearchIndex:
+    """Documents table shared by the backends; subclasses index and match text"""
+
+    backend = None
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Index database (default: SEARCH_DB)
+        """
+        self.path = path or Config.SEARCH_DB
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        db = self._connect()
+        try:
+            db.executescript(_DOCS_SCHEMA)
+            self._create_schema(db)
+        finally:
+            db.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30)
+        db.row_factory = sqlite3.Row
+        return db
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+
+    def add_run(self, run_id: str, workflow: str, created: float, outputs: Dict[str, str],
+                metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Index (or re-index) every output of one run"""
+        destination = str((metadata or {}).get("destination") or "").lower() or None
+        with self._lock:
+            db = self._connect()
+            try:
+                with db:
+                    self._delete_run(db, run_id)
+                    for phase, text in outputs.items():
+                        text = str(text)
+                        doc_id = db.execute(
+                            "INSERT INTO docs (run_id, workflow, phase, destination, created, amount, text) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (run_id, workflow, phase.lower(), destination, created, stated_amount(text), text),
+                        ).lastrowid
+                        self._index_text(db, doc_id, text)
+            finally:
+                db.close()
+
+    def _delete_run(self, db: sqlite3.Connection, run_id: str) -> None:
+        docs = db.execute("SELECT doc_id, text FROM docs WHERE run_id = ?", (run_id,)).fetchall()
+        for row in docs:
+            self._unindex(db, row["doc_id"], row["text"])
+        db.execute("DELETE FROM docs WHERE run_id = ?", (run_id,))
+
+    def rebuild_from_archive(self, archive=None) -> int:
+        """Index every run in the archive; returns the number of runs indexed"""
+        if archive is None:
+            from run_archive import get_archive
+            archive = get_archive()
+        count = 0
+        for run in archive.runs(limit=None):
+            record = archive.get_run(run["run_id"])
+            self.add_run(record["run_id"], record["workflow"], record["created"], record["outputs"],
+                         record["metadata"])
+            count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    # Searching
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Documents matching a query, newest first.
+
+        Returns:
+            List[Dict[str, Any]]: {"run_id", "workflow", "phase", "destination",
+                                   "created", "amount", "snippet"} per match
+
+        Raises:
+            ValueError: If the query uses an unknown filter
+        """
+        parsed = parse_query(query)
+        where, args = ["1 = 1"], []
+        for field, value in parsed["fields"].items():
+            where.append(f"d.{field} = ?")
+            args.append(value)
+        if parsed["since"] is not None:
+            where.append("d.created >= ?")
+            args.append(parsed["since"])
+        if parsed["until"] is not None:
+            where.append("d.created < ?")
+            args.append(parsed["until"])
+        for op, value in parsed["amount"]:
+            where.append(f"d.amount {op} ?")
+            args.append(value)
+
+        db = self._connect()
+        try:
+            return self._match(db, parsed["words"], parsed["phrases"], " AND ".join(where), args, limit)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _hit(row: sqlite3.Row, snippet: str) -> Dict[str, Any]:
+        return {
+            "run_id": row["run_id"],
+            "workflow": row["workflow"],
+            "phase": row["phase"],
+            "destination": row["destination"],
+            "created": row["created"],
+            "amount": row["amount"],
+            "snippet": snippet,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend and document and run counts"""
+        db = self._connect()
+        try:
+            row = db.execute("SELECT COUNT(*) AS docs, COUNT(DISTINCT run_id) AS runs FROM docs").fetchone()
+        finally:
+            db.close()
+        return {"backend": self.backend, "documents": row["docs"], "runs": row["runs"]}
+
+    # Backend hooks
+    def _create_schema(self, db: sqlite3.Connection) -> None:
+        raise NotImplementedError
+
+    def _index_text(self, db: sqlite3.Connection, doc_id: int, text: str) -> None:
+        raise NotImplementedError
+
+    def _unindex(self, db: sqlite3.Connection, doc_id: int, text: str) -> None:
+        raise NotImplementedError
+
+    def _match(self, db: sqlite3.Connection, words: List[str], phrases: List[List[str]],
+               where: str, args: List[Any], limit: int) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class InvertedIndex(SearchIndex):
+    """Positional inverted index stored in plain SQLite tables"""
+
+    backend = "inverted"
+
+    def _create_schema(self, db: sqlite3.Connection) -> None:
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            "term TEXT NOT NULL, doc_id INTEGER NOT NULL, positions TEXT NOT NULL, "
+            "PRIMARY KEY (term, doc_id)) WITHOUT ROWID"
+        )
+
+    def _index_text(self, db: sqlite3.Connection, doc_id: int, text: str) -> None:
+        positions: Dict[str, List[int]] = {}
+        for position, term in enumerate(tokenize(text)):
+            positions.setdefault(term, []).append(position)
+        db.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                       [(term, doc_id, " ".join(map(str, found))) for term, found in positions.items()])
+
+    def _unindex(self, db: sqlite3.Connection, doc_id: int, text: str) -> None:
+        # Postings are keyed by term first, so delete them term by term
+        db.executemany("DELETE FROM postings WHERE term = ? AND doc_id = ?",
+                       [(term, doc_id) for term in set(tokenize(text))])
+
+    def _match(self, db, words, phrases, where, args, limit):
+        terms = sorted(set(words + [term for phrase in phrases for term in phrase]))
+        sql = "SELECT d.* FROM docs d WHERE " + where
+        sql += "".join(" AND d.doc_id IN (SELECT doc_id FROM postings WHERE term = ?)" for _ in terms)
+        sql += " ORDER BY d.created DESC"
+
+        hits = []
+        for row in db.execute(sql, args + terms):
+            match = None
+            if phrases:
+                positions = self._positions(db, row["doc_id"], terms)
+                starts = [self._phrase_start(positions, phrase) for phrase in phrases]
+                if None in starts:
+                    continue
+                match = starts[0]
+            hits.append(self._hit(row, self._snippet(row["text"], match, terms)))
+            if len(hits) >= limit:
+                break
+        return hits
+
+    @staticmethod
+    def _positions(db: sqlite3.Connection, doc_id: int, terms: List[str]) -> Dict[str, set]:
+        placeholders = ", ".join("?" for _ in terms)
+        rows = db.execute(f"SELECT term, positions FROM postings WHERE doc_id = ? AND term IN ({placeholders})",
+                          [doc_id] + terms)
+        return {row["term"]: set(map(int, row["positions"].split())) for row in rows}
+
+    @staticmethod
+    def _phrase_start(positions: Dict[str, set], phrase: List[str]) -> Optional[int]:
+        """Token position where the phrase starts in the document, or None"""
+        if not phrase:
+            return 0
+        for start in sorted(positions.get(phrase[0], ())):
+            if all(start + offset in positions.get(term, ()) for offset, term in enumerate(phrase)):
+                return start
+        return None
+
+    @staticmethod
+    def _snippet(text: str, position: Optional[int], terms: List[str], width: int = 12) -> str:
+        words = text.split()
+        if position is None:
+            position = next((index for index, word in enumerate(words) if set(tokenize(word)) & set(terms)), 0)
+        # Whitespace words and tokens line up closely enough for a preview
+        start = max(0, position - width // 2)
+        return ("… " if start else "") + " ".join(words[start:start + width]) + " …"
+
+
+class FTS5Index(SearchIndex):
+    """SQLite FTS5 full-text index"""
+
+    backend = "fts5"
+
+    def _create_schema(self, db: sqlite3.Connection) -> None:
+        db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5(text, tokenize = 'unicode61')")
+
+    def _index_text(self, db: sqlite3.Connection, doc_id: int, text: str) -> None:
+        db.execute("INSERT INTO fts (rowid, text) VALUES (?, ?)", (doc_id, text))
+
+    def _unindex(self, db: sqlite3.Connection, doc_id: int, text: str) -> None:
+        db.execute("DELETE FROM fts WHERE rowid = ?", (doc_id,))
+
+    def _match(self, db, words, phrases, where, args, limit):
+        terms = [f'"{word}"' for word in words] + ['"' + " ".join(phrase) + '"' for phrase in phrases if phrase]
+        if not terms:
+            sql = f"SELECT d.*, substr(d.text, 1, 120) AS snippet FROM docs d WHERE {where} " \
+                  f"ORDER BY d.created DESC LIMIT ?"
+            return [self._hit(row, row["snippet"] + " …") for row in db.execute(sql, args + [limit])]
+        sql = (f"SELECT d.*, snippet(fts, 0, '[', ']', '…', 12) AS snippet FROM fts "
+               f"JOIN docs d ON d.doc_id = fts.rowid WHERE fts MATCH ? AND {where} "
+               f"ORDER BY d.created DESC LIMIT ?")
+        return [self._hit(row, row["snippet"]) for row in db.execute(sql, [" AND ".join(terms)] + args + [limit])]
+
+
+def fts5_available() -> bool:
+    """Whether this Python's SQLite build includes FTS5"""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def create_search_index(backend: Optional[str] = None, path: Optional[str] = None) -> SearchIndex:
+    """Search index for SEARCH_BACKEND ("auto", "fts5" or "inverted")"""
+    backend = (backend or Config.SEARCH_BACKEND).lower()
+    if backend == "auto":
+        backend = "fts5" if fts5_available() else "inverted"
+    if backend == "fts5":
+        return FTS5Index(path)
+    if backend == "inverted":
+        return InvertedIndex(path)
+    raise ValueError(f"Unknown search backend: {backend} (expected auto, fts5 or inverted)")
+
+
+_INDEX: Optional[SearchIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """Process-wide search index in SEARCH_DB"""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = create_search_index()
+        return _INDEX
+
+
+# ============================================================================
+# LEGACY OUTPUT FILES
+# ============================================================================
+
+_PHASE_HEADING = re.compile(r"^PHASE (\d): .*\n-{20,}\n", re.MULTILINE)
+_INTERVIEW_PHASES = ("research", "analysis", "blueprint", "review")
+
+
+def parse_output_file(path: str) -> Tuple[str, float, Dict[str, str], Dict[str, Any]]:
+    """
+    Read a workflow_outputs_*.txt or crewai_output*.txt report.
+
+    Returns:
+        Tuple: (workflow, created, outputs, metadata)
+    """
+    text = Path(path).read_text(errors="replace")
+    created = Path(path).stat().st_mtime
+    stamp = re.search(r"^(?:Generated|Execution Time): (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})", text, re.MULTILINE)
+    if stamp:
+        created = datetime.fromisoformat(stamp.group(1)).timestamp()
+
+    headings = list(_PHASE_HEADING.finditer(text))
+    if headings:
+        outputs = {}
+        for index, heading in enumerate(headings):
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(text)
+            phase = _INTERVIEW_PHASES[int(heading.group(1)) - 1] if int(heading.group(1)) <= 4 else heading.group(1)
+            outputs[phase] = text[heading.end():end].strip()
+        return "interview", created, outputs, {}
+
+    destination = re.search(r"^\s*Destination: (.+)$|Trip to (.+)$", text, re.MULTILINE)
+    metadata = {"destination": (destination.group(1) or destination.group(2)).strip()} if destination else {}
+    report = text.split("FINAL TRAVEL PLAN REPORT:", 1)[-1].strip().strip("-").strip()
+    return "travel", created, {"final": report}, metadata
+
+
+def import_output_files(paths: List[str], index: Optional[SearchIndex] = None) -> int:
+    """Index old per-run report files under run ids taken from their file names"""
+    index = index or get_search_index()
+    for path in paths:
+        workflow, created, outputs, metadata = parse_output_file(path)
+        index.add_run(f"file:{Path(path).name}", workflow, created, outputs, metadata)
+    return len(paths)
+
+
+def timed_search(query: str, limit: int = 20, index: Optional[SearchIndex] = None) -> Tuple[List[Dict[str, Any]], float]:
+    """Search and return the hits with the elapsed milliseconds"""
+    started = time.perf_counter()
+    hits = (index or get_search_index()).search(query, limit)
+    return hits, (time.perf_counter() - started) * 1000
@@ -14,11 +14,17 @@ Usage:
     # Use configuration
     api_key = Config.OPENAI_API_KEY
     config_list = Config.get_config_list()  # For AutoGen
+
+    # Per-run provider settings (immutable, never written to os.environ)
+    provider = ProviderConfig.from_env().override(model="gpt-4o-mini")
 """
 
 import os
+import json
+import dataclasses
 from pathlib import Path
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Tuple
 from dotenv import load_dotenv
 
 
@@ -63,6 +69,98 @@ class Config:
     AGENT_TEMPERATURE = float(os.getenv("AGENT_TEMPERATURE", "0.7"))
     AGENT_MAX_TOKENS = int(os.getenv("AGENT_MAX_TOKENS", "2000"))
     AGENT_TIMEOUT = int(os.getenv("AGENT_TIMEOUT", "300"))
+    RUN_DEADLINE = float(os.getenv("RUN_DEADLINE", "0"))  # Whole-run budget in seconds, 0 = none
+    # Cheap-first model cascade (model_cascade.py): phases try SMALL_MODEL first and
+    # escalate to OPENAI_MODEL when their validator fails; empty = always the large model
+    SMALL_MODEL = os.getenv("SMALL_MODEL", "")
+    # Adaptive max_tokens (token_planner.py): budget = this percentile of past completion lengths
+    TOKEN_PLAN_PERCENTILE = float(os.getenv("TOKEN_PLAN_PERCENTILE", "95"))
+    TOKEN_HISTORY_FILE = os.getenv("TOKEN_HISTORY_FILE", str(Path(__file__).parent / ".token_history.json"))
+    # Cross-trip task memoization (task_memo.py): trips reuse task outputs with identical inputs
+    TASK_MEMO = os.getenv("TASK_MEMO", "True").lower() == "true"
+    TASK_MEMO_DB = os.getenv("TASK_MEMO_DB", str(Path(__file__).parent / "task_memo.db"))
+    TASK_MEMO_TTL = float(os.getenv("TASK_MEMO_TTL", "86400"))  # Seconds a stored output stays fresh
+    TASK_MEMO_LEASE_SECONDS = float(os.getenv("TASK_MEMO_LEASE_SECONDS", "600"))  # Claim on a key being computed
+
+    # ====================
+    # Endpoint Routing Settings
+    # ====================
+    # Optional JSON list of OpenAI-compatible endpoints. Each entry needs an
+    # "api_base" and a "model", plus either "api_key" or "api_key_env":
+    #   LLM_ENDPOINTS=[{"name": "groq", "api_base": "https://api.groq.com/openai/v1",
+    #                   "api_key_env": "GROQ_API_KEY", "model": "llama-3.3-70b-versatile",
+    #                   "small_model": "llama-3.1-8b-instant"}]
+    LLM_ENDPOINTS = os.getenv("LLM_ENDPOINTS", "")
+    ROUTER_HEDGE = os.getenv("ROUTER_HEDGE", "False").lower() == "true"
+    ROUTER_HEDGE_PERCENTILE = float(os.getenv("ROUTER_HEDGE_PERCENTILE", "95"))
+    ROUTER_HEDGE_MIN_DELAY = float(os.getenv("ROUTER_HEDGE_MIN_DELAY", "2.0"))
+    ROUTER_CACHE_SIZE = int(os.getenv("ROUTER_CACHE_SIZE", "8"))  # Shared routers kept (llm_router.get_router)
+
+    # ====================
+    # Shared Capacity Settings
+    # ====================
+    # Per-tenant quotas and fair-share weights as JSON, e.g.
+    #   TENANT_QUOTAS={"growth": {"rpm": 60, "tpm": 90000, "weight": 2}}
+    DEFAULT_TENANT = os.getenv("DEFAULT_TENANT", "default")
+    TENANT_QUOTAS = os.getenv("TENANT_QUOTAS", "")
+    TENANT_DEFAULT_RPM = float(os.getenv("TENANT_DEFAULT_RPM", "0"))  # 0 = unlimited
+    TENANT_DEFAULT_TPM = float(os.getenv("TENANT_DEFAULT_TPM", "0"))  # 0 = unlimited
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # Calls in flight per process (0 = no limit)
+    LLM_INTERACTIVE_RESERVE = int(os.getenv("LLM_INTERACTIVE_RESERVE", "2"))  # Slots batch calls cannot use
+    LLM_INTERACTIVE_WEIGHT = float(os.getenv("LLM_INTERACTIVE_WEIGHT", "4"))
+
+    # ====================
+    # Service Settings
+    # ====================
+    WORKER_SOCKET = os.getenv("WORKER_SOCKET", "/tmp/multi-agent-lab.sock")
+    SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+    SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8765"))
+    SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "2"))  # Jobs (and provider call streams) at once
+    SERVICE_MAX_QUEUE = int(os.getenv("SERVICE_MAX_QUEUE", "100"))
+    QUEUE_DB = os.getenv("QUEUE_DB", str(Path(__file__).parent / "job_queue.db"))  # Durable queue shared by workers
+    QUEUE_LEASE_SECONDS = float(os.getenv("QUEUE_LEASE_SECONDS", "120"))
+    QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+    QUEUE_POLL_INTERVAL = float(os.getenv("QUEUE_POLL_INTERVAL", "5"))
+    QUEUE_SCHEDULER = os.getenv("QUEUE_SCHEDULER", "sjf").lower()  # "sjf" (shortest predicted first) or "fifo"
+    QUEUE_AGING_RATE = float(os.getenv("QUEUE_AGING_RATE", "0.1"))  # Predicted seconds forgiven per second waited
+    JOB_COST_HISTORY_FILE = os.getenv("JOB_COST_HISTORY_FILE", str(Path(__file__).parent / ".job_costs.json"))
+    BULK_BACKEND = os.getenv("BULK_BACKEND", "openai").lower()  # "openai" (Batch API) or "local" stand-in
+    BULK_DIR = os.getenv("BULK_DIR", str(Path(__file__).parent / "bulk"))  # Batch files and bulk results
+    BULK_POLL_INTERVAL = float(os.getenv("BULK_POLL_INTERVAL", "60"))
+    BULK_MAX_REQUESTS = int(os.getenv("BULK_MAX_REQUESTS", "50000"))  # Requests per submitted batch
+    BULK_MAX_WAIT = float(os.getenv("BULK_MAX_WAIT", "90000"))  # Seconds to wait for batches (0 = no limit)
+
+    # ====================
+    # Travel Data Settings
+    # ====================
+    # Local knowledge store behind the CrewAI research tools (crewai/travel_knowledge.py).
+    # Extra data files (.jsonl, .json or .csv) are separated by commas.
+    TRAVEL_KNOWLEDGE = os.getenv("TRAVEL_KNOWLEDGE", "True").lower() == "true"
+    TRAVEL_KNOWLEDGE_FILES = os.getenv("TRAVEL_KNOWLEDGE_FILES", "")
+    TRAVEL_KNOWLEDGE_DB = os.getenv("TRAVEL_KNOWLEDGE_DB", str(Path(__file__).parent / ".travel_knowledge.db"))
+    # Fare and nightly-rate datasets behind the flight and hotel tools (crewai/travel_inventory.py),
+    # CSV or Parquet. The tools fall back to research prompts while a file is missing.
+    INVENTORY_DIR = os.getenv("INVENTORY_DIR", str(Path(__file__).parent / "inventory"))
+    INVENTORY_FARES = os.getenv("INVENTORY_FARES", str(Path(INVENTORY_DIR) / "fares.csv"))
+    INVENTORY_RATES = os.getenv("INVENTORY_RATES", str(Path(INVENTORY_DIR) / "rates.csv"))
+    # Extra gazetteer files (.jsonl) for the destination resolver (crewai/destination_resolver.py),
+    # separated by commas; they add to the bundled countries, cities and airports.
+    GAZETTEER_FILES = os.getenv("GAZETTEER_FILES", "")
+
+    # ====================
+    # Output Settings
+    # ====================
+    # Run outputs go to the append-only run archive (run_archive.py) instead of loose text files
+    ARCHIVE_RUNS = os.getenv("ARCHIVE_RUNS", "True").lower() == "true"
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", str(Path(__file__).parent / "archive"))
+    ARCHIVE_SEGMENT_BYTES = int(os.getenv("ARCHIVE_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+    # Archived runs are indexed for search (search_index.py); backend "auto", "fts5" or "inverted"
+    SEARCH_INDEX_RUNS = os.getenv("SEARCH_INDEX_RUNS", "True").lower() == "true"
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto").lower()
+    SEARCH_DB = os.getenv("SEARCH_DB", str(Path(ARCHIVE_DIR) / "search.db"))
+    # Per-phase time, call and token records for analytics (run_metrics.py)
+    RECORD_METRICS = os.getenv("RECORD_METRICS", "True").lower() == "true"
+    METRICS_DIR = os.getenv("METRICS_DIR", str(Path(__file__).parent / "metrics"))
 
     # ====================
     # Logging Settings
@@ -85,7 +183,8 @@ class Config:
         Returns:
             bool: True if configuration is valid, False otherwise
         """
-        if not cls.API_KEY or cls.API_KEY == "":
+        endpoints = cls.get_endpoints()
+        if not any(endpoint["api_key"] for endpoint in endpoints):
             print("❌ ERROR: No API key is configured!")
             print("\n📋 To fix this:")
             print("   Option 1 - Use Groq (recommended for free tier):")
@@ -102,7 +201,10 @@ class Config:
             print("   Get OpenAI key from: https://platform.openai.com/api-keys")
             return False
 
-        if cls.USE_GROQ:
+        if cls.LLM_ENDPOINTS:
+            names = ", ".join(endpoint["name"] for endpoint in endpoints)
+            print(f"✓ Using {len(endpoints)} routed endpoint(s): {names}")
+        elif cls.USE_GROQ:
             print(f"✓ Using Groq API (endpoint: {cls.API_BASE})")
         else:
             print(f"✓ Using OpenAI API (endpoint: {cls.API_BASE})")
@@ -110,13 +212,62 @@ class Config:
         if not cls.OPENAI_MODEL:
             print("⚠️  WARNING: Model is not configured, using default")
 
+        if 0 < cls.LLM_MAX_CONCURRENCY <= cls.LLM_INTERACTIVE_RESERVE:
+            print(f"⚠️  WARNING: LLM_INTERACTIVE_RESERVE={cls.LLM_INTERACTIVE_RESERVE} leaves no slot for batch calls; "
+                  f"using {cls.LLM_MAX_CONCURRENCY - 1}")
+
         return True
 
+    @classmethod
+    def get_endpoints(cls) -> List[Dict[str, Any]]:
+        """
+        Get the list of OpenAI-compatible endpoints available for routing.
+
+        Reads LLM_ENDPOINTS when it is set; otherwise returns a single endpoint
+        for the provider selected above (Groq or OpenAI).
+
+        Returns:
+            List[Dict[str, Any]]: One dict per endpoint with name, api_base, api_key, model,
+                small_model (cascade model, may be empty) and weight
+        """
+        default_endpoint = {
+            "name": "groq" if cls.USE_GROQ else "openai",
+            "api_base": cls.API_BASE,
+            "api_key": cls.API_KEY,
+            "model": cls.OPENAI_MODEL,
+            "small_model": cls.SMALL_MODEL,
+            "weight": 1.0,
+        }
+        if not cls.LLM_ENDPOINTS:
+            return [default_endpoint]
+
+        try:
+            raw_endpoints = json.loads(cls.LLM_ENDPOINTS)
+        except json.JSONDecodeError as e:
+            print(f"⚠️  WARNING: LLM_ENDPOINTS is not valid JSON ({e}), using default endpoint")
+            return [default_endpoint]
+
+        endpoints = []
+        for index, raw in enumerate(raw_endpoints):
+            api_key = raw.get("api_key") or os.getenv(raw.get("api_key_env", ""), "")
+            endpoints.append({
+                "name": raw.get("name", f"endpoint-{index}"),
+                "api_base": raw.get("api_base", cls.API_BASE),
+                "api_key": api_key,
+                "model": raw.get("model", cls.OPENAI_MODEL),
+                "small_model": raw.get("small_model", cls.SMALL_MODEL),
+                "weight": float(raw.get("weight", 1.0)),
+            })
+        return endpoints or [default_endpoint]
+
     @classmethod
     def get_config_list(cls) -> List[Dict[str, Any]]:
         """
         Get configuration list formatted for AutoGen.
 
+        Contains one entry per configured endpoint; AutoGen falls back to the
+        next entry when a call to the previous one fails.
+
         Returns:
             List[Dict[str, Any]]: Configuration list for AutoGen agent initialization
 
@@ -130,14 +281,15 @@ class Config:
         """
         return [
             {
-                "model": cls.OPENAI_MODEL,
-                "api_key": cls.API_KEY,
-                "api_base": cls.API_BASE,
+                "model": endpoint["model"],
+                "api_key": endpoint["api_key"],
+                "api_base": endpoint["api_base"],
                 "api_type": "openai",  # Groq uses OpenAI-compatible API
                 "temperature": cls.AGENT_TEMPERATURE,
                 "max_tokens": cls.AGENT_MAX_TOKENS,
                 "timeout": cls.AGENT_TIMEOUT,
             }
+            for endpoint in cls.get_endpoints()
         ]
 
     @classmethod
@@ -156,6 +308,8 @@ class Config:
             "agent_temperature": cls.AGENT_TEMPERATURE,
             "agent_max_tokens": cls.AGENT_MAX_TOKENS,
             "agent_timeout": cls.AGENT_TIMEOUT,
+            "small_model": cls.SMALL_MODEL,
+            "run_deadline": cls.RUN_DEADLINE,
             "verbose": cls.VERBOSE,
             "debug": cls.DEBUG,
         }
@@ -178,14 +332,108 @@ class Config:
         print(f"✓ API Key:           {api_key_masked}")
         print(f"✓ API Base:          {cls.API_BASE}")
         print(f"✓ Model:             {cls.OPENAI_MODEL}")
+        if cls.SMALL_MODEL:
+            print(f"✓ Small Model:       {cls.SMALL_MODEL} (cascade)")
         print(f"✓ Temperature:       {cls.AGENT_TEMPERATURE}")
         print(f"✓ Max Tokens:        {cls.AGENT_MAX_TOKENS}")
         print(f"✓ Timeout:           {cls.AGENT_TIMEOUT}s")
+        print(f"✓ Endpoints:         {len(cls.get_endpoints())} (hedging: {cls.ROUTER_HEDGE})")
         print(f"✓ Verbose:           {cls.VERBOSE}")
         print(f"✓ Debug:             {cls.DEBUG}")
         print("="*60 + "\n")
 
 
+# ====================
+# Per-Run Provider Settings
+# ====================
+
+@dataclasses.dataclass(frozen=True)
+class ProviderConfig:
+    """
+    Immutable provider settings for one run.
+
+    Config resolves the provider once per process at import time. A
+    ProviderConfig is a snapshot that is passed explicitly to routers, agents
+    and crews, so concurrent runs in one process can target different
+    providers or models without touching os.environ or class attributes.
+    """
+
+    provider: str
+    api_key: str = dataclasses.field(repr=False)
+    api_base: str
+    model: str
+    small_model: str = ""
+    temperature: float = 0.7
+    max_tokens: int = 2000
+    timeout: int = 300
+    # Routed endpoints (read-only mappings); empty means the single endpoint above
+    endpoints: Tuple[Mapping[str, Any], ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "ProviderConfig":
+        """Snapshot of the provider settings loaded from the .env file"""
+        return cls(
+            provider="groq" if Config.USE_GROQ else "openai",
+            api_key=Config.API_KEY,
+            api_base=Config.API_BASE,
+            model=Config.OPENAI_MODEL,
+            small_model=Config.SMALL_MODEL,
+            temperature=Config.AGENT_TEMPERATURE,
+            max_tokens=Config.AGENT_MAX_TOKENS,
+            timeout=Config.AGENT_TIMEOUT,
+            endpoints=cls._freeze(Config.get_endpoints()) if Config.LLM_ENDPOINTS else (),
+        )
+
+    @staticmethod
+    def _freeze(endpoints: List[Dict[str, Any]]) -> Tuple[Mapping[str, Any], ...]:
+        return tuple(MappingProxyType(dict(endpoint)) for endpoint in endpoints)
+
+    def override(self, **changes) -> "ProviderConfig":
+        """
+        Copy of this config with some settings replaced.
+
+        With routed endpoints, a new model, small_model, api_base or api_key
+        applies to every endpoint (unless new endpoints are given too), so a
+        per-run model is never silently dropped.
+
+        Example:
+            provider.override(model="gpt-4o-mini", temperature=0.2)
+
+        Raises:
+            TypeError: If a setting name is unknown
+        """
+        if "endpoints" in changes:
+            changes["endpoints"] = self._freeze(changes["endpoints"] or [])
+        elif self.endpoints:
+            shared = {key: changes[key] for key in ("model", "small_model", "api_base", "api_key") if key in changes}
+            if shared:
+                changes["endpoints"] = self._freeze([{**endpoint, **shared} for endpoint in self.endpoints])
+        return dataclasses.replace(self, **changes)
+
+    def get_endpoints(self) -> List[Dict[str, Any]]:
+        """Endpoints in the Config.get_endpoints() format (fresh dicts, safe to modify)"""
+        if self.endpoints:
+            return [dict(endpoint) for endpoint in self.endpoints]
+        return [{
+            "name": self.provider,
+            "api_base": self.api_base,
+            "api_key": self.api_key,
+            "model": self.model,
+            "small_model": self.small_model,
+            "weight": 1.0,
+        }]
+
+    def has_small_model(self) -> bool:
+        """Whether any endpoint has a cascade small model"""
+        return any(endpoint["small_model"] for endpoint in self.get_endpoints())
+
+    def cache_key(self) -> str:
+        """Stable string identifying these settings (e.g. for agent pool keys)"""
+        settings = {field.name: getattr(self, field.name) for field in dataclasses.fields(self)}
+        settings["endpoints"] = self.get_endpoints()
+        return json.dumps(settings, sort_keys=True)
+
+
 # Convenience functions for quick access
 def validate_config() -> bool:
     """Quick function to validate configuration."""
@@ -207,6 +455,7 @@ def get_agent_config() -> Dict[str, Any]:
         "temperature": Config.AGENT_TEMPERATURE,
         "max_tokens": Config.AGENT_MAX_TOKENS,
         "timeout": Config.AGENT_TIMEOUT,
+        "run_deadline": Config.RUN_DEADLINE,
     }
 
 
@@ -0,0 +1,182 @@
+"""
+Cross-Run Task Memoization for AutoGen and CrewAI Lab Demo
+
+Trips in a batch share sub-problems: every January trip to Iceland needs the
+same Reykjavik hotel research and a similar attractions pass, whatever the
+departure city. A task's output is stored under a key built from exactly the
+inputs the task uses: its prompt texts after the trip values are filled in,
+its model, and, for tasks that build on earlier tasks, their outputs. Any
+later trip whose task has the same key gets the stored output instead of
+running the task again.
+
+- Entries are reused while younger than their freshness limit (TASK_MEMO_TTL,
+  or a per-task ttl), then recomputed
+- Only one run computes a given key at a time. Other runs with the same key
+  wait for its result instead of running the task in parallel. The claim is
+  a lease (TASK_MEMO_LEASE_SECONDS), so a crashed run does not block the key.
+- The store is a SQLite file (TASK_MEMO_DB) shared by threads, worker
+  processes and later batches
+
+Usage:
+    python cli.py memo stats
+    python cli.py memo clear --older-than 86400
+
+    from task_memo import get_task_memo
+    memo = get_task_memo()
+    key = memo.key("HotelAgent", description, model)
+    output = memo.claim(key, ttl=86400)
+    if output is None:                       # this run computes it
+        output = run_task()
+        memo.put(key, output, label="HotelAgent")
+"""
+
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from shared_config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    key TEXT PRIMARY KEY,
+    label TEXT NOT NULL DEFAULT '',
+    output TEXT,
+    created REAL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_until REAL
+);
+"""
+
+
+class TaskMemo:
+    """Shared store of task outputs keyed by the task's inputs"""
+
+    def __init__(self, path: Optional[str] = None, lease_seconds: Optional[float] = None,
+                 poll_interval: float = 1.0):
+        """
+        Args:
+            path: SQLite database file (default: TASK_MEMO_DB)
+            lease_seconds: How long a claim holds off other runs (default: TASK_MEMO_LEASE_SECONDS)
+            poll_interval: Seconds between checks while another run computes a key
+        """
+        self.path = path or Config.TASK_MEMO_DB
+        self.lease_seconds = lease_seconds or Config.TASK_MEMO_LEASE_SECONDS
+        self.poll_interval = poll_interval
+        self.owner = uuid.uuid4().hex[:12]
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Memo key for a task: a hash of everything its output depends on"""
+        return hashlib.sha256(json.dumps(parts, default=str, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def claim(self, key: str, ttl: Optional[float] = None, run_context=None) -> Optional[str]:
+        """
+        Stored output for key, or None once this caller has claimed the key and
+        must compute it (then call put, or release if the task fails).
+
+        Waits while another run holds a live claim on the key.
+
+        Raises:
+            RunCancelled: If run_context is cancelled while waiting
+        """
+        ttl = Config.TASK_MEMO_TTL if ttl is None else ttl
+        owner = f"{self.owner}:{threading.get_ident()}"
+        waited = False
+        db = self._connect()
+        try:
+            while True:
+                now = time.time()
+                db.execute("BEGIN IMMEDIATE")
+                row = db.execute("SELECT output, created, lease_owner, lease_until FROM memo WHERE key = ?",
+                                 (key,)).fetchone()
+                if row and row[0] is not None and now - row[1] < ttl:
+                    db.execute("UPDATE memo SET hits = hits + 1 WHERE key = ?", (key,))
+                    db.execute("COMMIT")
+                    self._count("hits")
+                    return row[0]
+                if row and row[2] and row[2] != owner and row[3] > now:
+                    db.execute("COMMIT")
+                    if not waited:
+                        waited = True
+                        self._count("waits")
+                    if run_context is not None:
+                        run_context.check()
+                    time.sleep(self.poll_interval)
+                    continue
+                db.execute("INSERT INTO memo (key, lease_owner, lease_until) VALUES (?, ?, ?) "
+                           "ON CONFLICT(key) DO UPDATE SET lease_owner = excluded.lease_owner, "
+                           "lease_until = excluded.lease_until", (key, owner, now + self.lease_seconds))
+                db.execute("COMMIT")
+                self._count("misses")
+                return None
+        finally:
+            db.close()
+
+    def put(self, key: str, output: str, label: str = "") -> None:
+        """Store a computed output and drop the claim on its key"""
+        with self._connect() as db:
+            db.execute("INSERT INTO memo (key, label, output, created) VALUES (?, ?, ?, ?) "
+                       "ON CONFLICT(key) DO UPDATE SET label = excluded.label, output = excluded.output, "
+                       "created = excluded.created, lease_owner = NULL, lease_until = NULL",
+                       (key, label, output, time.time()))
+
+    def release(self, key: str) -> None:
+        """Drop this caller's claim without storing anything (the task failed)"""
+        with self._connect() as db:
+            db.execute("UPDATE memo SET lease_owner = NULL, lease_until = NULL WHERE key = ? AND lease_owner = ?",
+                       (key, f"{self.owner}:{threading.get_ident()}"))
+
+    def clear(self, older_than: Optional[float] = None) -> int:
+        """Delete stored outputs (only those older than this many seconds, if given)"""
+        with self._connect() as db:
+            if older_than is None:
+                return db.execute("DELETE FROM memo").rowcount
+            return db.execute("DELETE FROM memo WHERE created < ?", (time.time() - older_than,)).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Stored entries and reuse counts per task, plus this process's hits and misses"""
+        with self._connect() as db:
+            rows = db.execute("SELECT label, COUNT(output), SUM(hits), MIN(created) FROM memo "
+                              "WHERE output IS NOT NULL GROUP BY label ORDER BY label").fetchall()
+        now = time.time()
+        return {
+            "tasks": {label or "-": {"entries": entries, "reused": reused or 0,
+                                     "oldest_seconds": round(now - oldest) if oldest else None}
+                      for label, entries, reused, oldest in rows},
+            "process": {"hits": self.hits, "misses": self.misses, "waits": self.waits},
+        }
+
+
+_TASK_MEMO: Optional[TaskMemo] = None
+_TASK_MEMO_LOCK = threading.Lock()
+
+
+def get_task_memo() -> TaskMemo:
+    """Process-wide task memo in TASK_MEMO_DB"""
+    global _TASK_MEMO
+    with _TASK_MEMO_LOCK:
+        if _TASK_MEMO is None:
+            _TASK_MEMO = TaskMemo()
+        return _TASK_MEMO
@@ -0,0 +1,184 @@
+"""
+Adaptive max_tokens Planner for AutoGen and CrewAI Lab Demo
+
+Every call used to reserve Config.AGENT_MAX_TOKENS completion tokens, even for
+prompts that ask for 150 words. Providers schedule for the reserved budget, and
+a runaway generation can spend all of it. The planner records how many
+completion tokens each agent/phase actually used on each model tier (the
+cascade's small model writes differently from the large one; see
+model_cascade.py) and plans the next call's
+max_tokens from a high percentile of that history (plus headroom), capped at
+AGENT_MAX_TOKENS. A response cut off by the budget (finish_reason "length") is
+retried once with a doubled budget, and the recorded history adapts.
+
+Until a key has enough history, the budget is derived from a "N words" limit
+in the prompt when there is one, and AGENT_MAX_TOKENS otherwise. History is
+kept in TOKEN_HISTORY_FILE so it carries over between runs.
+
+Usage:
+    from token_planner import TokenPlanner
+
+    planner = TokenPlanner()
+    response = planner.complete(router, "ResearchAgent/research", messages,
+                                run_context=run_context, temperature=0.7)
+"""
+
+import os
+import re
+import json
+import math
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from shared_config import Config
+
+_WORD_LIMIT = re.compile(r"\b(\d{2,4})\s+words\b", re.IGNORECASE)
+TOKENS_PER_WORD = 1.4
+
+
+class TokenPlanner:
+    """Plans per-call max_tokens from the completion lengths seen so far"""
+
+    def __init__(self, history_file: Optional[str] = None, percentile: Optional[float] = None,
+                 headroom: float = 1.2, min_samples: int = 3, window: int = 50,
+                 min_tokens: int = 64, max_tokens: Optional[int] = None):
+        """
+        Args:
+            history_file: JSON file the history is loaded from and saved to
+                (default: TOKEN_HISTORY_FILE; empty string keeps it in memory)
+            percentile: History percentile the budget is planned from (default: TOKEN_PLAN_PERCENTILE)
+            headroom: Multiplier applied on top of the percentile
+            min_samples: Samples needed before the history is trusted
+            window: Completions remembered per key
+            min_tokens: Smallest budget ever planned
+            max_tokens: Largest budget ever planned (default: AGENT_MAX_TOKENS)
+        """
+        self.history_file = Config.TOKEN_HISTORY_FILE if history_file is None else history_file
+        self.percentile = percentile or Config.TOKEN_PLAN_PERCENTILE
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.window = window
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens or Config.AGENT_MAX_TOKENS
+        self._history: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self.retries = 0
+        self._load()
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.history_file or not Path(self.history_file).exists():
+            return
+        try:
+            with open(self.history_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable token history {self.history_file}: {e}")
+            return
+        for key, samples in data.items():
+            # Histories saved before keys carried a tier were mostly large-model calls
+            key = key if "@" in key else self.history_key(key)
+            self._history[key] = deque((int(n) for n in samples), maxlen=self.window)
+
+    def _save(self) -> None:
+        if not self.history_file:
+            return
+        data = {key: list(samples) for key, samples in self._history.items()}
+        # Write a temporary file and swap it in, so a crash or a concurrent writer
+        # (daemon, HTTP service, queue workers) never leaves a truncated history
+        path = Path(self.history_file)
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temporary, "w") as f:
+                json.dump(data, f)
+            os.replace(temporary, path)
+        except OSError as e:
+            temporary.unlink(missing_ok=True)
+            if Config.DEBUG:
+                print(f"⚠️  Could not save token history: {e}")
+
+    @staticmethod
+    def history_key(key: str, model_tier: str = "large") -> str:
+        """History entry for an agent/phase key on one model tier, e.g. "ResearchAgent/research@small" """
+        return f"{key}@{model_tier}"
+
+    def record(self, key: str, completion_tokens: int, model_tier: str = "large") -> None:
+        """Remember the completion length of one untruncated call"""
+        with self._lock:
+            samples = self._history.setdefault(self.history_key(key, model_tier), deque(maxlen=self.window))
+            samples.append(int(completion_tokens))
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------------
+
+    def plan(self, key: str, messages: Optional[List[Dict[str, str]]] = None, model_tier: str = "large") -> int:
+        """
+        max_tokens for the next call under key.
+
+        Args:
+            key: Agent/phase the call belongs to (e.g. "ResearchAgent/research")
+            messages: The call's messages, used for a "N words" hint while the
+                key has too little history
+            model_tier: "large" or "small"; each tier has its own history
+        """
+        with self._lock:
+            samples = sorted(self._history.get(self.history_key(key, model_tier), ()))
+        if len(samples) >= self.min_samples:
+            rank = min(len(samples) - 1, math.ceil(self.percentile / 100 * len(samples)) - 1)
+            budget = samples[max(0, rank)] * self.headroom
+        else:
+            budget = self._word_limit_budget(messages) or self.max_tokens
+        return int(min(self.max_tokens, max(self.min_tokens, budget)))
+
+    def _word_limit_budget(self, messages: Optional[List[Dict[str, str]]]) -> Optional[float]:
+        limits = [int(match) for message in messages or [] for match in _WORD_LIMIT.findall(message["content"])]
+        if not limits:
+            return None
+        # Twice the stated limit: models overshoot word counts and markdown costs tokens
+        return max(limits) * TOKENS_PER_WORD * 2
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def complete(self, router, key: str, messages: List[Dict[str, str]], run_context=None, **kwargs):
+        """
+        Call router.complete with a planned max_tokens and learn from the result.
+
+        If the response was cut off by the budget, the call is retried once with
+        double the budget (up to max_tokens). A model_tier keyword argument is
+        passed on to the router and selects the tier's history.
+        """
+        model_tier = kwargs.get("model_tier", "large")
+        max_tokens = self.plan(key, messages, model_tier)
+        response = router.complete(messages=messages, run_context=run_context, max_tokens=max_tokens, **kwargs)
+
+        if response.choices[0].finish_reason == "length" and max_tokens < self.max_tokens:
+            retry_tokens = min(self.max_tokens, max_tokens * 2)
+            if Config.VERBOSE:
+                print(f"   ↻ {key} hit its {max_tokens}-token budget, retrying with {retry_tokens}")
+            with self._lock:
+                self.retries += 1
+            response = router.complete(messages=messages, run_context=run_context, max_tokens=retry_tokens, **kwargs)
+
+        usage = getattr(response, "usage", None)
+        if usage is not None and response.choices[0].finish_reason != "length":
+            self.record(key, usage.completion_tokens, model_tier)
+        return response
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Sample count and current plan for every agent/phase@tier key"""
+        with self._lock:
+            keys = list(self._history)
+        stats = {}
+        for key in keys:
+            phase_key, model_tier = key.rsplit("@", 1)
+            stats[key] = {"samples": len(self._history[key]), "max_tokens": self.plan(phase_key, model_tier=model_tier)}
+        return stats
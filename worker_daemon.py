@@ -0,0 +1,163 @@
+"""
+Warm Worker Daemon for AutoGen and CrewAI Lab Demo
+
+A long-lived local process that keeps AutoGen and CrewAI imported, the OpenAI
+clients and connection pools open and the agents built (see job_runner.py).
+Thin clients submit interview or travel jobs over a Unix domain socket and
+receive each phase/task output as soon as it is ready.
+
+Usage:
+    python cli.py serve                                 # start the daemon
+    python cli.py submit travel destination=France trip_duration="7 days"
+    python cli.py submit interview-simple --deadline 120
+
+Protocol (newline-delimited JSON over WORKER_SOCKET):
+    request:   {"kind": "travel", "params": {...}, "deadline": 300}
+               (params may include "provider": {"model": ...} to override
+               provider settings for that job only; optional "tenant" and
+               "priority" tag the job's LLM calls, see llm_scheduler.py)
+    responses: {"event": "accepted", "job_id": "..."}
+               {"event": "output", "name": "...", "output": "..."}   one per phase/task
+               {"event": "done", "result": {...}}  or  {"event": "error", "error": "..."}
+
+If the client disconnects, the job is cancelled.
+"""
+
+import os
+import json
+import uuid
+import socket
+import threading
+import socketserver
+from typing import Dict, Any, Iterator, Optional
+
+from shared_config import Config
+
+
+def _send(wfile, lock: threading.Lock, event: Dict[str, Any]) -> None:
+    with lock:
+        wfile.write((json.dumps(event, default=str) + "\n").encode("utf-8"))
+        wfile.flush()
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class JobRequestHandler(socketserver.StreamRequestHandler):
+    """Handles one job per connection and streams its events back"""
+
+    def handle(self) -> None:
+        from run_context import RunContext
+
+        write_lock = threading.Lock()
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            kind = request["kind"]
+        except (ValueError, KeyError) as e:
+            _send(self.wfile, write_lock, {"event": "error", "error": f"Invalid request: {e}"})
+            return
+
+        job_id = uuid.uuid4().hex[:12]
+        run_context = None
+
+        def on_output(name: str, output: Any) -> None:
+            try:
+                _send(self.wfile, write_lock, {"event": "output", "job_id": job_id, "name": name, "output": output})
+            except OSError:
+                run_context.cancel("client disconnected")
+
+        run_context = RunContext(request.get("deadline"), on_output=on_output, tenant=request.get("tenant"),
+                                 priority=request.get("priority", "interactive"))
+        try:
+            _send(self.wfile, write_lock, {"event": "accepted", "job_id": job_id, "kind": kind})
+            result = self.server.runner.run(kind, request.get("params"), run_context)
+            _send(self.wfile, write_lock, {"event": "done", "job_id": job_id, "result": result})
+        except OSError:
+            run_context.cancel("client disconnected")
+        except Exception as e:
+            try:
+                _send(self.wfile, write_lock, {"event": "error", "job_id": job_id, "error": str(e)})
+            except OSError:
+                pass
+
+
+class WorkerDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server that owns one warm JobRunner"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, runner):
+        self.socket_path = socket_path
+        self.runner = runner
+        super().__init__(socket_path, JobRequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: Optional[str] = None, warm_kinds=None) -> None:
+    """
+    Start the daemon and block until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on (default: Config.WORKER_SOCKET)
+        warm_kinds: Job kinds to warm up before accepting jobs (default: all)
+    """
+    from job_runner import JobRunner, JOB_KINDS
+
+    socket_path = socket_path or Config.WORKER_SOCKET
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)  # Stale socket left by a dead daemon
+        else:
+            raise RuntimeError(f"A worker daemon is already listening on {socket_path}")
+        finally:
+            probe.close()
+
+    runner = JobRunner()
+    for kind, seconds in runner.warm_up(warm_kinds or JOB_KINDS).items():
+        print(f"✓ Warmed {kind} in {seconds:.2f}s")
+
+    with WorkerDaemon(socket_path, runner) as server:
+        print(f"✓ Worker daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down worker daemon...")
+
+
+# ============================================================================
+# CLIENT
+# ============================================================================
+
+def submit(kind: str, params: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None,
+           socket_path: Optional[str] = None, tenant: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Submit a job to the daemon and yield its events as they arrive.
+
+    Args:
+        kind: Job kind ("interview", "interview-simple" or "travel")
+        params: Job parameters (travel jobs accept the crewai_demo.main arguments)
+        deadline: Optional run time budget in seconds
+        socket_path: Daemon socket (default: Config.WORKER_SOCKET)
+        tenant: Team charged for the job's LLM calls (default: DEFAULT_TENANT)
+    """
+    request = {"kind": kind, "params": params or {}, "deadline": deadline, "tenant": tenant}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path or Config.WORKER_SOCKET)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                event = json.loads(line)
+                yield event
+                if event["event"] in ("done", "error"):
+                    return